@@ -0,0 +1,241 @@
+"""
+Helpers for handing uploaded audio to the speech-to-text client without
+copying it to a temp file, for enforcing size/duration limits up front and
+for hashing uploads into cache keys.
+"""
+import hashlib
+import io
+import json
+import os
+import struct
+from typing import Optional
+
+WAV_HEADER_BYTES = 44
+HASH_CHUNK_BYTES = 64 * 1024
+# Enough for the EBML header, Segment Info and Tracks of a browser recording,
+# and for at least one whole cluster header at the end of the file
+WEBM_HEAD_BYTES = 4096
+WEBM_TAIL_BYTES = 256 * 1024
+
+EBML_MAGIC = b"\x1a\x45\xdf\xa3"
+WEBM_CLUSTER_ID = b"\x1f\x43\xb6\x75"
+WEBM_TIMECODE_SCALE_ID = b"\x2a\xd7\xb1"
+WEBM_DURATION_ID = b"\x44\x89"
+WEBM_CLUSTER_TIMECODE_ID = 0xE7
+WEBM_DEFAULT_TIMECODE_SCALE = 1_000_000  # nanoseconds per timecode tick
+
+
+class NamedUploadStream(io.RawIOBase):
+    """
+    Read-only view over an upload's spooled file that carries a filename, so
+    the STT client can detect the audio format while reading the upload's own
+    buffer (no extra in-memory or on-disk copy).
+    """
+
+    def __init__(self, raw, name: str):
+        super().__init__()
+        self._raw = raw
+        self.name = name
+        self.bytes_read = 0
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def readinto(self, buffer) -> int:
+        data = self._raw.read(len(buffer))
+        buffer[:len(data)] = data
+        self.bytes_read += len(data)
+        return len(data)
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        return self._raw.seek(offset, whence)
+
+    def tell(self) -> int:
+        return self._raw.tell()
+
+
+def stream_size(stream) -> int:
+    """Total bytes of a seekable stream; leaves it positioned at the start"""
+    size = stream.seek(0, os.SEEK_END)
+    stream.seek(0)
+    return size
+
+
+def stream_sha256(stream, chunk_size: int = HASH_CHUNK_BYTES) -> str:
+    """SHA-256 hex digest of a seekable stream, read in chunks; leaves it positioned at the start"""
+    digest = hashlib.sha256()
+    stream.seek(0)
+    for chunk in iter(lambda: stream.read(chunk_size), b""):
+        digest.update(chunk)
+    stream.seek(0)
+    return digest.hexdigest()
+
+
+def upload_extension(filename: Optional[str], default: str = "webm") -> str:
+    """Lower-cased extension of an upload's filename"""
+    if filename and "." in filename:
+        return filename.rsplit(".", 1)[-1].lower() or default
+    return default
+
+
+def wav_duration_seconds(header: bytes, size: int) -> Optional[float]:
+    """
+    Duration of a PCM WAV from its canonical 44-byte header and total size,
+    or None when the data is not a WAV file (compressed formats cannot be
+    timed without decoding; their byte limit still applies).
+    """
+    if len(header) < WAV_HEADER_BYTES or header[:4] != b"RIFF" or header[8:12] != b"WAVE":
+        return None
+    byte_rate = struct.unpack_from("<I", header, 28)[0]
+    if not byte_rate:
+        return None
+    return (size - WAV_HEADER_BYTES) / byte_rate
+
+
+def _read_vint(data: bytes, pos: int) -> Optional[tuple]:
+    """(value, position after it) of the EBML variable-length integer at data[pos]"""
+    if pos >= len(data) or not data[pos]:
+        return None
+    length = 9 - data[pos].bit_length()
+    if pos + length > len(data):
+        return None
+    value = data[pos] & (0xFF >> length)
+    for byte in data[pos + 1:pos + length]:
+        value = (value << 8) | byte
+    return value, pos + length
+
+
+def _element_body(data: bytes, element_id: bytes, end: int) -> Optional[bytes]:
+    """Body of the first element_id in data[:end]"""
+    pos = data.find(element_id, 0, end)
+    if pos < 0:
+        return None
+    size = _read_vint(data, pos + len(element_id))
+    if size is None or size[1] + size[0] > len(data):
+        return None
+    return data[size[1]:size[1] + size[0]]
+
+
+def webm_duration_seconds(head: bytes, tail: bytes) -> Optional[float]:
+    """
+    Duration of a WebM/Matroska file from its first WEBM_HEAD_BYTES and last
+    WEBM_TAIL_BYTES, or None when the data is not WebM. Browser recordings
+    (MediaRecorder) are written live and carry no Duration element; for them
+    the start time of the last cluster is returned, which undercounts by at
+    most one cluster.
+    """
+    if head[:4] != EBML_MAGIC:
+        return None
+    header_end = head.find(WEBM_CLUSTER_ID)
+    if header_end < 0:
+        header_end = len(head)
+
+    scale = _element_body(head, WEBM_TIMECODE_SCALE_ID, header_end)
+    scale = int.from_bytes(scale, "big") if scale else WEBM_DEFAULT_TIMECODE_SCALE
+    duration = _element_body(head, WEBM_DURATION_ID, header_end)
+    if duration is not None and len(duration) in (4, 8):
+        ticks = struct.unpack(">f" if len(duration) == 4 else ">d", duration)[0]
+        if ticks > 0:
+            return ticks * scale / 1e9
+
+    # A cluster starts with its Timecode; skip byte patterns that only look like a cluster ID
+    pos = tail.rfind(WEBM_CLUSTER_ID)
+    while pos >= 0:
+        size = _read_vint(tail, pos + len(WEBM_CLUSTER_ID))
+        if size is not None and size[1] < len(tail) and tail[size[1]] == WEBM_CLUSTER_TIMECODE_ID:
+            timecode = _read_vint(tail, size[1] + 1)
+            if timecode is not None and timecode[0] <= 8:
+                ticks = int.from_bytes(tail[timecode[1]:timecode[1] + timecode[0]], "big")
+                return ticks * scale / 1e9
+        pos = tail.rfind(WEBM_CLUSTER_ID, 0, pos)
+    return None
+
+
+def audio_duration_seconds(stream, size: int) -> Optional[float]:
+    """
+    Duration of a WAV or WebM upload read from its header (and, for WebM, its
+    last clusters), or None for formats that cannot be timed without decoding.
+    Leaves the stream positioned at the start.
+    """
+    stream.seek(0)
+    head = stream.read(WEBM_HEAD_BYTES)
+    duration = wav_duration_seconds(head, size)
+    if duration is None and head[:4] == EBML_MAGIC:
+        stream.seek(max(0, size - WEBM_TAIL_BYTES))
+        duration = webm_duration_seconds(head, stream.read(WEBM_TAIL_BYTES))
+    stream.seek(0)
+    return duration
+
+
+class UploadTooLarge(Exception):
+    pass
+
+
+class UploadLimitMiddleware:
+    """
+    ASGI middleware answering 413 for request bodies over max_bytes on the
+    given paths while they are received, before the framework spools them:
+    from Content-Length up front, or as soon as a chunked body crosses the
+    limit. on_reject is called once per rejected request.
+    """
+
+    def __init__(self, app, paths, max_bytes: int, detail: str = "Request body too large", on_reject=None):
+        self.app = app
+        self.paths = set(paths)
+        self.max_bytes = max_bytes
+        self.detail = detail
+        self.on_reject = on_reject
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] not in self.paths:
+            await self.app(scope, receive, send)
+            return
+
+        length = dict(scope["headers"]).get(b"content-length", b"")
+        if length.isdigit() and int(length) > self.max_bytes:
+            await self._reject(send)
+            return
+
+        received = 0
+        exceeded = started = False
+
+        async def limited_receive():
+            nonlocal received, exceeded
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > self.max_bytes:
+                    exceeded = True
+                    raise UploadTooLarge()
+            return message
+
+        async def guarded_send(message):
+            nonlocal started
+            # Whatever the app answers to the aborted body is replaced by the 413
+            if exceeded:
+                return
+            started = True
+            await send(message)
+
+        try:
+            await self.app(scope, limited_receive, guarded_send)
+        except Exception:
+            if not exceeded:
+                raise
+        if exceeded and not started:
+            await self._reject(send)
+
+    async def _reject(self, send):
+        if self.on_reject is not None:
+            self.on_reject()
+        body = json.dumps({"detail": self.detail}).encode()
+        await send({
+            "type": "http.response.start",
+            "status": 413,
+            "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode()),
+                        (b"connection", b"close")],
+        })
+        await send({"type": "http.response.body", "body": body})
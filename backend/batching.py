@@ -0,0 +1,121 @@
+"""
+Micro-batching for upstream calls: requests for the same key arriving within
+a short window are sent as one batch and the results are split back out to
+the waiting callers.
+"""
+import asyncio
+import time
+from bisect import bisect_left
+
+
+class Histogram:
+    """Fixed-bucket histogram; each bucket counts values up to its bound"""
+
+    def __init__(self, bounds):
+        self.bounds = list(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+
+    def observe(self, value: float):
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.total += value
+
+    def stats(self) -> dict:
+        buckets = {f"<={bound}": n for bound, n in zip(self.bounds, self.counts)}
+        buckets["+inf"] = self.counts[-1]
+        return {
+            "count": self.count,
+            "mean": round(self.total / self.count, 6) if self.count else None,
+            "buckets": buckets,
+        }
+
+
+class MicroBatcher:
+    """
+    Collects items per key for up to window_seconds or max_items, then calls
+    send_batch(key, items) once. send_batch returns one result per item, or
+    None for items it could not handle; those (and every item of a failed
+    batch) are retried individually with send_one(key, item).
+    """
+
+    def __init__(self, send_batch, send_one, max_items: int = 16, window_seconds: float = 0.02):
+        self.send_batch = send_batch
+        self.send_one = send_one
+        self.max_items = max_items
+        self.window_seconds = window_seconds
+        self._pending = {}
+        self._timers = {}
+        self.batch_sizes = Histogram([1, 2, 4, 8, 16, 32, 64])
+        self.batch_seconds = Histogram([0.05, 0.1, 0.25, 0.5, 1, 2, 5, 10])
+        self.batches = 0
+        self.fallbacks = 0
+
+    async def submit(self, key, item):
+        """Queue item under key and wait for its result"""
+        future = asyncio.get_running_loop().create_future()
+        pending = self._pending.setdefault(key, [])
+        pending.append((item, future))
+        if len(pending) >= self.max_items:
+            self._flush(key)
+        elif key not in self._timers:
+            self._timers[key] = asyncio.get_running_loop().call_later(
+                self.window_seconds, self._flush, key
+            )
+        return await future
+
+    def _flush(self, key):
+        timer = self._timers.pop(key, None)
+        if timer is not None:
+            timer.cancel()
+        batch = self._pending.pop(key, None)
+        if batch:
+            asyncio.ensure_future(self._run(key, batch))
+
+    async def _run(self, key, batch: list):
+        items = [item for item, _ in batch]
+        start = time.perf_counter()
+        results = [None] * len(items)
+        if len(items) > 1:
+            try:
+                results = list(await self.send_batch(key, items))[:len(items)]
+                results += [None] * (len(items) - len(results))
+            except Exception as e:
+                print(f"Batch call failed, retrying items individually: {e}")
+        self.batches += 1
+        self.batch_sizes.observe(len(items))
+
+        retries = []
+        for (item, future), result in zip(batch, results):
+            if future.done():
+                continue
+            if result is None:
+                retries.append((item, future))
+            else:
+                future.set_result(result)
+        if len(items) > 1:
+            self.fallbacks += len(retries)
+        await asyncio.gather(*(self._run_one(key, item, future) for item, future in retries))
+        self.batch_seconds.observe(time.perf_counter() - start)
+
+    async def _run_one(self, key, item, future):
+        try:
+            result = await self.send_one(key, item)
+        except Exception as e:
+            if not future.done():
+                future.set_exception(e)
+            return
+        if not future.done():
+            future.set_result(result)
+
+    def stats(self) -> dict:
+        return {
+            "max_items": self.max_items,
+            "window_seconds": self.window_seconds,
+            "batches": self.batches,
+            "fallbacks": self.fallbacks,
+            "pending": sum(len(batch) for batch in self._pending.values()),
+            "batch_size": self.batch_sizes.stats(),
+            "batch_seconds": self.batch_seconds.stats(),
+        }
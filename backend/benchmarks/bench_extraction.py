@@ -0,0 +1,102 @@
+"""
+Benchmark: local rule-based registration extraction vs the LLM.
+
+Reports, over the labelled transcripts in tests/data/registration_transcripts.jsonl,
+the per-field local hit rate, how many requests skip the LLM entirely, the
+prompt size sent for the remaining fields and the local extraction latency.
+With --llm (needs EMERGENT_LLM_KEY) it also times the LLM with the full
+prompt and with the missing-fields-only prompt for each transcript.
+
+Usage (from backend/):
+    python benchmarks/bench_extraction.py --repeat 200
+    python benchmarks/bench_extraction.py --llm
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+import uuid
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from extraction import REGISTRATION_FIELDS, extract_registration, registration_prompt  # noqa: E402
+from tests.test_extraction import load_transcripts  # noqa: E402
+
+LANGUAGE_NAMES = {"hi": "Hindi", "bn": "Bengali", "te": "Telugu", "mr": "Marathi", "ta": "Tamil",
+                  "gu": "Gujarati", "en": "English"}
+
+
+def local_report(rows: list, repeat: int):
+    hits = dict.fromkeys(REGISTRATION_FIELDS, 0)
+    skipped = 0
+    full_prompt_chars = partial_prompt_chars = 0
+    for row in rows:
+        found = extract_registration(row["text"])
+        for field in found:
+            hits[field] += 1
+        missing = [field for field in REGISTRATION_FIELDS if field not in found]
+        language = LANGUAGE_NAMES.get(row["language"], "Hindi")
+        full_prompt_chars += len(registration_prompt(language, REGISTRATION_FIELDS))
+        if missing:
+            partial_prompt_chars += len(registration_prompt(language, missing))
+        else:
+            skipped += 1
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for row in rows:
+            extract_registration(row["text"])
+    per_call = (time.perf_counter() - start) / (repeat * len(rows))
+
+    print(f"{len(rows)} transcripts")
+    for field, count in hits.items():
+        print(f"  {field:20s} local hit rate {count / len(rows):6.1%}")
+    print(f"LLM skipped entirely   {skipped}/{len(rows)}")
+    print(f"prompt chars           {full_prompt_chars} all fields -> {partial_prompt_chars} missing fields only")
+    print(f"local extraction       {per_call * 1e6:8.1f} us/transcript")
+
+
+async def llm_report(rows: list):
+    from dotenv import load_dotenv
+    from emergentintegrations.llm.chat import LlmChat, UserMessage
+
+    load_dotenv()
+    api_key = os.environ["EMERGENT_LLM_KEY"]
+
+    async def timed(prompt: str, text: str) -> float:
+        chat = LlmChat(api_key=api_key, session_id=f"bench_{uuid.uuid4()}",
+                       system_message=prompt).with_model("openai", "gpt-5.2")
+        start = time.perf_counter()
+        await chat.send_message(UserMessage(text=f"Extract registration details from this speech: {text}"))
+        return time.perf_counter() - start
+
+    full_total = hybrid_total = 0.0
+    for row in rows:
+        language = LANGUAGE_NAMES.get(row["language"], "Hindi")
+        full_total += await timed(registration_prompt(language, REGISTRATION_FIELDS), row["text"])
+        start = time.perf_counter()
+        found = extract_registration(row["text"])
+        missing = [field for field in REGISTRATION_FIELDS if field not in found]
+        hybrid = time.perf_counter() - start
+        if missing:
+            hybrid += await timed(registration_prompt(language, missing), row["text"])
+        hybrid_total += hybrid
+    print(f"LLM only               {full_total / len(rows) * 1000:8.0f} ms/transcript")
+    print(f"local + LLM for gaps   {hybrid_total / len(rows) * 1000:8.0f} ms/transcript")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=200)
+    parser.add_argument("--llm", action="store_true", help="also time real LLM calls")
+    args = parser.parse_args()
+
+    rows = load_transcripts()
+    local_report(rows, args.repeat)
+    if args.llm:
+        asyncio.run(llm_report(rows))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""
+Benchmark: bytes per worker held by the matcher's working set.
+
+Compares full worker documents, projected dict records (the previous
+BlockingIndex layout: a dict per worker plus id-keyed blocks) and the
+compact slot/array BlockingIndex.
+
+Usage (from backend/):
+    python benchmarks/bench_memory.py --workers 100000
+"""
+import argparse
+import gc
+import os
+import random
+import sys
+import time
+import tracemalloc
+import uuid
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_matching import JOB_TYPES, STATES  # noqa: E402
+from matching import BlockingIndex  # noqa: E402
+
+LANGUAGES = ["hi", "bn", "te", "mr", "ta", "en"]
+
+
+def worker_docs(count: int, seed: int = 2):
+    """Freshly decoded-looking worker documents (new string objects each time)"""
+    rng = random.Random(seed)
+    for i in range(count):
+        state = rng.choice(list(STATES))
+        yield {
+            "worker_id": str(uuid.UUID(int=rng.getrandbits(128), version=4)),
+            "user_id": str(uuid.UUID(int=rng.getrandbits(128), version=4)),
+            "name": f"Worker {i}",
+            "phone_number": f"9{rng.randrange(10 ** 9):09d}",
+            "area": f"Village {rng.randrange(5000)}",
+            "district": "".join(rng.choice(STATES[state])),
+            "state": "".join(state),
+            "job_type": "".join(rng.choice(JOB_TYPES)),
+            "expected_daily_wage": rng.randrange(300, 1000, 25),
+            "skills": ["".join(rng.choice(JOB_TYPES))],
+            "language": "".join(rng.choice(LANGUAGES)),
+            "created_at": datetime.utcnow(),
+        }
+
+
+def build_full_docs(count: int):
+    return {doc["worker_id"]: doc for doc in worker_docs(count)}
+
+
+def build_dict_records(count: int):
+    """The previous layout: projected dict per worker, blocks of id strings"""
+    records, by_district, by_state_type, state_wages, type_wages = {}, {}, {}, {}, {}
+    for doc in worker_docs(count):
+        record = {field: doc[field] for field in
+                  ("worker_id", "district", "state", "job_type", "expected_daily_wage", "language")}
+        worker_id = record["worker_id"]
+        records[worker_id] = record
+        district, state = record["district"].lower(), record["state"].lower()
+        by_district.setdefault(district, set()).add(worker_id)
+        by_state_type.setdefault((state, record["job_type"]), set()).add(worker_id)
+        for blocks, key in ((state_wages, state), (type_wages, record["job_type"])):
+            wages, ids = blocks.setdefault(key, ([], []))
+            wages.append(record["expected_daily_wage"])
+            ids.append(worker_id)
+    return records, by_district, by_state_type, state_wages, type_wages
+
+
+def build_compact_index(count: int):
+    index = BlockingIndex("worker_id", "expected_daily_wage", extra_fields=("language",))
+    for doc in worker_docs(count):
+        index.add(doc)
+    return index
+
+
+def measure(build, count: int) -> tuple:
+    """(retained bytes, build seconds) of build(count)"""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    start = time.perf_counter()
+    structure = build(count)
+    seconds = time.perf_counter() - start
+    gc.collect()
+    retained = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    del structure
+    return retained, seconds
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--workers", type=int, default=100_000)
+    args = parser.parse_args()
+
+    print(f"{args.workers:,} workers")
+    results = {}
+    for name, build in (("full documents", build_full_docs),
+                        ("dict records", build_dict_records),
+                        ("compact index", build_compact_index)):
+        retained, seconds = measure(build, args.workers)
+        results[name] = retained
+        print(f"  {name:15}: {retained / args.workers:7.1f} bytes/worker  "
+              f"({retained / 2 ** 20:7.1f} MiB, built in {seconds:.2f}s)")
+    print(f"  compact vs dict records: {results['dict records'] / results['compact index']:.1f}x smaller")
+
+
+if __name__ == "__main__":
+    main()
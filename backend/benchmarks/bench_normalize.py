@@ -0,0 +1,64 @@
+"""
+Benchmark: accuracy and throughput of the chatbot's job type parser.
+
+Compares the previous exact-match dict (menu numbers plus one word per type
+in hi/en/bn) with the trie-based normalizer on the labelled corpus in
+tests/data/job_type_corpus.tsv.
+
+Usage (from backend/):
+    python benchmarks/bench_normalize.py --repeat 2000
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from normalize import normalize_job_type  # noqa: E402
+from tests.test_normalize import load_corpus  # noqa: E402
+
+LEGACY_MAPPING = {
+    "1": "Mason", "mason": "Mason", "राजमिस्त्री": "Mason", "রাজমিস্ত্রি": "Mason",
+    "2": "Labour", "labour": "Labour", "मजदूर": "Labour", "শ্রমিক": "Labour",
+    "3": "Plumber", "plumber": "Plumber", "प्लंबर": "Plumber", "প্লাম্বার": "Plumber",
+    "4": "Electrician", "electrician": "Electrician", "बिजली": "Electrician", "ইলেকট্রিশিয়ান": "Electrician",
+    "5": "Painter", "painter": "Painter", "पेंटर": "Painter", "পেইন্টার": "Painter"
+}
+
+
+def legacy_job_type(message: str):
+    return LEGACY_MAPPING.get(message.lower().strip())
+
+
+def measure(parse, corpus, repeat: int) -> dict:
+    correct = sum(1 for answer, expected in corpus if parse(answer) == expected)
+    answers = [answer for answer, _ in corpus]
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for answer in answers:
+            parse(answer)
+    elapsed = time.perf_counter() - start
+    calls = repeat * len(answers)
+    return {
+        "accuracy": correct / len(corpus),
+        "calls_per_second": calls / elapsed,
+        "us_per_call": elapsed / calls * 1e6,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=2000)
+    args = parser.parse_args()
+
+    corpus = load_corpus()
+    print(f"{len(corpus)} labelled answers, {args.repeat} passes")
+    for name, parse in (("legacy dict", legacy_job_type), ("trie normalizer", normalize_job_type)):
+        result = measure(parse, corpus, args.repeat)
+        print(f"{name:16s} accuracy {result['accuracy']:6.1%}  "
+              f"{result['calls_per_second']:>10,.0f} calls/s  {result['us_per_call']:6.2f} us/call")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+Benchmark: state-sharded matching over a process pool vs shard/process count.
+
+Usage (from backend/):
+    python benchmarks/bench_sharded.py --jobs 20000 --workers 20000 --states 20
+"""
+import argparse
+import multiprocessing
+import os
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from matching import merge_shard_results, shard_tasks  # noqa: E402
+
+JOB_TYPES = ["Mason", "Labour", "Plumber", "Electrician", "Painter"]
+
+
+def make_entities(count: int, states: int, id_field: str, wage_field: str, seed: int) -> list:
+    rng = random.Random(seed)
+    entities = []
+    for i in range(count):
+        state = rng.randrange(states)
+        entities.append({
+            id_field: f"{id_field}-{i}",
+            "district": f"district-{state}-{rng.randrange(30)}",
+            "state": f"state-{state}",
+            "job_type": rng.choice(JOB_TYPES),
+            wage_field: rng.randrange(300, 1500, 25),
+        })
+    return entities
+
+
+def run(tasks: list, processes: int) -> tuple:
+    start = time.perf_counter()
+    if processes == 1:
+        results = [fn(*args) for fn, args in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=processes,
+                                 mp_context=multiprocessing.get_context("spawn")) as pool:
+            futures = [pool.submit(fn, *args) for fn, args in tasks]
+            results = [future.result() for future in futures]
+    pairs, _ = merge_shard_results(results)
+    return time.perf_counter() - start, len(pairs)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--jobs", type=int, default=20000)
+    parser.add_argument("--workers", type=int, default=20000)
+    parser.add_argument("--states", type=int, default=20)
+    parser.add_argument("--max-processes", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    jobs = make_entities(args.jobs, args.states, "job_id", "daily_wage_offered", seed=1)
+    workers = make_entities(args.workers, args.states, "worker_id", "expected_daily_wage", seed=2)
+    tasks = shard_tasks(jobs, workers)
+    print(f"{args.jobs} jobs x {args.workers} workers over {args.states} states -> {len(tasks)} shards")
+
+    baseline = None
+    processes = 1
+    while processes <= args.max_processes:
+        seconds, matches = run(tasks, processes)
+        baseline = baseline or seconds
+        print(f"  {processes:3d} processes: {seconds:8.3f}s  {matches:,} matches  "
+              f"speedup {baseline / seconds:5.2f}x")
+        processes *= 2
+
+
+if __name__ == "__main__":
+    main()
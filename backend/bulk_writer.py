@@ -0,0 +1,117 @@
+"""
+Buffered bulk writer for matches and their notifications.
+
+Matches are flushed with insert_many(ordered=False). The unique
+(job_id, worker_id) index on matches turns re-inserted pairs into
+duplicate-key errors, which are skipped, so reruns stay idempotent and
+only genuinely new matches get a notification. When given the jobs
+collection, the writer also keeps each job's denormalized match_count in
+step with the matches it actually inserted.
+"""
+import time
+from collections import Counter, deque
+
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
+
+DUPLICATE_KEY_ERROR = 11000
+
+
+class BulkMatchWriter:
+    """Buffers (match, notification) pairs and writes them in batches"""
+
+    def __init__(self, matches_collection, notifications_collection, batch_size: int = 500,
+                 history: int = 100, jobs_collection=None):
+        self.matches_collection = matches_collection
+        self.notifications_collection = notifications_collection
+        self.jobs_collection = jobs_collection
+        self.batch_size = batch_size
+        self._matches = []
+        self._notifications = []
+        self.flushes = deque(maxlen=history)
+        self.totals = {"flushes": 0, "inserted": 0, "duplicates": 0, "notifications": 0,
+                       "counter_updates": 0, "errors": 0, "seconds": 0.0}
+
+    def __len__(self):
+        return len(self._matches)
+
+    async def add(self, match_doc: dict, notification_doc: dict) -> list:
+        """Queue a match and its notification, flushing when the batch is full"""
+        self._matches.append(match_doc)
+        self._notifications.append(notification_doc)
+        if len(self._matches) >= self.batch_size:
+            return await self.flush()
+        return []
+
+    async def flush(self) -> list:
+        """Write all buffered matches; returns the match documents actually inserted"""
+        matches, notifications = self._matches, self._notifications
+        self._matches, self._notifications = [], []
+        if not matches:
+            return []
+
+        start = time.perf_counter()
+        failed = set()
+        duplicates = errors = 0
+        try:
+            await self.matches_collection.insert_many(matches, ordered=False)
+        except BulkWriteError as e:
+            for error in e.details.get("writeErrors", []):
+                failed.add(error["index"])
+                if error.get("code") == DUPLICATE_KEY_ERROR:
+                    duplicates += 1
+                else:
+                    errors += 1
+                    print(f"Match write error: {error.get('errmsg')}")
+
+        inserted = [match for i, match in enumerate(matches) if i not in failed]
+        pending = [notif for i, notif in enumerate(notifications) if i not in failed]
+        if pending:
+            try:
+                await self.notifications_collection.insert_many(pending, ordered=False)
+            except BulkWriteError as e:
+                errors += len(e.details.get("writeErrors", []))
+                print(f"Notification write errors: {len(e.details.get('writeErrors', []))}")
+
+        counter_updates = 0
+        if inserted and self.jobs_collection is not None:
+            per_job = Counter(match["job_id"] for match in inserted)
+            try:
+                await self.jobs_collection.bulk_write(
+                    [UpdateOne({"job_id": job_id}, {"$inc": {"match_count": n}})
+                     for job_id, n in per_job.items()],
+                    ordered=False
+                )
+                counter_updates = len(per_job)
+            except BulkWriteError as e:
+                errors += len(e.details.get("writeErrors", []))
+                print(f"Match count update errors: {len(e.details.get('writeErrors', []))}")
+
+        seconds = time.perf_counter() - start
+        flush = {
+            "matches": len(matches),
+            "inserted": len(inserted),
+            "duplicates": duplicates,
+            "notifications": len(pending),
+            "counter_updates": counter_updates,
+            "errors": errors,
+            "seconds": round(seconds, 6),
+        }
+        self.flushes.append(flush)
+        self.totals["flushes"] += 1
+        for key in ("inserted", "duplicates", "notifications", "counter_updates", "errors"):
+            self.totals[key] += flush[key]
+        self.totals["seconds"] += seconds
+        return inserted
+
+    def stats(self) -> dict:
+        """Cumulative totals plus latency of recent flushes"""
+        latencies = sorted(flush["seconds"] for flush in self.flushes)
+        return {
+            "batch_size": self.batch_size,
+            "buffered": len(self._matches),
+            "totals": dict(self.totals, seconds=round(self.totals["seconds"], 6)),
+            "recent_flushes": list(self.flushes)[-10:],
+            "flush_seconds_p50": latencies[len(latencies) // 2] if latencies else None,
+            "flush_seconds_max": latencies[-1] if latencies else None,
+        }
@@ -0,0 +1,197 @@
+"""
+Caching helpers shared by the API: a bounded LRU, a content-hash key helper,
+a two-tier cache that backs the LRU with a shared MongoDB collection and
+single-flight coalescing of concurrent identical calls.
+"""
+import asyncio
+import hashlib
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Optional
+
+
+def content_key(*parts: str) -> str:
+    """SHA-256 hex digest of the given parts (unambiguously separated)"""
+    digest = hashlib.sha256()
+    for part in parts:
+        data = part.encode("utf-8")
+        digest.update(len(data).to_bytes(8, "little"))
+        digest.update(data)
+    return digest.hexdigest()
+
+
+def _size_of(key, value) -> int:
+    """Approximate payload bytes of a cache entry"""
+    size = len(key) if isinstance(key, (str, bytes)) else 64
+    if isinstance(value, str):
+        size += len(value.encode("utf-8"))
+    elif isinstance(value, bytes):
+        size += len(value)
+    else:
+        size += len(repr(value))
+    return size
+
+
+class LRUCache:
+    """
+    In-process LRU bounded by entry count and approximate payload bytes, with
+    an optional per-entry time-to-live. Tracks hit/miss/eviction counters.
+    """
+
+    def __init__(self, max_entries: int = 10000, max_bytes: Optional[int] = None,
+                 ttl_seconds: Optional[float] = None, clock=time.monotonic):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.clock = clock
+        self._data = OrderedDict()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def __len__(self):
+        return len(self._data)
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def get(self, key, default=None):
+        entry = self._data.get(key)
+        if entry is not None and entry[2] is not None and entry[2] <= self.clock():
+            self.pop(key)
+            self.expirations += 1
+            entry = None
+        if entry is None:
+            self.misses += 1
+            return default
+        self._data.move_to_end(key)
+        self.hits += 1
+        return entry[0]
+
+    def set(self, key, value):
+        old = self._data.pop(key, None)
+        if old is not None:
+            self._bytes -= old[1]
+        size = _size_of(key, value)
+        expires_at = self.clock() + self.ttl_seconds if self.ttl_seconds is not None else None
+        self._data[key] = (value, size, expires_at)
+        self._bytes += size
+        while self._data and (len(self._data) > self.max_entries
+                              or (self.max_bytes is not None and self._bytes > self.max_bytes)):
+            _, (_, evicted_size, _) = self._data.popitem(last=False)
+            self._bytes -= evicted_size
+            self.evictions += 1
+
+    def pop(self, key, default=None):
+        entry = self._data.pop(key, None)
+        if entry is None:
+            return default
+        self._bytes -= entry[1]
+        return entry[0]
+
+    def clear(self):
+        self._data.clear()
+        self._bytes = 0
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._data),
+            "bytes": self._bytes,
+            "max_entries": self.max_entries,
+            "max_bytes": self.max_bytes,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else None,
+        }
+
+
+class TwoTierCache:
+    """
+    LRU in front of a shared persistent tier (a Motor collection). Values found
+    in the persistent tier are promoted into the LRU, so a restarted or newly
+    scaled-out process warms up without recomputing them.
+    """
+
+    def __init__(self, lru: LRUCache, collection=None):
+        self.lru = lru
+        self.collection = collection
+        self.persistent_hits = 0
+        self.persistent_misses = 0
+        self.persistent_errors = 0
+
+    async def get(self, key: str):
+        value = self.lru.get(key)
+        if value is not None or self.collection is None:
+            return value
+        try:
+            doc = await self.collection.find_one({"_id": key}, {"value": 1})
+        except Exception as e:
+            self.persistent_errors += 1
+            print(f"Cache read error: {e}")
+            return None
+        if doc is None:
+            self.persistent_misses += 1
+            return None
+        self.persistent_hits += 1
+        self.lru.set(key, doc["value"])
+        return doc["value"]
+
+    async def set(self, key: str, value, **fields):
+        self.lru.set(key, value)
+        if self.collection is None:
+            return
+        try:
+            await self.collection.update_one(
+                {"_id": key},
+                {"$set": dict(fields, value=value, updated_at=datetime.utcnow())},
+                upsert=True
+            )
+        except Exception as e:
+            self.persistent_errors += 1
+            print(f"Cache write error: {e}")
+
+    def stats(self) -> dict:
+        return dict(
+            self.lru.stats(),
+            persistent_hits=self.persistent_hits,
+            persistent_misses=self.persistent_misses,
+            persistent_errors=self.persistent_errors,
+        )
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls for the same key into one in-flight task;
+    every caller awaits the same result.
+    """
+
+    def __init__(self):
+        self._inflight = {}
+        self.calls = 0
+        self.coalesced = 0
+
+    def __len__(self):
+        return len(self._inflight)
+
+    async def do(self, key, fn):
+        """Run fn() for key unless a call for key is already in flight"""
+        task = self._inflight.get(key)
+        if task is None:
+            self.calls += 1
+            task = asyncio.ensure_future(fn())
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        else:
+            self.coalesced += 1
+        # Shielded so one caller disconnecting does not cancel the shared call
+        return await asyncio.shield(task)
+
+    def stats(self) -> dict:
+        return {"calls": self.calls, "coalesced": self.coalesced, "in_flight": len(self._inflight)}
@@ -0,0 +1,298 @@
+"""
+Worker sign-up chatbot: a declarative step table built once at import time
+and a write-behind session store.
+
+Each step names the data field the user's answer fills, how the answer is
+parsed and which step (and prompt) comes next. The session store keeps
+active conversations in memory and writes them to Mongo when they complete,
+go idle or the process shuts down, appending only new messages with $push
+(capped to the most recent max_messages). Completed sessions are archived
+as a compact summary document.
+"""
+import time
+from datetime import datetime
+from typing import Optional
+
+from normalize import normalize_digits, normalize_job_type, parse_number
+from normalize import parse_phone as find_phone
+
+# Language-specific greeting for a new session
+GREETINGS = {
+    "hi": "नमस्ते! मैं आपका साथी हूं। आइए शुरू करते हैं। आपका नाम क्या है?",
+    "en": "Hello! I'm here to help you register. What is your name?",
+    "bn": "নমস্কার! আমি আপনার সাহায্যকারী। আপনার নাম কি?",
+    "te": "నమస్కారం! నేను మీకు సహాయం చేస్తాను। మీ పేరు ఏమిటి?",
+    "mr": "नमस्कार! मी तुम्हाला मदत करेन। तुमचे नाव काय आहे?",
+    "ta": "வணக்கம்! நான் உங்களுக்கு உதவுவேன். உங்கள் பெயர் என்ன?",
+    "gu": "નમસ્તે! હું તમારી મદદ કરીશ। તમારું નામ શું છે?",
+}
+
+# Language-specific questions, keyed by the step they ask for
+QUESTIONS = {
+    "hi": {
+        "area": "बहुत अच्छा! आप कहाँ रहते हैं? (गाँव/शहर का नाम)",
+        "district": "धन्यवाद! आपका जिला कौन सा है?",
+        "state": "अच्छा! आपका राज्य कौन सा है?",
+        "job_type": "समझ गया! आप किस तरह का काम करते हैं?\n1. राजमिस्त्री (Mason)\n2. मजदूर (Labour)\n3. प्लंबर (Plumber)\n4. बिजली मिस्त्री (Electrician)\n5. पेंटर (Painter)",
+        "wage": "बढ़िया! आप रोज़ कितने पैसे की उम्मीद करते हैं? (₹)",
+        "phone": "लगभग हो गया! आपका मोबाइल नंबर क्या है?",
+        "complete": "बहुत बढ़िया! मैंने सारी जानकारी इकट्ठा कर ली है। अब 'Complete Registration' बटन पर क्लिक करें।"
+    },
+    "en": {
+        "area": "Great! Where do you live? (Village/Town name)",
+        "district": "Thank you! Which district are you in?",
+        "state": "Good! Which state?",
+        "job_type": "Understood! What type of work do you do?\n1. Mason\n2. Labour\n3. Plumber\n4. Electrician\n5. Painter",
+        "wage": "Excellent! What daily wage do you expect? (₹)",
+        "phone": "Almost done! What is your mobile number?",
+        "complete": "Perfect! I have collected all information. Now click the 'Complete Registration' button."
+    },
+    "bn": {
+        "area": "দুর্দান্ত! আপনি কোথায় থাকেন? (গ্রাম/শহর)",
+        "district": "ধন্যবাদ! আপনার জেলা কোনটি?",
+        "state": "ভাল! কোন রাজ্য?",
+        "job_type": "বুঝলাম! আপনি কী ধরনের কাজ করেন?\n1. রাজমিস্ত্রি\n2. শ্রমিক\n3. প্লাম্বার\n4. ইলেকট্রিশিয়ান\n5. পেইন্টার",
+        "wage": "চমৎকার! আপনি কত দৈনিক মজুরি আশা করেন? (₹)",
+        "phone": "প্রায় শেষ! আপনার মোবাইল নম্বর কত?",
+        "complete": "নিখুঁত! আমি সব তথ্য সংগ্রহ করেছি। এখন 'Complete Registration' বোতামে ক্লিক করুন।"
+    }
+}
+
+DEFAULT_JOB_TYPE = "Labour"
+DEFAULT_WAGE = 500
+# Larger numbers are phone numbers or misheard answers, not a day's wage
+MAX_WAGE = 100_000
+
+FIRST_STEP = "name"
+COMPLETE_STEP = "complete"
+
+# Session fields rewritten on every flush (messages are appended separately)
+SESSION_FIELDS = ("data", "current_step", "language", "turns", "updated_at")
+
+
+def parse_text(message: str):
+    return message
+
+
+def parse_job_type(message: str):
+    # Menu number, trade name in any supported script, or a close misspelling
+    return normalize_job_type(message) or DEFAULT_JOB_TYPE
+
+
+def parse_wage(message: str):
+    wage = parse_number(message)
+    return wage if wage is not None and wage <= MAX_WAGE else DEFAULT_WAGE
+
+
+def parse_phone(message: str):
+    # A 10-digit mobile number if present, else every digit in the answer
+    phone = find_phone(message)
+    if phone:
+        return phone
+    digits = "".join(char for char in normalize_digits(message) if char in "0123456789")
+    return digits or message
+
+
+class Step:
+    """One question of the conversation: the field it fills and what follows"""
+    __slots__ = ("field", "parse", "next_step")
+
+    def __init__(self, field: str, parse, next_step: str):
+        self.field = field
+        self.parse = parse
+        self.next_step = next_step
+
+
+# current step -> answer handling; the next step's question is the reply
+STEPS = {
+    "name": Step("name", parse_text, "area"),
+    "area": Step("area", parse_text, "district"),
+    "district": Step("district", parse_text, "state"),
+    "state": Step("state", parse_text, "job_type"),
+    "job_type": Step("job_type", parse_job_type, "wage"),
+    "wage": Step("expected_daily_wage", parse_wage, "phone"),
+    "phone": Step("phone_number", parse_phone, COMPLETE_STEP),
+}
+
+
+def greeting(language: str) -> str:
+    return GREETINGS.get(language, GREETINGS["hi"])
+
+
+def advance(current_step: str, message: str, language: str) -> tuple:
+    """
+    (field, value, reply, next_step) for the user's answer at current_step.
+    Past the last step nothing is recorded and the reply is empty.
+    """
+    step = STEPS.get(current_step)
+    if step is None:
+        return None, None, "", current_step
+    questions = QUESTIONS.get(language, QUESTIONS["hi"])
+    return step.field, step.parse(message), questions[step.next_step], step.next_step
+
+
+def new_session(session_id: str, language: str) -> dict:
+    now = datetime.utcnow()
+    return {
+        "session_id": session_id,
+        "messages": [{"role": "assistant", "content": greeting(language)}],
+        "data": {},
+        "current_step": FIRST_STEP,
+        "language": language,
+        "turns": 0,
+        "created_at": now,
+        "updated_at": now
+    }
+
+
+class _Entry:
+    __slots__ = ("session", "persisted", "pending_messages", "dirty", "touched_at")
+
+    def __init__(self, session: dict, persisted: bool, now: float):
+        self.session = session
+        self.persisted = persisted
+        self.pending_messages = [] if persisted else list(session["messages"])
+        self.dirty = not persisted
+        self.touched_at = now
+
+
+class SessionStore:
+    """
+    Write-behind cache of chatbot sessions in front of a Motor collection.
+
+    Turns mutate the in-memory session; flush() inserts a new session or
+    $sets its fields and $pushes only the messages added since the last
+    flush. Sessions are flushed when they reach the complete step, when idle
+    for idle_seconds (flush_idle) and on shutdown (flush_all). With
+    idle_seconds=0 every turn is written through immediately.
+
+    With max_messages set, only the most recent max_messages messages are
+    kept (in memory and via $push/$slice), so a session document and each
+    write to it stay bounded however long the conversation runs.
+    """
+
+    def __init__(self, collection, idle_seconds: float = 60, max_messages: Optional[int] = None,
+                 archive_collection=None, clock=time.monotonic):
+        self.collection = collection
+        self.idle_seconds = idle_seconds
+        self.max_messages = max_messages
+        self.archive_collection = archive_collection
+        self.clock = clock
+        self._entries = {}
+        self.hits = 0
+        self.loads = 0
+        self.flushes = 0
+        self.flush_errors = 0
+        self.archived = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    async def get(self, session_id: str) -> Optional[dict]:
+        entry = self._entries.get(session_id)
+        if entry is not None:
+            self.hits += 1
+            entry.touched_at = self.clock()
+            return entry.session
+        session = await self.collection.find_one({"session_id": session_id}, {"_id": 0})
+        self.loads += 1
+        if session is None:
+            return None
+        self._entries[session_id] = _Entry(session, persisted=True, now=self.clock())
+        return session
+
+    async def create(self, session: dict):
+        self._entries[session["session_id"]] = _Entry(session, persisted=False, now=self.clock())
+        await self._after_change(session)
+
+    async def record_turn(self, session: dict, messages: list, **fields):
+        """Apply one conversation turn (new messages and changed fields)"""
+        entry = self._entries[session["session_id"]]
+        session["messages"].extend(messages)
+        session.update(fields, turns=session.get("turns", 0) + 1, updated_at=datetime.utcnow())
+        entry.pending_messages.extend(messages)
+        if self.max_messages:
+            del session["messages"][:-self.max_messages]
+            del entry.pending_messages[:-self.max_messages]
+        entry.dirty = True
+        entry.touched_at = self.clock()
+        await self._after_change(session)
+
+    async def _after_change(self, session: dict):
+        if self.idle_seconds <= 0 or session.get("current_step") == COMPLETE_STEP:
+            await self.flush(session["session_id"])
+
+    async def flush(self, session_id: str):
+        entry = self._entries.get(session_id)
+        if entry is None or not entry.dirty:
+            return
+        session = entry.session
+        pending, entry.pending_messages, entry.dirty = entry.pending_messages, [], False
+        try:
+            if not entry.persisted:
+                await self.collection.insert_one(dict(session, messages=list(session["messages"])))
+                entry.persisted = True
+            else:
+                push = {"$each": pending}
+                if self.max_messages:
+                    push["$slice"] = -self.max_messages
+                await self.collection.update_one(
+                    {"session_id": session_id},
+                    {"$set": {field: session[field] for field in SESSION_FIELDS if field in session},
+                     "$push": {"messages": push}}
+                )
+            self.flushes += 1
+        except Exception as e:
+            # Keep the changes so the next flush retries them
+            entry.pending_messages[:0] = pending
+            entry.dirty = True
+            self.flush_errors += 1
+            print(f"Chatbot session flush error: {e}")
+
+    async def flush_idle(self):
+        """Write and evict sessions untouched for idle_seconds"""
+        cutoff = self.clock() - self.idle_seconds
+        for session_id in [sid for sid, entry in self._entries.items() if entry.touched_at <= cutoff]:
+            await self.flush(session_id)
+            entry = self._entries.get(session_id)
+            if entry is not None and not entry.dirty and entry.touched_at <= cutoff:
+                del self._entries[session_id]
+
+    async def flush_all(self):
+        for session_id in list(self._entries):
+            await self.flush(session_id)
+
+    async def archive(self, session_id: str, **summary):
+        """
+        Replace a finished session with a compact summary document (collected
+        data, language, turn count and timestamps, no message history).
+        """
+        session = await self.get(session_id)
+        if session is None:
+            return
+        if self.archive_collection is not None:
+            await self.archive_collection.insert_one({
+                "session_id": session_id,
+                "language": session.get("language"),
+                "data": session.get("data", {}),
+                "turns": session.get("turns", 0),
+                "created_at": session.get("created_at"),
+                "completed_at": datetime.utcnow(),
+                **summary
+            })
+        self._entries.pop(session_id, None)
+        await self.collection.delete_one({"session_id": session_id})
+        self.archived += 1
+
+    def stats(self) -> dict:
+        return {
+            "cached": len(self._entries),
+            "dirty": sum(1 for entry in self._entries.values() if entry.dirty),
+            "idle_seconds": self.idle_seconds,
+            "hits": self.hits,
+            "loads": self.loads,
+            "flushes": self.flushes,
+            "flush_errors": self.flush_errors,
+            "archived": self.archived,
+            "max_messages": self.max_messages,
+        }
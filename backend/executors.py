@@ -0,0 +1,84 @@
+"""
+Bounded thread pool for CPU-heavy blocking calls (e.g. bcrypt) made from
+async handlers, with admission control and queue-depth metrics.
+"""
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from batching import Histogram
+
+
+class ExecutorOverloaded(Exception):
+    """Raised when a call is rejected because the pool and its queue are full"""
+
+
+class BoundedExecutor:
+    """
+    Runs blocking functions on max_workers threads. At most max_queue calls
+    may wait for a thread; further calls are rejected immediately with
+    ExecutorOverloaded so a burst degrades into fast failures instead of an
+    ever-growing backlog.
+    """
+
+    def __init__(self, max_workers: int, max_queue: int, name: str = "bounded"):
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=name)
+        self.in_flight = 0
+        self.running = 0
+        self._running_lock = threading.Lock()
+        self.completed = 0
+        self.rejected = 0
+        self.max_queue_depth = 0
+        self.wait_seconds = Histogram([0.001, 0.01, 0.05, 0.1, 0.25, 0.5, 1, 2])
+        self.run_seconds = Histogram([0.01, 0.05, 0.1, 0.25, 0.5, 1])
+
+    @property
+    def queue_depth(self) -> int:
+        return self.in_flight - self.running
+
+    async def run(self, fn, *args):
+        """Run fn(*args) on the pool; raises ExecutorOverloaded when full"""
+        if self.in_flight >= self.max_workers + self.max_queue:
+            self.rejected += 1
+            raise ExecutorOverloaded(f"{self.in_flight} calls in flight")
+        self.in_flight += 1
+        self.max_queue_depth = max(self.max_queue_depth, self.queue_depth)
+        submitted = time.perf_counter()
+
+        def call():
+            started = time.perf_counter()
+            with self._running_lock:
+                self.running += 1
+            try:
+                return fn(*args), started
+            finally:
+                with self._running_lock:
+                    self.running -= 1
+
+        try:
+            result, started = await asyncio.get_running_loop().run_in_executor(self._pool, call)
+        finally:
+            self.in_flight -= 1
+        self.completed += 1
+        self.wait_seconds.observe(started - submitted)
+        self.run_seconds.observe(time.perf_counter() - started)
+        return result
+
+    def shutdown(self):
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+    def stats(self) -> dict:
+        return {
+            "max_workers": self.max_workers,
+            "max_queue": self.max_queue,
+            "in_flight": self.in_flight,
+            "queue_depth": self.queue_depth,
+            "max_queue_depth": self.max_queue_depth,
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "wait_seconds": self.wait_seconds.stats(),
+            "run_seconds": self.run_seconds.stats(),
+        }
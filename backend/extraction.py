@@ -0,0 +1,251 @@
+"""
+Rule-based extraction of registration fields from a speech transcript.
+
+Runs before the LLM in /api/audio/parse-registration: phone numbers and
+rupee amounts come from regexes, states and districts from the gazetteer,
+trades from the job type normalizer, and names, villages and unlisted
+districts from cue words ("mera naam ...", "... gaon", "jila ..."). The
+LLM is then asked only for the fields still missing, with a prompt that
+lists just those fields.
+"""
+import json
+import re
+import unicodedata
+from typing import Optional
+
+from batching import Histogram
+from gazetteer import gazetteer as default_gazetteer
+from normalize import PHONE_RE, normalize_digits, normalize_job_type, normalize_text
+
+REGISTRATION_FIELDS = ("name", "area", "district", "state", "job_type", "expected_daily_wage", "phone_number")
+
+FIELD_DESCRIPTIONS = {
+    "name": "The person's name",
+    "area": "Village or area name",
+    "district": "District name",
+    "state": "State name",
+    "job_type": "Type of work (Mason, Labour, Plumber, Electrician, Painter)",
+    "expected_daily_wage": "Expected daily wage in rupees (just the number)",
+    "phone_number": "Phone number (10 digits)",
+}
+
+FIELD_EXAMPLES = {
+    "name": "Raj Kumar", "area": "Agra", "district": "Agra", "state": "Uttar Pradesh",
+    "job_type": "Mason", "expected_daily_wage": 500, "phone_number": "9876543210",
+}
+
+# Plausible daily wages; other numbers are ages, hours, house numbers...
+WAGE_MIN, WAGE_MAX = 100, 10000
+
+_AMOUNT = r'(\d[\d,]*(?:\.\d+)?)'
+WAGE_PATTERNS = [
+    # ₹600, Rs. 600
+    re.compile(r'(?:₹|(?<!\w)rs\.?|(?<!\w)inr)\s*' + _AMOUNT),
+    # 600 rupees / 600 रुपये / 600 টাকা ...
+    re.compile(_AMOUNT + r'\s*(?:/-\s*)?(?:₹|rs(?!\w)|rupe|rupa|rupi|रुपय|रुपए|रुपया|रु|টাকা|రూపాయ|ரூபா'
+               r'|રૂપિયા|ರೂಪಾಯ|രൂപ|ਰੁਪਏ|ଟଙ୍କା|روپ)'),
+    # wage / roz / dihadi ... 600
+    re.compile(r'(?:wage|salary|per day|daily|mazdoori|majdoori|mazduri|majduri|dihadi|rozana|(?<!\w)roz'
+               r'|मजदूरी|मज़दूरी|दिहाड़ी|रोज़|रोज|प्रतिदिन|মজুরি|রোজ|కూలి|రోజుకు|கூலி|ஒரு நாளைக்கு|પગાર|રોજ'
+               r'|मजुरी|रोजी)\D{0,24}?' + _AMOUNT),
+]
+NUMBER_RE = re.compile(r'(?<!\d)' + _AMOUNT)
+# Phone numbers read out in groups ("98765 43210", "9 8 7 6 5 ...")
+DIGIT_RUN_RE = re.compile(r'(?<!\d)\d(?:[\s-]*\d){9,11}(?!\d)')
+
+NAME_CUE_RE = re.compile(
+    r'(?<!\w)(?:my name is|my name\'s|name is|mera naam|mera nam|mera name|naam|मेरा नाम|नाम|আমার নাম|নাম'
+    r'|నా పేరు|माझे नाव|माझं नाव|என் பெயர்|என் பேர்|મારું નામ|મારુ નામ|ನನ್ನ ಹೆಸರು|എന്റെ പേര്|ਮੇਰਾ ਨਾਮ'
+    r'|ମୋ ନାମ|মোৰ নাম|میرا نام)\s*(?:is|hai|है|:|-)?\s*',
+    re.IGNORECASE
+)
+CLAUSE_END_RE = re.compile(r'[,.।!?;\n]')
+NAME_MAX_TOKENS = 3
+
+AREA_CUES = {
+    "village", "gaon", "gaanv", "gaun", "gram", "गाँव", "गांव", "ग्राम", "गाव", "গ্রাম", "గ్రామం", "கிராமம்",
+    "ગામ", "ಗ್ರಾಮ", "ഗ്രാമം", "ਪਿੰਡ", "ଗ୍ରାମ", "گاؤں",
+}
+DISTRICT_CUES = {
+    "district", "dist", "jila", "zila", "jilla", "zilla", "jile", "zile", "जिला", "ज़िला", "जिले", "ज़िले",
+    "জেলা", "జిల్లా", "மாவட்டம்", "જિલ્લો", "જિલ્લા", "ಜಿಲ್ಲೆ", "ജില്ല", "ਜ਼ਿਲ੍ਹਾ", "ଜିଲ୍ଲା", "ضلع",
+}
+# Words that end a name or cannot be a place name next to a cue
+STOPWORDS = {
+    "hai", "hain", "hoon", "hu", "hun", "is", "am", "and", "aur", "from", "se", "in", "mein", "me", "of",
+    "the", "my", "mera", "meri", "ka", "ki", "ke", "ji", "i", "main", "mai", "rehta", "rahta", "live",
+    "है", "हैं", "हूं", "हूँ", "और", "से", "में", "का", "की", "के", "जी", "मेरा", "मेरी", "मैं", "रहता",
+    "থেকে", "আমার", "আমি", "আছে", "ahe", "आहे", "माझे", "છે", "મારું", "నా", "నుండి", "என்", "இருந்து",
+}
+STOPWORDS |= AREA_CUES | DISTRICT_CUES
+
+
+def _title(value: str) -> str:
+    return value.title() if value.isascii() else value
+
+
+def _word_near_cue(text: str, cues: set) -> Optional[str]:
+    """
+    The word after the first cue word ("village Rampur"), else the one
+    before it ("Rampur gaon"), looking only within the cue's clause
+    """
+    for clause in CLAUSE_END_RE.split(text):
+        tokens = normalize_text(clause).split()
+        for i, token in enumerate(tokens):
+            if token not in cues:
+                continue
+            for neighbour in (i + 1, i - 1):
+                if 0 <= neighbour < len(tokens):
+                    word = tokens[neighbour]
+                    if word not in STOPWORDS and not word.isdigit():
+                        return _title(word)
+    return None
+
+
+def find_phone(text: str) -> tuple:
+    """(10-digit mobile number, (start, end) span in text) or (None, None); text has ASCII digits"""
+    match = PHONE_RE.search(text)
+    if match:
+        return re.sub(r'[\s-]', '', match.group(1)), match.span()
+    for match in DIGIT_RUN_RE.finditer(text):
+        digits = re.sub(r'[\s-]', '', match.group())
+        if len(digits) == 12 and digits.startswith("91"):
+            digits = digits[2:]
+        elif len(digits) == 11 and digits.startswith("0"):
+            digits = digits[1:]
+        if len(digits) == 10 and digits[0] in "6789":
+            return digits, match.span()
+    return None, None
+
+
+def _to_amount(value: str) -> Optional[int]:
+    amount = int(float(value.replace(",", "")))
+    return amount if WAGE_MIN <= amount <= WAGE_MAX else None
+
+
+def find_wage(text: str) -> Optional[int]:
+    """Daily wage from a lower-cased text with ASCII digits and any phone number removed"""
+    for pattern in WAGE_PATTERNS:
+        for match in pattern.finditer(text):
+            amount = _to_amount(match.group(1))
+            if amount is not None:
+                return amount
+    # A single plausible amount with no cue at all
+    amounts = {amount for amount in map(_to_amount, NUMBER_RE.findall(text)) if amount is not None}
+    return amounts.pop() if len(amounts) == 1 else None
+
+
+def find_name(text: str) -> Optional[str]:
+    match = NAME_CUE_RE.search(text)
+    if not match:
+        return None
+    clause = CLAUSE_END_RE.split(text[match.end():], 1)[0]
+    words = []
+    for word in normalize_text(clause).split():
+        if word in STOPWORDS or word.isdigit() or len(words) == NAME_MAX_TOKENS:
+            break
+        words.append(word)
+    return _title(" ".join(words)) if words else None
+
+
+def extract_registration(text: str, places=default_gazetteer) -> dict:
+    """Registration fields the rules could find in text; absent fields are omitted"""
+    found = {}
+    text = normalize_digits(unicodedata.normalize("NFC", text))
+
+    phone, span = find_phone(text)
+    if phone:
+        found["phone_number"] = phone
+        text = text[:span[0]] + " " + text[span[1]:]
+
+    wage = find_wage(text.lower())
+    if wage is not None:
+        found["expected_daily_wage"] = wage
+
+    normalized = normalize_text(text)
+    # Only an unambiguous trade; with several named the LLM decides
+    job_types = normalize_job_type.candidates(normalized)
+    if len(job_types) == 1:
+        found["job_type"] = job_types[0]
+
+    state = places.find_state(normalized, normalized=True)
+    district, district_state = places.find_district(normalized, normalized=True)
+    district = district or _word_near_cue(text, DISTRICT_CUES)
+    state = state or district_state
+    if district:
+        found["district"] = district
+    if state:
+        found["state"] = state
+
+    area = _word_near_cue(text, AREA_CUES)
+    if area:
+        found["area"] = area
+
+    name = find_name(text)
+    if name:
+        found["name"] = name
+    return found
+
+
+def registration_prompt(language_name: str, fields) -> str:
+    """LLM system prompt asking for just the given fields"""
+    listed = "\n".join(f"- {field}: {FIELD_DESCRIPTIONS[field]}" for field in fields)
+    example = json.dumps({field: FIELD_EXAMPLES[field] for field in fields}, ensure_ascii=False)
+    return f"""You are an AI assistant that extracts structured registration information from transcribed speech.
+The speech is in {language_name}. Extract the following fields if present:
+{listed}
+
+Return the data as a valid JSON object with these exact field names. If a field is not found, use null.
+Example output: {example}
+Only output the JSON, nothing else."""
+
+
+def parse_json_object(result: str) -> dict:
+    """JSON object from an LLM reply, tolerating a markdown code fence; {} if unparseable"""
+    clean_result = result.strip()
+    if clean_result.startswith("```"):
+        clean_result = clean_result.split("```")[1]
+        if clean_result.startswith("json"):
+            clean_result = clean_result[4:]
+    try:
+        parsed = json.loads(clean_result.strip())
+    except json.JSONDecodeError:
+        return {}
+    return parsed if isinstance(parsed, dict) else {}
+
+
+class ExtractionStats:
+    """Per-field hit rates (local rules vs LLM) and latency of each stage"""
+
+    def __init__(self, fields=REGISTRATION_FIELDS):
+        self.requests = 0
+        self.llm_calls = 0
+        self.llm_errors = 0
+        self.counts = {field: {"local": 0, "llm": 0, "missing": 0} for field in fields}
+        self.local_seconds = Histogram([0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05])
+        self.llm_seconds = Histogram([0.25, 0.5, 1, 2, 5, 10, 30])
+
+    def record(self, sources: dict, local_seconds: float, llm_seconds: Optional[float] = None):
+        """sources maps each filled field to "local" or "llm"; llm_seconds is None when the LLM was skipped"""
+        self.requests += 1
+        for field, counts in self.counts.items():
+            counts[sources.get(field, "missing")] += 1
+        self.local_seconds.observe(local_seconds)
+        if llm_seconds is not None:
+            self.llm_calls += 1
+            self.llm_seconds.observe(llm_seconds)
+
+    def stats(self) -> dict:
+        fields = {}
+        for field, counts in self.counts.items():
+            fields[field] = dict(counts, local_hit_rate=round(counts["local"] / self.requests, 4)
+                                 if self.requests else None)
+        return {
+            "requests": self.requests,
+            "llm_calls": self.llm_calls,
+            "llm_skipped": self.requests - self.llm_calls,
+            "llm_errors": self.llm_errors,
+            "fields": fields,
+            "local_seconds": self.local_seconds.stats(),
+            "llm_seconds": self.llm_seconds.stats(),
+        }
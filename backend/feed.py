@@ -0,0 +1,93 @@
+"""
+In-memory "jobs near me" feed: active jobs bucketed by
+(state, district, job_type), newest first.
+
+A page is read by walking one bucket from its newest end, so serving it
+costs O(page size) regardless of how many jobs exist elsewhere. Every
+bucket carries a version that changes whenever its contents change; it is
+used to build ETags so clients can revalidate with If-None-Match.
+"""
+import uuid
+from itertools import islice
+
+
+def feed_key(state: str, district: str, job_type: str) -> tuple:
+    """Normalized bucket key"""
+    return tuple((value or "").strip().lower() for value in (state, district, job_type))
+
+
+class JobFeed:
+    """Active jobs per (state, district, job_type) bucket"""
+
+    def __init__(self, fields):
+        self.fields = tuple(fields)
+        self._buckets = {}
+        self._keys = {}
+        self._versions = {}
+        self._clock = 0
+        # Distinguishes ETags issued by different processes/restarts
+        self.generation = uuid.uuid4().hex[:8]
+
+    def __len__(self):
+        return len(self._keys)
+
+    def __contains__(self, job_id):
+        return job_id in self._keys
+
+    def _touch(self, key):
+        self._clock += 1
+        self._versions[key] = self._clock
+
+    def add(self, job: dict):
+        """
+        Add or replace a job; new jobs go to the newest end of their bucket.
+        Re-adding an unchanged job keeps the bucket version (and so its ETag).
+        """
+        job_id = job["job_id"]
+        key = feed_key(job["state"], job["district"], job["job_type"])
+        entry = {field: job[field] for field in self.fields if field in job}
+        entry["translations"] = dict(job.get("translations") or {})
+        if self._keys.get(job_id) == key and self._buckets[key][job_id] == entry:
+            return
+        if self._keys.get(job_id) not in (None, key):
+            self.remove(job_id)
+        self._buckets.setdefault(key, {})[job_id] = entry
+        self._keys[job_id] = key
+        self._touch(key)
+
+    def remove(self, job_id: str) -> bool:
+        key = self._keys.pop(job_id, None)
+        if key is None:
+            return False
+        bucket = self._buckets[key]
+        del bucket[job_id]
+        if not bucket:
+            del self._buckets[key]
+        self._touch(key)
+        return True
+
+    def set_translations(self, job_id: str, translations: dict) -> bool:
+        """Merge {lang: {"title", "description"}} into a feed entry"""
+        key = self._keys.get(job_id)
+        if key is None:
+            return False
+        self._buckets[key][job_id]["translations"].update(translations)
+        self._touch(key)
+        return True
+
+    def page(self, state: str, district: str, job_type: str, limit: int) -> list:
+        """Newest jobs of one bucket (shared entries; copy before mutating)"""
+        bucket = self._buckets.get(feed_key(state, district, job_type), {})
+        return list(islice(reversed(bucket.values()), limit))
+
+    def version(self, state: str, district: str, job_type: str) -> str:
+        """Opaque tag that changes whenever the bucket changes"""
+        return f"{self.generation}-{self._versions.get(feed_key(state, district, job_type), 0)}"
+
+    def stats(self) -> dict:
+        sizes = [len(bucket) for bucket in self._buckets.values()]
+        return {
+            "jobs": len(self._keys),
+            "buckets": len(sizes),
+            "largest_bucket": max(sizes, default=0),
+        }
@@ -0,0 +1,211 @@
+"""
+Place-name gazetteer for local registration parsing: Indian states and union
+territories, and common districts, with names in English, local scripts and
+frequent romanizations.
+
+Each entry is (canonical name, *variants). Names are compiled into phrase
+tries (see normalize.PhraseTrie), so a lookup scans a transcript once per
+trie and prefers the longest name ("Jammu and Kashmir" over "Jammu").
+District names found in more than one state (Aurangabad, Bilaspur) resolve
+to the district but leave the state to be filled from elsewhere.
+"""
+from typing import Optional
+
+from normalize import PhraseTrie, normalize_text
+
+STATES = [
+    ("Andhra Pradesh", "andhra pradesh", "andhra", "आंध्र प्रदेश", "ఆంధ్ర ప్రదేశ్", "ఆంధ్రప్రదేశ్"),
+    ("Arunachal Pradesh", "arunachal pradesh", "arunachal", "अरुणाचल प्रदेश"),
+    ("Assam", "assam", "असम", "অসম", "আসাম"),
+    ("Bihar", "bihar", "बिहार", "বিহার"),
+    ("Chhattisgarh", "chhattisgarh", "chattisgarh", "छत्तीसगढ़"),
+    ("Goa", "goa", "गोवा"),
+    ("Gujarat", "gujarat", "gujrat", "गुजरात", "ગુજરાત"),
+    ("Haryana", "haryana", "हरियाणा"),
+    ("Himachal Pradesh", "himachal pradesh", "himachal", "हिमाचल प्रदेश", "हिमाचल"),
+    ("Jharkhand", "jharkhand", "झारखंड", "झारखण्ड", "ঝাড়খণ্ড"),
+    ("Karnataka", "karnataka", "कर्नाटक", "ಕರ್ನಾಟಕ"),
+    ("Kerala", "kerala", "केरल", "കേരളം"),
+    ("Madhya Pradesh", "madhya pradesh", "m p", "मध्य प्रदेश", "मध्यप्रदेश", "एमपी"),
+    ("Maharashtra", "maharashtra", "महाराष्ट्र"),
+    ("Manipur", "manipur", "मणिपुर"),
+    ("Meghalaya", "meghalaya", "मेघालय"),
+    ("Mizoram", "mizoram", "मिजोरम"),
+    ("Nagaland", "nagaland", "नागालैंड"),
+    ("Odisha", "odisha", "orissa", "ओडिशा", "उड़ीसा", "ଓଡ଼ିଶା"),
+    ("Punjab", "punjab", "पंजाब", "ਪੰਜਾਬ"),
+    ("Rajasthan", "rajasthan", "राजस्थान"),
+    ("Sikkim", "sikkim", "सिक्किम"),
+    ("Tamil Nadu", "tamil nadu", "tamilnadu", "तमिलनाडु", "தமிழ்நாடு", "தமிழ் நாடு"),
+    ("Telangana", "telangana", "तेलंगाना", "తెలంగాణ"),
+    ("Tripura", "tripura", "त्रिपुरा", "ত্রিপুরা"),
+    ("Uttar Pradesh", "uttar pradesh", "u p", "उत्तर प्रदेश", "उत्तरप्रदेश", "यूपी"),
+    ("Uttarakhand", "uttarakhand", "uttaranchal", "उत्तराखंड", "उत्तराखण्ड"),
+    ("West Bengal", "west bengal", "bengal", "paschim banga", "पश्चिम बंगाल", "बंगाल", "পশ্চিমবঙ্গ"),
+    ("Andaman and Nicobar Islands", "andaman and nicobar", "andaman", "अंडमान"),
+    ("Chandigarh", "chandigarh", "चंडीगढ़"),
+    ("Dadra and Nagar Haveli and Daman and Diu", "dadra and nagar haveli", "daman and diu", "daman"),
+    ("Delhi", "delhi", "new delhi", "दिल्ली", "নয়াদিল্লি"),
+    ("Jammu and Kashmir", "jammu and kashmir", "jammu kashmir", "j k", "जम्मू कश्मीर", "जम्मू और कश्मीर"),
+    ("Ladakh", "ladakh", "लद्दाख"),
+    ("Lakshadweep", "lakshadweep", "लक्षद्वीप"),
+    ("Puducherry", "puducherry", "pondicherry", "पुडुचेरी", "புதுச்சேரி"),
+]
+
+# state -> districts; names that are also everyday words or common first
+# names (Gaya, Mandi, Puri, Anand, Krishna, Nadia, Sagar) are left out
+DISTRICTS = {
+    "Uttar Pradesh": [
+        ("Agra", "agra", "आगरा"), ("Lucknow", "lucknow", "लखनऊ"), ("Kanpur", "kanpur", "कानपुर"),
+        ("Varanasi", "varanasi", "banaras", "benares", "वाराणसी", "बनारस"),
+        ("Meerut", "meerut", "मेरठ"), ("Prayagraj", "prayagraj", "allahabad", "प्रयागराज", "इलाहाबाद"),
+        ("Gorakhpur", "gorakhpur", "गोरखपुर"), ("Bareilly", "bareilly", "बरेली"),
+        ("Aligarh", "aligarh", "अलीगढ़"), ("Moradabad", "moradabad", "मुरादाबाद"),
+        ("Jhansi", "jhansi", "झांसी", "झाँसी"), ("Mathura", "mathura", "मथुरा"),
+        ("Ghaziabad", "ghaziabad", "गाजियाबाद", "ग़ाज़ियाबाद"), ("Azamgarh", "azamgarh", "आजमगढ़"),
+        ("Jaunpur", "jaunpur", "जौनपुर"), ("Ballia", "ballia", "बलिया"), ("Sitapur", "sitapur", "सीतापुर"),
+        ("Bahraich", "bahraich", "बहराइच"), ("Hamirpur", "hamirpur", "हमीरपुर"),
+    ],
+    "Bihar": [
+        ("Patna", "patna", "पटना"), ("Muzaffarpur", "muzaffarpur", "मुजफ्फरपुर", "मुज़फ़्फ़रपुर"),
+        ("Bhagalpur", "bhagalpur", "भागलपुर"), ("Darbhanga", "darbhanga", "दरभंगा"),
+        ("Purnia", "purnia", "पूर्णिया"), ("Begusarai", "begusarai", "बेगूसराय"),
+        ("Samastipur", "samastipur", "समस्तीपुर"), ("Siwan", "siwan", "सीवान", "सिवान"),
+        ("Saran", "saran", "chapra", "छपरा", "सारण"), ("Nalanda", "nalanda", "नालंदा"),
+        ("Madhubani", "madhubani", "मधुबनी"), ("Sitamarhi", "sitamarhi", "सीतामढ़ी"),
+        ("Aurangabad", "aurangabad", "औरंगाबाद"),
+    ],
+    "Rajasthan": [
+        ("Jaipur", "jaipur", "जयपुर"), ("Jodhpur", "jodhpur", "जोधपुर"), ("Udaipur", "udaipur", "उदयपुर"),
+        ("Kota", "kota", "कोटा"), ("Ajmer", "ajmer", "अजमेर"), ("Bikaner", "bikaner", "बीकानेर"),
+        ("Alwar", "alwar", "अलवर"), ("Bhilwara", "bhilwara", "भीलवाड़ा"), ("Sikar", "sikar", "सीकर"),
+        ("Barmer", "barmer", "बाड़मेर"),
+    ],
+    "Madhya Pradesh": [
+        ("Bhopal", "bhopal", "भोपाल"), ("Indore", "indore", "इंदौर"), ("Gwalior", "gwalior", "ग्वालियर"),
+        ("Jabalpur", "jabalpur", "जबलपुर"), ("Ujjain", "ujjain", "उज्जैन"), ("Rewa", "rewa", "रीवा"),
+        ("Satna", "satna", "सतना"), ("Chhindwara", "chhindwara", "छिंदवाड़ा"),
+    ],
+    "Maharashtra": [
+        ("Mumbai", "mumbai", "bombay", "मुंबई", "मुम्बई"), ("Pune", "pune", "poona", "पुणे"),
+        ("Nagpur", "nagpur", "नागपुर"), ("Nashik", "nashik", "nasik", "नाशिक", "नासिक"),
+        ("Aurangabad", "aurangabad", "औरंगाबाद"), ("Thane", "thane", "ठाणे"),
+        ("Solapur", "solapur", "सोलापूर", "सोलापुर"), ("Kolhapur", "kolhapur", "कोल्हापूर", "कोल्हापुर"),
+        ("Amravati", "amravati", "अमरावती"), ("Satara", "satara", "सातारा"), ("Latur", "latur", "लातूर"),
+        ("Jalgaon", "jalgaon", "जळगाव", "जलगांव"),
+    ],
+    "West Bengal": [
+        ("Kolkata", "kolkata", "calcutta", "কলকাতা", "कोलकाता"), ("Howrah", "howrah", "হাওড়া", "हावड़ा"),
+        ("Darjeeling", "darjeeling", "দার্জিলিং"), ("Murshidabad", "murshidabad", "মুর্শিদাবাদ"),
+        ("Purba Bardhaman", "bardhaman", "burdwan", "বর্ধমান"),
+        ("Malda", "malda", "মালদা", "মালদহ"), ("Hooghly", "hooghly", "hugli", "হুগলি"),
+        ("Birbhum", "birbhum", "বীরভূম"), ("Bankura", "bankura", "বাঁকুড়া"), ("Purulia", "purulia", "পুরুলিয়া"),
+    ],
+    "Gujarat": [
+        ("Ahmedabad", "ahmedabad", "અમદાવાદ", "अहमदाबाद"), ("Surat", "surat", "સુરત", "सूरत"),
+        ("Vadodara", "vadodara", "baroda", "વડોદરા"), ("Rajkot", "rajkot", "રાજકોટ"),
+        ("Bhavnagar", "bhavnagar", "ભાવનગર"), ("Jamnagar", "jamnagar", "જામનગર"),
+        ("Kutch", "kutch", "kachchh", "કચ્છ"), ("Mehsana", "mehsana", "મહેસાણા"),
+    ],
+    "Telangana": [
+        ("Hyderabad", "hyderabad", "హైదరాబాద్", "हैदराबाद"), ("Warangal", "warangal", "వరంగల్"),
+        ("Karimnagar", "karimnagar", "కరీంనగర్"), ("Nizamabad", "nizamabad", "నిజామాబాద్"),
+        ("Khammam", "khammam", "ఖమ్మం"), ("Nalgonda", "nalgonda", "నల్గొండ"),
+    ],
+    "Andhra Pradesh": [
+        ("Visakhapatnam", "visakhapatnam", "vizag", "విశాఖపట్నం"), ("Guntur", "guntur", "గుంటూరు"),
+        ("Nellore", "nellore", "నెల్లూరు"), ("Kurnool", "kurnool", "కర్నూలు"),
+        ("Anantapur", "anantapur", "అనంతపురం"), ("Chittoor", "chittoor", "చిత్తూరు"),
+        ("Kadapa", "kadapa", "cuddapah", "కడప"), ("Srikakulam", "srikakulam", "శ్రీకాకుళం"),
+    ],
+    "Tamil Nadu": [
+        ("Chennai", "chennai", "madras", "சென்னை"), ("Coimbatore", "coimbatore", "kovai", "கோயம்புத்தூர்", "கோவை"),
+        ("Madurai", "madurai", "மதுரை"), ("Tiruchirappalli", "tiruchirappalli", "trichy", "திருச்சி"),
+        ("Salem", "salem", "சேலம்"), ("Tirunelveli", "tirunelveli", "திருநெல்வேலி"),
+        ("Vellore", "vellore", "வேலூர்"), ("Erode", "erode", "ஈரோடு"), ("Thanjavur", "thanjavur", "தஞ்சாவூர்"),
+    ],
+    "Karnataka": [
+        ("Bengaluru", "bengaluru", "bangalore", "ಬೆಂಗಳೂರು"), ("Mysuru", "mysuru", "mysore", "ಮೈಸೂರು"),
+        ("Belagavi", "belagavi", "belgaum", "ಬೆಳಗಾವಿ"), ("Kalaburagi", "kalaburagi", "gulbarga", "ಕಲಬುರಗಿ"),
+        ("Dharwad", "dharwad", "ಧಾರವಾಡ"), ("Ballari", "ballari", "bellary", "ಬಳ್ಳಾರಿ"),
+        ("Tumakuru", "tumakuru", "tumkur", "ತುಮಕೂರು"),
+    ],
+    "Kerala": [
+        ("Thiruvananthapuram", "thiruvananthapuram", "trivandrum", "തിരുവനന്തപുരം"),
+        ("Ernakulam", "ernakulam", "kochi", "cochin", "എറണാകുളം"),
+        ("Kozhikode", "kozhikode", "calicut", "കോഴിക്കോട്"), ("Thrissur", "thrissur", "തൃശ്ശൂർ"),
+        ("Malappuram", "malappuram", "മലപ്പുറം"), ("Kollam", "kollam", "കൊല്ലം"),
+        ("Palakkad", "palakkad", "പാലക്കാട്"),
+    ],
+    "Punjab": [
+        ("Ludhiana", "ludhiana", "ਲੁਧਿਆਣਾ", "लुधियाना"), ("Amritsar", "amritsar", "ਅੰਮ੍ਰਿਤਸਰ", "अमृतसर"),
+        ("Jalandhar", "jalandhar", "ਜਲੰਧਰ", "जालंधर"), ("Patiala", "patiala", "ਪਟਿਆਲਾ", "पटियाला"),
+        ("Bathinda", "bathinda", "ਬਠਿੰਡਾ"),
+    ],
+    "Haryana": [
+        ("Gurugram", "gurugram", "gurgaon", "गुरुग्राम", "गुड़गांव"), ("Faridabad", "faridabad", "फरीदाबाद"),
+        ("Panipat", "panipat", "पानीपत"), ("Hisar", "hisar", "हिसार"), ("Rohtak", "rohtak", "रोहतक"),
+        ("Karnal", "karnal", "करनाल"), ("Ambala", "ambala", "अंबाला"),
+    ],
+    "Odisha": [
+        ("Khordha", "khordha", "bhubaneswar", "ଭୁବନେଶ୍ୱର"), ("Cuttack", "cuttack", "କଟକ"),
+        ("Ganjam", "ganjam", "ଗଞ୍ଜାମ"), ("Balasore", "balasore", "baleswar", "ବାଲେଶ୍ୱର"),
+        ("Sambalpur", "sambalpur", "ସମ୍ବଲପୁର"), ("Mayurbhanj", "mayurbhanj", "ମୟୂରଭଞ୍ଜ"),
+    ],
+    "Jharkhand": [
+        ("Ranchi", "ranchi", "रांची", "राँची"), ("Dhanbad", "dhanbad", "धनबाद"),
+        ("East Singhbhum", "east singhbhum", "jamshedpur", "जमशेदपुर"), ("Bokaro", "bokaro", "बोकारो"),
+        ("Hazaribagh", "hazaribagh", "हजारीबाग"), ("Deoghar", "deoghar", "देवघर"),
+    ],
+    "Chhattisgarh": [
+        ("Raipur", "raipur", "रायपुर"), ("Bilaspur", "bilaspur", "बिलासपुर"), ("Durg", "durg", "दुर्ग"),
+        ("Korba", "korba", "कोरबा"),
+    ],
+    "Himachal Pradesh": [
+        ("Shimla", "shimla", "शिमला"), ("Kangra", "kangra", "कांगड़ा"), ("Bilaspur", "bilaspur", "बिलासपुर"), ("Hamirpur", "hamirpur", "हमीरपुर"),
+    ],
+    "Assam": [
+        ("Kamrup Metropolitan", "guwahati", "গুৱাহাটী", "গুয়াহাটি"), ("Dibrugarh", "dibrugarh", "ডিব্ৰুগড়"),
+        ("Nagaon", "nagaon", "নগাঁও"), ("Jorhat", "jorhat", "যোৰহাট"), ("Cachar", "cachar", "silchar", "কাছাড়"),
+    ],
+    "Uttarakhand": [
+        ("Dehradun", "dehradun", "देहरादून"), ("Haridwar", "haridwar", "हरिद्वार"),
+        ("Nainital", "nainital", "नैनीताल"), ("Udham Singh Nagar", "udham singh nagar", "rudrapur"),
+    ],
+    "Jammu and Kashmir": [
+        ("Srinagar", "srinagar", "श्रीनगर"), ("Jammu", "jammu", "जम्मू"),
+    ],
+}
+
+
+class Gazetteer:
+    """Finds the longest state and district names mentioned in a text"""
+
+    def __init__(self, states=STATES, districts=DISTRICTS):
+        self.states = PhraseTrie({variant: name for name, *variants in states for variant in variants})
+        # variant -> (district, states it occurs in)
+        by_variant = {}
+        for state, entries in districts.items():
+            for district, *variants in entries:
+                for variant in variants:
+                    _, found_in = by_variant.setdefault(variant, (district, set()))
+                    found_in.add(state)
+        self.districts = PhraseTrie({variant: (district, frozenset(found_in))
+                                     for variant, (district, found_in) in by_variant.items()})
+
+    def find_state(self, text: str, normalized: bool = False) -> Optional[str]:
+        return self.states.find(text if normalized else normalize_text(text))
+
+    def find_district(self, text: str, normalized: bool = False) -> tuple:
+        """
+        (district, state) for the longest district name in text; state is
+        None when the name occurs in several states. (None, None) if absent.
+        """
+        found = self.districts.find(text if normalized else normalize_text(text))
+        if found is None:
+            return None, None
+        district, states = found
+        return district, next(iter(states)) if len(states) == 1 else None
+
+
+gazetteer = Gazetteer()
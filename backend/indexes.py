@@ -0,0 +1,77 @@
+"""
+Declared MongoDB indexes for the hot queries in server.py.
+
+apply_indexes() is called from startup and is idempotent: create_index is a
+no-op when an identical index already exists. Add an entry here whenever a
+new query pattern is introduced, and a matching case to tests/test_indexes.py.
+"""
+from pymongo import ASCENDING, DESCENDING
+
+# (collection, keys, options)
+INDEXES = [
+    # Auth: login/register by phone, token lookup by user_id
+    ("users", [("phone_number", ASCENDING)], {}),
+    ("users", [("user_id", ASCENDING)], {"unique": True}),
+
+    # Worker profile by user, match hydration by worker_id, index refresh watermark
+    ("workers", [("user_id", ASCENDING)], {}),
+    ("workers", [("worker_id", ASCENDING)], {"unique": True}),
+    ("workers", [("created_at", ASCENDING)], {}),
+
+    # Job hydration, active listing, employer dashboard
+    ("jobs", [("job_id", ASCENDING)], {"unique": True}),
+    ("jobs", [("status", ASCENDING), ("created_at", DESCENDING)], {}),
+    ("jobs", [("employer_id", ASCENDING), ("created_at", DESCENDING)], {}),
+    # Matching sweep streams active jobs in _id order and resumes from a checkpoint
+    ("jobs", [("status", ASCENDING), ("_id", ASCENDING)], {}),
+
+    # One match per (job, worker) pair; makes bulk match inserts idempotent
+    ("matches", [("job_id", ASCENDING), ("worker_id", ASCENDING)], {"unique": True}),
+    # Keyset-paged match listings for workers and employers
+    ("matches", [("worker_id", ASCENDING), ("status", ASCENDING),
+                 ("match_score", DESCENDING), ("match_id", ASCENDING)], {}),
+    ("matches", [("job_id", ASCENDING), ("match_score", DESCENDING), ("match_id", ASCENDING)], {}),
+
+    ("notifications", [("worker_id", ASCENDING), ("sent_at", DESCENDING)], {}),
+
+    ("chatbot_sessions", [("session_id", ASCENDING)], {"unique": True}),
+]
+
+
+# Persistent tiers of the transcription and registration-parse result caches
+RESULT_CACHE_COLLECTIONS = ("transcription_cache", "registration_parse_cache")
+
+
+def declared_indexes(session_ttl_seconds: int = 0, result_cache_ttl_seconds: int = 0) -> list:
+    """
+    INDEXES plus TTL indexes: idle chatbot sessions when session_ttl_seconds
+    > 0, and persisted transcription/parse results when
+    result_cache_ttl_seconds > 0
+    """
+    indexes = list(INDEXES)
+    if session_ttl_seconds > 0:
+        indexes.append(("chatbot_sessions", [("updated_at", ASCENDING)],
+                        {"expireAfterSeconds": session_ttl_seconds}))
+    if result_cache_ttl_seconds > 0:
+        for collection in RESULT_CACHE_COLLECTIONS:
+            indexes.append((collection, [("updated_at", ASCENDING)],
+                            {"expireAfterSeconds": result_cache_ttl_seconds}))
+    return indexes
+
+
+async def apply_indexes(db, indexes=INDEXES) -> dict:
+    """
+    Create every declared index on db (a Motor database). Failures (e.g. a
+    unique index over existing duplicates, or a TTL index whose
+    expireAfterSeconds changed; use collMod for that) are reported, not
+    raised, so the API still starts.
+    """
+    created, failed = [], []
+    for collection, keys, options in indexes:
+        try:
+            name = await db[collection].create_index(keys, **options)
+            created.append(f"{collection}.{name}")
+        except Exception as e:
+            failed.append(f"{collection}.{keys}")
+            print(f"Could not create index on {collection} {keys}: {e}")
+    return {"created": created, "failed": failed}
@@ -0,0 +1,132 @@
+"""
+Scoring candidate pairs and writing the new matches with their notifications.
+
+Each MatchPipeline owns its BulkMatchWriter. The incremental consumer and
+the full sweep run interleaved on one event loop; with a shared writer one
+caller's flush() would write (and count) the matches the other had
+buffered, so each path gets its own pipeline.
+"""
+import uuid
+from datetime import datetime
+
+from matching import MATCH_THRESHOLD, MatchCategories, MatchKeySet, candidate_pairs, score_pairs
+
+
+async def load_full_docs(collection, id_field: str, marker_field: str, docs: list, ids: set) -> dict:
+    """
+    Full documents for ids, keyed by id. Documents that already carry
+    marker_field are reused; projected documents and compact index records
+    are fetched with a single $in query.
+    """
+    found = {doc[id_field]: doc for doc in docs if doc[id_field] in ids and marker_field in doc}
+    missing = [entity_id for entity_id in ids if entity_id not in found]
+    if missing:
+        async for doc in collection.find({id_field: {"$in": missing}}):
+            found[doc[id_field]] = doc
+    return found
+
+
+class MatchPipeline:
+    """Scores candidate pairs and bulk-writes new matches through its own writer"""
+
+    def __init__(self, jobs_collection, workers_collection, matches_collection, writer, build_notification):
+        self.jobs_collection = jobs_collection
+        self.workers_collection = workers_collection
+        self.matches_collection = matches_collection
+        self.writer = writer
+        # build_notification(worker, job, score) -> notification document
+        self.build_notification = build_notification
+
+    async def match_new_entities(self, jobs: list, workers: list, worker_index, job_index) -> dict:
+        """Score new jobs against the worker index and new workers against the job index"""
+        totals = {"candidate_pairs": 0, "matches_checked": 0, "existing_matches": 0, "new_matches": 0}
+        results = []
+        if jobs:
+            worker_records, job_idx, worker_idx = candidate_pairs(jobs, worker_index)
+            results.append(await self.create_matches(jobs, worker_records, job_idx, worker_idx))
+        if workers:
+            job_records, worker_idx, job_idx = candidate_pairs(workers, job_index, "expected_daily_wage")
+            results.append(await self.create_matches(job_records, workers, job_idx, worker_idx))
+        for result in results:
+            for key in totals:
+                totals[key] += result[key]
+        return totals
+
+    async def create_matches(self, jobs: list, workers: list, job_idx, worker_idx) -> dict:
+        """
+        Score candidate (jobs[job_idx[i]], workers[worker_idx[i]]) pairs and bulk-write
+        the new matches with their notifications. jobs and workers may be full documents
+        or compact index records; records are hydrated from Mongo only for new matches.
+        """
+        categories = MatchCategories()
+        scores = score_pairs(
+            categories.encode_jobs(jobs),
+            categories.encode_workers(workers),
+            job_idx,
+            worker_idx
+        )
+        keep = scores >= MATCH_THRESHOLD
+        job_idx, worker_idx, scores = job_idx[keep], worker_idx[keep], scores[keep]
+        pairs = [(jobs[j]["job_id"], workers[w]["worker_id"])
+                 for j, w in zip(job_idx.tolist(), worker_idx.tolist())]
+
+        return dict(await self.write_matches(pairs, scores, jobs, workers), candidate_pairs=len(keep))
+
+    async def write_matches(self, pairs: list, scores, jobs: list, workers: list) -> dict:
+        """
+        Bulk-write matches for scored (job_id, worker_id) pairs that do not exist yet,
+        with their notifications. jobs and workers hold the documents or index
+        records the pairs came from.
+        """
+        # Prefetch existing matches for this batch in one query instead of a find_one per pair
+        existing = await self.load_existing_match_keys(
+            list({job_id for job_id, _ in pairs}),
+            list({worker_id for _, worker_id in pairs})
+        )
+        is_new = ~existing.contains_many(pairs)
+        scores = scores[is_new]
+        pairs = [pair for pair, new in zip(pairs, is_new.tolist()) if new]
+
+        # Full documents are only needed for new matches (notification text)
+        full_jobs = await load_full_docs(self.jobs_collection, "job_id", "title", jobs,
+                                         {job_id for job_id, _ in pairs})
+        full_workers = await load_full_docs(self.workers_collection, "worker_id", "name", workers,
+                                            {worker_id for _, worker_id in pairs})
+
+        match_count = 0
+
+        # Matches and notifications are buffered and written in bulk batches
+        for (job_id, worker_id), score in zip(pairs, scores.tolist()):
+            job = full_jobs.get(job_id)
+            worker = full_workers.get(worker_id)
+            if job is None or worker is None:
+                continue
+
+            match_doc = {
+                "match_id": str(uuid.uuid4()),
+                "job_id": job_id,
+                "worker_id": worker_id,
+                "match_score": score,
+                "status": "pending",
+                "created_at": datetime.utcnow()
+            }
+            inserted = await self.writer.add(match_doc, self.build_notification(worker, job, score))
+            match_count += len(inserted)
+
+        match_count += len(await self.writer.flush())
+
+        return {
+            "matches_checked": len(is_new),
+            "existing_matches": len(is_new) - len(pairs),
+            "new_matches": match_count
+        }
+
+    async def load_existing_match_keys(self, job_ids: list, worker_ids: list) -> MatchKeySet:
+        """Fetch the (job_id, worker_id) keys of existing matches for a batch in one projected query"""
+        if not job_ids or not worker_ids:
+            return MatchKeySet()
+        cursor = self.matches_collection.find(
+            {"job_id": {"$in": job_ids}, "worker_id": {"$in": worker_ids}},
+            {"_id": 0, "job_id": 1, "worker_id": 1}
+        )
+        return MatchKeySet([(match["job_id"], match["worker_id"]) async for match in cursor])
@@ -0,0 +1,616 @@
+"""
+Matching engine scoring for GraminRozgar.
+
+Scores job/worker pairs on location (40%), job type (30%) and wage (30%).
+Kept out of server.py so the scorer can be tested and benchmarked without
+a database or the LLM integrations.
+"""
+import sys
+import uuid
+from array import array
+from bisect import bisect_left, bisect_right
+from hashlib import blake2b
+from typing import Optional
+
+import numpy as np
+
+LOCATION_WEIGHT = 0.4
+JOB_TYPE_SCORE = 30.0
+MATCH_THRESHOLD = 40
+
+# (maximum wage difference, points), checked in order
+WAGE_BUCKETS = ((0, 30.0), (50, 25.0), (100, 20.0), (200, 10.0))
+
+# Upper bound on job x worker cells scored in one vectorized pass
+DEFAULT_BLOCK_CELLS = 1_000_000
+
+# Wages are stored in array('i') columns
+WAGE_COLUMN_MIN, WAGE_COLUMN_MAX = -2 ** 31, 2 ** 31 - 1
+
+
+def calculate_distance_score(location1: dict, location2: dict) -> float:
+    """
+    Simple location matching based on district and state.
+    Returns a score from 0-100 (100 = same district, 50 = same state, 0 = different state)
+    """
+    if location1["district"].lower() == location2["district"].lower():
+        return 100.0
+    elif location1["state"].lower() == location2["state"].lower():
+        return 50.0
+    else:
+        return 0.0
+
+
+def wage_score(wage_diff: int) -> float:
+    """Points for the absolute difference between offered and expected wage"""
+    for max_diff, points in WAGE_BUCKETS:
+        if wage_diff <= max_diff:
+            return points
+    return 0.0
+
+
+def score_pair(job: dict, worker: dict) -> float:
+    """Score a single job/worker pair (reference implementation)"""
+    score = 0.0
+
+    # 1. Location score (40% weight)
+    location_score = calculate_distance_score(
+        {"district": job["district"], "state": job["state"]},
+        {"district": worker["district"], "state": worker["state"]}
+    )
+    score += location_score * LOCATION_WEIGHT
+
+    # 2. Job type match (30% weight)
+    if job["job_type"] == worker["job_type"]:
+        score += JOB_TYPE_SCORE
+
+    # 3. Wage compatibility (30% weight)
+    score += wage_score(abs(job["daily_wage_offered"] - worker["expected_daily_wage"]))
+
+    return score
+
+
+# ============ COLUMNAR ENCODING ============
+
+class CategoryCodes:
+    """Interns string categories to small integer codes"""
+
+    def __init__(self):
+        self._codes = {}
+        self._values = []
+
+    def __len__(self):
+        return len(self._codes)
+
+    def code(self, value: str) -> int:
+        code = self._codes.get(value)
+        if code is None:
+            code = len(self._codes)
+            self._codes[value] = code
+            self._values.append(value)
+        return code
+
+    def lookup(self, value: str) -> int:
+        """Code of value without interning it; -1 when unseen"""
+        return self._codes.get(value, -1)
+
+    def value(self, code: int) -> str:
+        return self._values[code]
+
+    def encode(self, values) -> np.ndarray:
+        return np.fromiter((self.code(v) for v in values), dtype=np.int32)
+
+
+class MatchCategories:
+    """
+    Shared code tables for district, state and job type.
+    Districts and states are lower-cased to mirror calculate_distance_score;
+    job types are compared exactly.
+    """
+
+    def __init__(self):
+        self.districts = CategoryCodes()
+        self.states = CategoryCodes()
+        self.job_types = CategoryCodes()
+
+    def encode_jobs(self, jobs: list) -> "MatchColumns":
+        return self._encode(jobs, "job_id", "daily_wage_offered")
+
+    def encode_workers(self, workers: list) -> "MatchColumns":
+        return self._encode(workers, "worker_id", "expected_daily_wage")
+
+    def _encode(self, docs: list, id_field: str, wage_field: str) -> "MatchColumns":
+        return MatchColumns(
+            ids=[doc[id_field] for doc in docs],
+            district=self.districts.encode(doc["district"].lower() for doc in docs),
+            state=self.states.encode(doc["state"].lower() for doc in docs),
+            job_type=self.job_types.encode(doc["job_type"] for doc in docs),
+            wage=np.fromiter((doc[wage_field] for doc in docs), dtype=np.int64),
+        )
+
+
+class MatchColumns:
+    """Columnar view of jobs or workers holding only what the scorer needs"""
+
+    def __init__(self, ids: list, district: np.ndarray, state: np.ndarray,
+                 job_type: np.ndarray, wage: np.ndarray):
+        self.ids = ids
+        self.district = district
+        self.state = state
+        self.job_type = job_type
+        self.wage = wage
+
+    def __len__(self):
+        return len(self.ids)
+
+
+# ============ VECTORIZED SCORING ============
+
+def _score(job_district, worker_district, job_state, worker_state,
+           job_type, worker_type, job_wage, worker_wage) -> np.ndarray:
+    """Vectorized score_pair over broadcast-compatible column arrays"""
+    location = np.where(job_district == worker_district, 100.0,
+                        np.where(job_state == worker_state, 50.0, 0.0))
+    score = location * LOCATION_WEIGHT
+
+    score += np.where(job_type == worker_type, JOB_TYPE_SCORE, 0.0)
+
+    wage_diff = np.abs(job_wage - worker_wage)
+    score += np.select(
+        [wage_diff <= max_diff for max_diff, _ in WAGE_BUCKETS],
+        [points for _, points in WAGE_BUCKETS],
+        0.0,
+    )
+    return score
+
+
+def score_matrix(jobs: MatchColumns, workers: MatchColumns,
+                 job_slice: slice = slice(None)) -> np.ndarray:
+    """
+    Score every job in job_slice against every worker in one pass.
+    Returns a (jobs, workers) float64 matrix identical to score_pair.
+    """
+    return _score(
+        jobs.district[job_slice, None], workers.district[None, :],
+        jobs.state[job_slice, None], workers.state[None, :],
+        jobs.job_type[job_slice, None], workers.job_type[None, :],
+        jobs.wage[job_slice, None], workers.wage[None, :],
+    )
+
+
+def score_pairs(jobs: MatchColumns, workers: MatchColumns,
+                job_idx: np.ndarray, worker_idx: np.ndarray) -> np.ndarray:
+    """Score only the given (job_idx[i], worker_idx[i]) pairs, element-wise"""
+    return _score(
+        jobs.district[job_idx], workers.district[worker_idx],
+        jobs.state[job_idx], workers.state[worker_idx],
+        jobs.job_type[job_idx], workers.job_type[worker_idx],
+        jobs.wage[job_idx], workers.wage[worker_idx],
+    )
+
+
+def score_block(jobs: MatchColumns, workers: MatchColumns,
+                threshold: float = MATCH_THRESHOLD,
+                block_cells: int = DEFAULT_BLOCK_CELLS):
+    """
+    Find all job/worker pairs scoring at least threshold.
+    Jobs are processed in row blocks so at most block_cells scores are held
+    in memory at once. Returns (job_index, worker_index, score) arrays.
+    """
+    job_parts, worker_parts, score_parts = [], [], []
+    if len(jobs) and len(workers):
+        rows = max(1, block_cells // len(workers))
+        for start in range(0, len(jobs), rows):
+            scores = score_matrix(jobs, workers, slice(start, start + rows))
+            job_idx, worker_idx = np.nonzero(scores >= threshold)
+            job_parts.append(job_idx + start)
+            worker_parts.append(worker_idx)
+            score_parts.append(scores[job_idx, worker_idx])
+
+    if not job_parts:
+        return (np.empty(0, dtype=np.intp), np.empty(0, dtype=np.intp),
+                np.empty(0, dtype=np.float64))
+    return np.concatenate(job_parts), np.concatenate(worker_parts), np.concatenate(score_parts)
+
+
+def score_loop(jobs: list, workers: list, threshold: float = MATCH_THRESHOLD):
+    """Pure-Python job x worker loop, kept as the baseline for benchmarks and tests"""
+    results = []
+    for j, job in enumerate(jobs):
+        for w, worker in enumerate(workers):
+            score = score_pair(job, worker)
+            if score >= threshold:
+                results.append((j, w, score))
+    return results
+
+
+# ============ CANDIDATE BLOCKING ============
+
+class BlockingIndex:
+    """
+    In-memory candidate index over one side of the match (workers or jobs).
+
+    A pair can only reach MATCH_THRESHOLD (40) in one of these ways:
+      - same district (location alone gives 40)
+      - same state and same job type (20 + 30)
+      - same state and wage within 100 (20 + at least 20)
+      - same job type and wage within 200 (30 + at least 10)
+    so candidates() looks up exactly those blocks instead of every entry.
+    Districts are keyed on their own, like calculate_distance_score.
+
+    Entries are stored column-wise in slots rather than as dicts: interned
+    category codes and wages in array('i'), UUID ids as 16 bytes each, and
+    the blocks hold slot numbers. get()/records() rebuild small dicts on
+    demand (with district and state lower-cased).
+    """
+
+    def __init__(self, id_field: str, wage_field: str, extra_fields: tuple = ()):
+        self.id_field = id_field
+        self.wage_field = wage_field
+        self.extra_fields = extra_fields
+        self.categories = MatchCategories()
+        self._extra_codes = {field: CategoryCodes() for field in extra_fields}
+        self._ids = CompactIds()
+        self._district = array("i")
+        self._state = array("i")
+        self._job_type = array("i")
+        self._wage = array("i")
+        self._extras = {field: array("i") for field in extra_fields}
+        self._free = []
+        self._by_district = {}
+        self._by_state_type = {}
+        self._state_wages = {}
+        self._type_wages = {}
+
+    def __len__(self):
+        return len(self._ids)
+
+    def __contains__(self, entity_id: str):
+        return entity_id in self._ids
+
+    def get(self, entity_id: str) -> Optional[dict]:
+        slot = self._ids.slot(entity_id)
+        return None if slot is None else self.record(slot)
+
+    def records(self) -> list:
+        return [self.record(slot) for slot in self._ids.slots()]
+
+    def record(self, slot: int) -> dict:
+        """Compact entry at slot as a plain dict"""
+        record = {
+            self.id_field: self._ids.id(slot),
+            "district": self.categories.districts.value(self._district[slot]),
+            "state": self.categories.states.value(self._state[slot]),
+            "job_type": self.categories.job_types.value(self._job_type[slot]),
+            self.wage_field: self._wage[slot],
+        }
+        for field in self.extra_fields:
+            record[field] = self._extra_codes[field].value(self._extras[field][slot])
+        return record
+
+    def add(self, doc: dict):
+        """
+        Index a job or worker document; re-adding an indexed id is a no-op.
+        Raises ValueError, before changing anything, when district, state or
+        job_type is not a string or the wage does not fit the wage column.
+        """
+        entity_id = doc[self.id_field]
+        if entity_id in self._ids:
+            return
+        for field in ("district", "state", "job_type"):
+            if not isinstance(doc.get(field), str):
+                raise ValueError(f"{field} {doc.get(field)!r} of {entity_id} is not a string")
+        wage = int(doc[self.wage_field])
+        if not WAGE_COLUMN_MIN <= wage <= WAGE_COLUMN_MAX:
+            raise ValueError(f"{self.wage_field} {wage} of {entity_id} does not fit the wage column")
+        district = self.categories.districts.code(doc["district"].lower())
+        state = self.categories.states.code(doc["state"].lower())
+        job_type = self.categories.job_types.code(doc["job_type"])
+        extras = [(field, self._extra_codes[field].code(doc.get(field))) for field in self.extra_fields]
+
+        if self._free:
+            slot = self._free.pop()
+            self._district[slot], self._state[slot] = district, state
+            self._job_type[slot], self._wage[slot] = job_type, wage
+            for field, code in extras:
+                self._extras[field][slot] = code
+        else:
+            slot = len(self._wage)
+            self._district.append(district)
+            self._state.append(state)
+            self._job_type.append(job_type)
+            self._wage.append(wage)
+            for field, code in extras:
+                self._extras[field].append(code)
+        self._ids.set(slot, entity_id)
+
+        self._by_district.setdefault(district, set()).add(slot)
+        self._by_state_type.setdefault((state, job_type), set()).add(slot)
+        _insort_wage(self._state_wages.setdefault(state, (array("i"), array("i"))), wage, slot)
+        _insort_wage(self._type_wages.setdefault(job_type, (array("i"), array("i"))), wage, slot)
+
+    def remove(self, entity_id: str):
+        slot = self._ids.pop(entity_id)
+        if slot is None:
+            return
+        district, state = self._district[slot], self._state[slot]
+        job_type, wage = self._job_type[slot], self._wage[slot]
+        self._by_district[district].discard(slot)
+        self._by_state_type[(state, job_type)].discard(slot)
+        _remove_wage(self._state_wages[state], wage, slot)
+        _remove_wage(self._type_wages[job_type], wage, slot)
+        self._free.append(slot)
+
+    def candidate_slots(self, district: str, state: str, job_type: str, wage: int) -> set:
+        """Slots of indexed entries that can score at least MATCH_THRESHOLD against the probe"""
+        categories = self.categories
+        district = categories.districts.lookup(district.lower())
+        state = categories.states.lookup(state.lower())
+        job_type = categories.job_types.lookup(job_type)
+        found = set(self._by_district.get(district, ()))
+        found.update(self._by_state_type.get((state, job_type), ()))
+        found.update(_wage_range(self._state_wages.get(state), wage, 100))
+        found.update(_wage_range(self._type_wages.get(job_type), wage, 200))
+        return found
+
+    def candidates(self, district: str, state: str, job_type: str, wage: int) -> set:
+        """Ids of indexed entries that can score at least MATCH_THRESHOLD against the probe"""
+        return {self._ids.id(slot) for slot in self.candidate_slots(district, state, job_type, wage)}
+
+    def nbytes(self) -> int:
+        """Approximate bytes held by the compact columns and blocks"""
+        columns = [self._district, self._state, self._job_type, self._wage, *self._extras.values()]
+        size = sum(sys.getsizeof(column) for column in columns) + self._ids.nbytes()
+        for blocks in (self._by_district, self._by_state_type):
+            size += sys.getsizeof(blocks) + sum(sys.getsizeof(block) for block in blocks.values())
+        for blocks in (self._state_wages, self._type_wages):
+            size += sys.getsizeof(blocks) + sum(
+                sys.getsizeof(wages) + sys.getsizeof(slots) for wages, slots in blocks.values()
+            )
+        return size
+
+
+class CompactIds:
+    """
+    Slot <-> id mapping. Canonical UUID strings (all ids the API generates)
+    are kept as 16 raw bytes; any other id is kept as given.
+    """
+
+    def __init__(self):
+        self._packed = bytearray()
+        self._other = {}
+        self._slots = {}
+
+    def __len__(self):
+        return len(self._slots)
+
+    def __contains__(self, entity_id: str):
+        return _pack_id(entity_id) in self._slots
+
+    def slot(self, entity_id: str) -> Optional[int]:
+        return self._slots.get(_pack_id(entity_id))
+
+    def slots(self):
+        return sorted(self._slots.values())
+
+    def set(self, slot: int, entity_id: str):
+        key = _pack_id(entity_id)
+        end = (slot + 1) * 16
+        if len(self._packed) < end:
+            self._packed.extend(bytes(end - len(self._packed)))
+        if isinstance(key, bytes):
+            self._packed[slot * 16:end] = key
+        else:
+            self._other[slot] = key
+        self._slots[key] = slot
+
+    def pop(self, entity_id: str) -> Optional[int]:
+        slot = self._slots.pop(_pack_id(entity_id), None)
+        if slot is not None:
+            self._other.pop(slot, None)
+        return slot
+
+    def id(self, slot: int) -> str:
+        other = self._other.get(slot)
+        if other is not None:
+            return other
+        return str(uuid.UUID(bytes=bytes(self._packed[slot * 16:(slot + 1) * 16])))
+
+    def nbytes(self) -> int:
+        return (sys.getsizeof(self._packed) + sys.getsizeof(self._other) + sys.getsizeof(self._slots)
+                + sum(sys.getsizeof(key) for key in self._slots))
+
+
+def _pack_id(entity_id: str):
+    """16-byte form of a canonical UUID string, else the id unchanged"""
+    if len(entity_id) == 36:
+        try:
+            packed = uuid.UUID(entity_id)
+        except ValueError:
+            return entity_id
+        if str(packed) == entity_id:
+            return packed.bytes
+    return entity_id
+
+
+def _insort_wage(bucket: tuple, wage: int, slot: int):
+    wages, slots = bucket
+    pos = bisect_right(wages, wage)
+    wages.insert(pos, wage)
+    slots.insert(pos, slot)
+
+
+def _remove_wage(bucket: tuple, wage: int, slot: int):
+    wages, slots = bucket
+    lo, hi = bisect_left(wages, wage), bisect_right(wages, wage)
+    pos = slots.index(slot, lo, hi)
+    del wages[pos]
+    del slots[pos]
+
+
+def _wage_range(bucket: Optional[tuple], wage: int, max_diff: int):
+    if not bucket:
+        return ()
+    wages, slots = bucket
+    return slots[bisect_left(wages, wage - max_diff):bisect_right(wages, wage + max_diff)]
+
+
+def candidate_pairs(probes: list, index: BlockingIndex, wage_field: str = "daily_wage_offered"):
+    """
+    Blocked pair generation for probe documents (jobs by default) against an
+    index of the other side. Returns (records, probe_idx, record_idx) where
+    records are the matched index entries, ready for score_pairs.
+    """
+    records, record_pos = [], {}
+    probe_idx, record_idx = [], []
+    for p, probe in enumerate(probes):
+        found = index.candidate_slots(probe["district"], probe["state"], probe["job_type"],
+                                      probe[wage_field])
+        for slot in sorted(found):
+            r = record_pos.get(slot)
+            if r is None:
+                r = record_pos[slot] = len(records)
+                records.append(index.record(slot))
+            probe_idx.append(p)
+            record_idx.append(r)
+    return (records, np.asarray(probe_idx, dtype=np.intp),
+            np.asarray(record_idx, dtype=np.intp))
+
+
+# ============ EXISTING MATCH KEYS ============
+
+def match_key(job_id: str, worker_id: str) -> int:
+    """64-bit hash of a (job_id, worker_id) pair"""
+    digest = blake2b(f"{job_id}:{worker_id}".encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "little")
+
+
+class MatchKeySet:
+    """
+    Compact set of (job_id, worker_id) pairs stored as a sorted uint64 array
+    of hashed keys (8 bytes per pair). A hash collision can only hide a new
+    match until the next run; it can never create a duplicate.
+    """
+
+    def __init__(self, pairs=()):
+        self._keys = np.unique(np.fromiter(
+            (match_key(job_id, worker_id) for job_id, worker_id in pairs), dtype=np.uint64
+        ))
+
+    def __len__(self):
+        return len(self._keys)
+
+    def __contains__(self, pair) -> bool:
+        return bool(self.contains_many([pair])[0])
+
+    def contains_many(self, pairs) -> np.ndarray:
+        """Boolean membership array for a sequence of (job_id, worker_id) pairs"""
+        keys = np.fromiter((match_key(job_id, worker_id) for job_id, worker_id in pairs),
+                           dtype=np.uint64)
+        if not len(self._keys):
+            return np.zeros(len(keys), dtype=bool)
+        pos = np.searchsorted(self._keys, keys)
+        pos[pos == len(self._keys)] = 0
+        return self._keys[pos] == keys
+
+    def add_many(self, pairs):
+        keys = np.fromiter((match_key(job_id, worker_id) for job_id, worker_id in pairs),
+                           dtype=np.uint64)
+        self._keys = np.union1d(self._keys, keys)
+
+
+# ============ STATE SHARDING ============
+
+def shard_tasks(jobs: list, workers: list) -> list:
+    """
+    Split one sweep into independent (function, args) tasks for a process pool.
+
+    Every same-state pair lands in exactly one per-state shard. Cross-state
+    pairs score 0 on location, so they only match with the same job type and
+    a wage within 200 (one shard per job type), or when two states share a
+    district name, which calculate_distance_score treats as the same district
+    (one small shard). Results may overlap and are merged by merge_shard_results.
+    """
+    jobs_by_state, workers_by_state = _group(jobs, "state"), _group(workers, "state")
+    jobs_by_type, workers_by_type = _group(jobs, "job_type"), _group(workers, "job_type")
+
+    tasks = []
+    for state, state_jobs in jobs_by_state.items():
+        if state in workers_by_state:
+            tasks.append((score_state_shard, (state_jobs, workers_by_state[state])))
+    for job_type, type_jobs in jobs_by_type.items():
+        if job_type in workers_by_type:
+            tasks.append((score_cross_state_type_shard, (type_jobs, workers_by_type[job_type])))
+
+    district_states = {}
+    for doc in jobs + workers:
+        district_states.setdefault(doc["district"].lower(), set()).add(doc["state"].lower())
+    shared = {district for district, states in district_states.items() if len(states) > 1}
+    if shared:
+        shared_jobs = [job for job in jobs if job["district"].lower() in shared]
+        shared_workers = [worker for worker in workers if worker["district"].lower() in shared]
+        if shared_jobs and shared_workers:
+            tasks.append((score_cross_state_district_shard, (shared_jobs, shared_workers)))
+    return tasks
+
+
+def _group(docs: list, field: str) -> dict:
+    groups = {}
+    for doc in docs:
+        key = doc[field].lower() if field == "state" else doc[field]
+        groups.setdefault(key, []).append(doc)
+    return groups
+
+
+def _shard_result(jobs: MatchColumns, workers: MatchColumns, job_idx, worker_idx, scores):
+    return ([jobs.ids[j] for j in job_idx.tolist()],
+            [workers.ids[w] for w in worker_idx.tolist()],
+            scores.tolist())
+
+
+def score_state_shard(jobs: list, workers: list):
+    """All jobs x workers of one state, densely vectorized"""
+    categories = MatchCategories()
+    job_cols, worker_cols = categories.encode_jobs(jobs), categories.encode_workers(workers)
+    return _shard_result(job_cols, worker_cols, *score_block(job_cols, worker_cols))
+
+
+def score_cross_state_type_shard(jobs: list, workers: list):
+    """Cross-state pairs of one job type whose wages are within 200 of each other"""
+    categories = MatchCategories()
+    job_cols, worker_cols = categories.encode_jobs(jobs), categories.encode_workers(workers)
+
+    order = np.argsort(worker_cols.wage, kind="stable")
+    sorted_wages = worker_cols.wage[order]
+    lo = np.searchsorted(sorted_wages, job_cols.wage - WAGE_BUCKETS[-1][0], side="left")
+    hi = np.searchsorted(sorted_wages, job_cols.wage + WAGE_BUCKETS[-1][0], side="right")
+
+    counts = hi - lo
+    job_idx = np.repeat(np.arange(len(job_cols)), counts)
+    offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+    worker_idx = order[np.repeat(lo, counts) + offsets]
+
+    cross = job_cols.state[job_idx] != worker_cols.state[worker_idx]
+    job_idx, worker_idx = job_idx[cross], worker_idx[cross]
+    scores = score_pairs(job_cols, worker_cols, job_idx, worker_idx)
+    keep = scores >= MATCH_THRESHOLD
+    return _shard_result(job_cols, worker_cols, job_idx[keep], worker_idx[keep], scores[keep])
+
+
+def score_cross_state_district_shard(jobs: list, workers: list):
+    """Cross-state pairs whose district names coincide"""
+    categories = MatchCategories()
+    job_cols, worker_cols = categories.encode_jobs(jobs), categories.encode_workers(workers)
+    job_idx, worker_idx, scores = score_block(job_cols, worker_cols)
+    cross = job_cols.state[job_idx] != worker_cols.state[worker_idx]
+    return _shard_result(job_cols, worker_cols, job_idx[cross], worker_idx[cross], scores[cross])
+
+
+def merge_shard_results(results) -> tuple:
+    """Merge shard outputs into (pairs, scores), dropping pairs found by two shards"""
+    merged = {}
+    for job_ids, worker_ids, scores in results:
+        for pair, score in zip(zip(job_ids, worker_ids), scores):
+            merged[pair] = score
+    pairs = list(merged)
+    return pairs, np.fromiter(merged.values(), dtype=np.float64, count=len(pairs))
@@ -0,0 +1,274 @@
+"""
+Local normalizers for free-form registration answers: job type (trade)
+names in every supported script plus common romanizations, and numbers
+written with Indic digits.
+
+Synonyms are compiled once into a character trie. A lookup walks the trie
+from every token boundary and keeps the longest specific phrase; generic
+words such as "मिस्त्री" (mason on its own) only count when no specific
+trade is named, so "बिजली का मिस्त्री" is an electrician. Tokens with no exact hit are
+matched with a bounded edit distance over the same trie, which absorbs
+spelling and transliteration variants ("plumbar", "electrision").
+"""
+import re
+import unicodedata
+from typing import Optional
+
+# Canonical job types in chatbot menu order
+JOB_TYPES = ("Mason", "Labour", "Plumber", "Electrician", "Painter")
+
+JOB_TYPE_SYNONYMS = {
+    "Mason": [
+        "mason", "masonry", "raj mistri", "rajmistri", "raj mistry",
+        "raaj mistri", "rajmistry", "kadiya", "gavandi", "kothanar",
+        "राजमिस्त्री", "राज मिस्त्री", "मेसन", "राजगीर", "गवंडी",
+        "রাজমিস্ত্রি", "রাজমিস্ত্রী",
+        "తాపీ మేస్త్రీ", "తాపీ పని",
+        "கொத்தனார்", "மேசன்",
+        "કડિયા", "કડિયો",
+        "ಗಾರೆ ಕೆಲಸ",
+        "മേസൺ", "കല്പണിക്കാരൻ",
+        "ਰਾਜ ਮਿਸਤਰੀ",
+        "ରାଜମିସ୍ତ୍ରୀ",
+        "রাজমিস্ত্ৰী",
+        "راج مستری",
+    ],
+    "Labour": [
+        "labour", "labor", "labourer", "laborer", "majdoor", "mazdoor", "majdur", "mazdur",
+        "majoor", "mazoor", "helper", "coolie", "kuli", "shramik", "kamgar",
+        "मजदूर", "मज़दूर", "मजूर", "श्रमिक", "हेल्पर", "कुली", "कामगार",
+        "শ্রমিক", "মজুর", "মজদুর", "কুলি",
+        "కూలీ", "కూలి", "కార్మికుడు",
+        "கூலி", "தொழிலாளி",
+        "મજૂર", "મજુર", "શ્રમિક",
+        "ಕೂಲಿ", "ಕಾರ್ಮಿಕ",
+        "കൂലി", "തൊഴിലാളി",
+        "ਮਜ਼ਦੂਰ", "ਮਜਦੂਰ",
+        "ମଜୁରିଆ", "ଶ୍ରମିକ", "ମୂଲିଆ",
+        "বনুৱা", "শ্ৰমিক",
+        "مزدور",
+    ],
+    "Plumber": [
+        "plumber", "plumbing", "plumbar", "palambar", "plamber", "nalsaz", "pipe fitter", "nal",
+        "प्लंबर", "प्लम्बर", "नलसाज", "नल", "नल मिस्त्री",
+        "প্লাম্বার", "প্লাম্বিং",
+        "ప్లంబర్", "ప్లంబింగ్",
+        "பிளம்பர்",
+        "પ્લમ્બર", "પ્લંબર",
+        "ಪ್ಲಂಬರ್",
+        "പ്ലംബർ",
+        "ਪਲੰਬਰ",
+        "ପ୍ଲମ୍ବର",
+        "প্লাম্বাৰ",
+        "پلمبر",
+    ],
+    "Electrician": [
+        "electrician", "electric", "electrical", "electricion", "bijli", "bijli mistri", "bijli wala",
+        "wireman", "wiring", "lineman",
+        "बिजली", "बिजली मिस्त्री", "बिजली वाला", "इलेक्ट्रीशियन", "इलेक्ट्रिशियन", "वायरमैन", "वीजतंत्री",
+        "ইলেকট্রিশিয়ান", "ইলেকট্রিক মিস্ত্রি", "বিদ্যুৎ মিস্ত্রি",
+        "ఎలక్ట్రీషియన్", "ఎలక్ట్రిషియన్",
+        "எலக்ட்ரீஷியன்", "மின்சார பணியாளர்",
+        "ઇલેક્ટ્રિશિયન", "વીજળી",
+        "ಎಲೆಕ್ಟ್ರಿಷಿಯನ್",
+        "ഇലക്ട്രീഷ്യൻ",
+        "ਇਲੈਕਟ੍ਰੀਸ਼ੀਅਨ", "ਬਿਜਲੀ",
+        "ଇଲେକ୍ଟ୍ରିସିଆନ",
+        "ইলেকট্ৰিচিয়ান",
+        "الیکٹریشن", "بجلی",
+    ],
+    "Painter": [
+        "painter", "painting", "paint", "pentar", "penter", "rangai", "putai", "rangrez",
+        "पेंटर", "पेन्टर", "रंगाई", "पुताई", "रंगारी",
+        "পেইন্টার", "রংমিস্ত্রি", "রং মিস্ত্রি",
+        "పెయింటర్",
+        "பெயிண்டர்",
+        "પેઇન્ટર", "રંગારો",
+        "ಪೇಂಟರ್",
+        "പെയിന്റർ",
+        "ਪੇਂਟਰ",
+        "ପେଣ୍ଟର",
+        "পেইণ্টাৰ",
+        "پینٹر",
+    ],
+}
+
+# "Mistri" (skilled tradesman) on its own usually means a mason, but with a
+# trade word ("bijli ka mistri", "पेंटर मिस्त्री") it names that trade, so
+# these only count when no specific synonym is in the same answer
+GENERIC_JOB_TYPE_SYNONYMS = {
+    "Mason": [
+        "mistri", "mistry", "mistree", "मिस्त्री", "মিস্ত্রি", "মিস্ত্রী", "మేస్త్రీ", "ಮೇಸ್ತ್ರಿ", "ਮਿਸਤਰੀ",
+        "ମିସ୍ତ୍ରୀ", "مستری",
+    ],
+}
+
+# Indic (and Arabic-Indic) digit blocks -> ASCII, built once
+_DIGIT_ZEROS = (0x0660, 0x06F0, 0x0966, 0x09E6, 0x0A66, 0x0AE6, 0x0B66, 0x0BE6, 0x0C66, 0x0CE6, 0x0D66)
+DIGIT_TABLE = {zero + d: str(d) for zero in _DIGIT_ZEROS for d in range(10)}
+
+NUMBER_RE = re.compile(r'\d+(?:,\d+)*(?:\.\d+)?')
+PHONE_RE = re.compile(r'(?<!\d)(?:\+?91[\s-]?|0)?([6-9]\d{4}[\s-]?\d{5})(?!\d)')
+# \w misses Indic vowel signs and viramas, so keep the script blocks and ZWNJ/ZWJ explicitly;
+# the danda marks sentence ends inside the Devanagari block
+_TOKEN_SPLIT_RE = re.compile(r'(?:[^\w\u0600-\u06FF\u0900-\u0DFF\u200C\u200D]|[\u0964\u0965])+')
+
+
+def normalize_digits(text: str) -> str:
+    """Replace Indic digits with ASCII digits"""
+    return text.translate(DIGIT_TABLE)
+
+
+def normalize_whitespace(text: str) -> str:
+    """NFC with runs of whitespace collapsed and ends trimmed; case and punctuation kept"""
+    return " ".join(unicodedata.normalize("NFC", text).split())
+
+
+def normalize_text(text: str) -> str:
+    """NFC, lower-cased, ASCII digits, punctuation collapsed to single spaces"""
+    text = normalize_digits(unicodedata.normalize("NFC", text)).lower()
+    return " ".join(token for token in _TOKEN_SPLIT_RE.split(text) if token)
+
+
+def parse_number(text: str) -> Optional[int]:
+    """First number in text (Indic digits and 1,200-style separators allowed)"""
+    match = NUMBER_RE.search(normalize_digits(text))
+    if not match:
+        return None
+    return int(float(match.group().replace(",", "")))
+
+
+def parse_phone(text: str) -> Optional[str]:
+    """10-digit Indian mobile number in text, without +91/0 prefix"""
+    match = PHONE_RE.search(normalize_digits(text))
+    if not match:
+        return None
+    return re.sub(r'[\s-]', '', match.group(1))
+
+
+class _Node:
+    __slots__ = ("children", "value")
+
+    def __init__(self):
+        self.children = {}
+        self.value = None
+
+
+class PhraseTrie:
+    """Character trie over normalized phrases with longest-match and fuzzy lookup"""
+
+    def __init__(self, phrases: dict):
+        self.root = _Node()
+        for phrase, value in phrases.items():
+            node = self.root
+            for char in normalize_text(phrase):
+                node = node.children.setdefault(char, _Node())
+            node.value = value
+
+    def longest_match(self, text: str, start: int) -> tuple:
+        """(value, end) of the longest phrase at text[start:] ending on a token boundary"""
+        node, best = self.root, (None, start)
+        for i in range(start, len(text)):
+            node = node.children.get(text[i])
+            if node is None:
+                break
+            if node.value is not None and (i + 1 == len(text) or text[i + 1] == " "):
+                best = (node.value, i + 1)
+        return best
+
+    def find_all(self, text: str) -> list:
+        """(value, length) of the longest phrase at each token boundary of normalized text"""
+        found, start = [], 0
+        while start < len(text):
+            value, end = self.longest_match(text, start)
+            if value is not None:
+                found.append((value, end - start))
+            next_space = text.find(" ", start)
+            if next_space < 0:
+                break
+            start = next_space + 1
+        return found
+
+    def find(self, text: str):
+        """Value of the longest phrase starting at any token boundary of normalized text"""
+        best, best_len = None, 0
+        for value, length in self.find_all(text):
+            if length > best_len:
+                best, best_len = value, length
+        return best
+
+    def fuzzy(self, word: str, max_edits: int) -> Optional[tuple]:
+        """(value, distance) of the closest phrase within max_edits of word"""
+        best = None
+        first_row = list(range(len(word) + 1))
+        stack = [(child, char, first_row) for char, child in self.root.children.items()]
+        while stack:
+            node, char, previous = stack.pop()
+            row = [previous[0] + 1]
+            for i in range(1, len(word) + 1):
+                row.append(min(row[i - 1] + 1, previous[i] + 1,
+                               previous[i - 1] + (word[i - 1] != char)))
+            if node.value is not None and row[-1] <= max_edits:
+                if best is None or row[-1] < best[1]:
+                    best = (node.value, row[-1])
+            if min(row) <= max_edits:
+                stack.extend((child, next_char, row) for next_char, child in node.children.items())
+        return best
+
+
+def _max_edits(word: str) -> int:
+    if len(word) >= 8:
+        return 2
+    if len(word) >= 4:
+        return 1
+    return 0
+
+
+class JobTypeNormalizer:
+    """Maps a free-form answer to a canonical job type, or None"""
+
+    def __init__(self, synonyms: dict = JOB_TYPE_SYNONYMS, menu=JOB_TYPES,
+                 generic: dict = GENERIC_JOB_TYPE_SYNONYMS):
+        # phrase -> (job type, generic)
+        phrases = {phrase: (job_type, True) for job_type, words in generic.items() for phrase in words}
+        phrases.update({phrase: (job_type, False) for job_type, words in synonyms.items() for phrase in words})
+        self.trie = PhraseTrie(phrases)
+        self.menu = {str(i): job_type for i, job_type in enumerate(menu, start=1)}
+
+    def candidates(self, text: str) -> list:
+        """
+        Distinct job types named by whole synonyms in text, longest phrase
+        first. Generic words count only when no specific synonym is present.
+        """
+        found = self.trie.find_all(normalize_text(text))
+        specific = [(value, length) for value, length in found if not value[1]]
+        ranked = sorted(specific or found, key=lambda match: -match[1])
+        return list(dict.fromkeys(job_type for (job_type, _), _ in ranked))
+
+    def __call__(self, text: str, fuzzy: bool = True) -> Optional[str]:
+        """
+        With fuzzy=False only whole synonyms count; used on long transcripts
+        where an unrelated word one edit away from a trade name is likely.
+        """
+        text = normalize_text(text)
+        if not text:
+            return None
+        if text in self.menu:
+            return self.menu[text]
+        candidates = self.candidates(text)
+        if candidates or not fuzzy:
+            return candidates[0] if candidates else None
+
+        # Closest single-token spelling variant
+        fuzzy_best = None
+        for word in text.split(" "):
+            max_edits = _max_edits(word)
+            if not max_edits:
+                continue
+            found = self.trie.fuzzy(word, max_edits)
+            if found and (fuzzy_best is None or found[1] < fuzzy_best[1]):
+                fuzzy_best = found
+        return fuzzy_best[0][0] if fuzzy_best else None
+
+
+normalize_job_type = JobTypeNormalizer()
@@ -0,0 +1,52 @@
+"""
+Keyset (cursor) pagination over score-ordered match lists.
+
+Pages are ordered by score descending with the match id as a unique
+tie-breaker, so a cursor is just the (score, id) of the last row served and
+the next page starts strictly after it, with no skip() scan.
+"""
+from typing import Optional
+
+from fastapi import HTTPException
+
+
+def encode_cursor(score: float, row_id: str) -> str:
+    """Opaque cursor for the row after which the next page starts"""
+    return f"{float(score)!r}:{row_id}"
+
+
+def decode_cursor(cursor: str) -> tuple:
+    """(score, id) from a cursor; 400 on a malformed cursor"""
+    score, sep, row_id = cursor.partition(":")
+    try:
+        if not sep or not row_id:
+            raise ValueError(cursor)
+        return float(score), row_id
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def keyset_sort(score_field: str = "match_score", id_field: str = "match_id") -> list:
+    """Sort specification matching keyset_filter"""
+    return [(score_field, -1), (id_field, 1)]
+
+
+def keyset_filter(cursor: Optional[str], score_field: str = "match_score",
+                  id_field: str = "match_id") -> dict:
+    """Mongo filter selecting rows strictly after cursor in keyset_sort order"""
+    if not cursor:
+        return {}
+    score, row_id = decode_cursor(cursor)
+    return {"$or": [
+        {score_field: {"$lt": score}},
+        {score_field: score, id_field: {"$gt": row_id}},
+    ]}
+
+
+def next_cursor(rows: list, limit: int, score_field: str = "match_score",
+                id_field: str = "match_id") -> Optional[str]:
+    """Cursor for the following page, or None when rows was the last page"""
+    if len(rows) < limit or not rows:
+        return None
+    last = rows[-1]
+    return encode_cursor(last[score_field], last[id_field])
@@ -1,18 +1,44 @@
 import os
 import asyncio
+import json
+import re
+import socket
+import time
 from datetime import datetime, timedelta
 from typing import Optional, List
-from fastapi import FastAPI, HTTPException, Depends, status, BackgroundTasks, UploadFile, File
+from fastapi import FastAPI, HTTPException, Depends, status, BackgroundTasks, UploadFile, File, Query, Request, Response
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel, Field
 from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import UpdateOne
 from passlib.context import CryptContext
 from jose import JWTError, jwt
 from dotenv import load_dotenv
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 import uuid
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
 from emergentintegrations.llm.chat import LlmChat, UserMessage
+from audio import (
+    NamedUploadStream, UploadLimitMiddleware, audio_duration_seconds, stream_sha256, stream_size, upload_extension
+)
+from batching import Histogram, MicroBatcher
+from bulk_writer import BulkMatchWriter
+from caching import LRUCache, SingleFlight, TwoTierCache, content_key
+from chatbot import FIRST_STEP, SessionStore, advance, new_session
+from chatbot import MAX_WAGE as CHATBOT_MAX_WAGE
+from executors import BoundedExecutor, ExecutorOverloaded
+from extraction import (
+    REGISTRATION_FIELDS, ExtractionStats, extract_registration, parse_json_object, registration_prompt
+)
+from feed import JobFeed
+from sweep import SweepLease, run_chunked_sweep
+from indexes import apply_indexes, declared_indexes
+from match_pipeline import MatchPipeline
+from matching import BlockingIndex, candidate_pairs, merge_shard_results, shard_tasks
+from normalize import normalize_whitespace
+from pagination import keyset_filter, keyset_sort, next_cursor
 
 # Load environment variables
 load_dotenv()
@@ -23,58 +49,189 @@ JWT_SECRET = os.getenv("JWT_SECRET", "graminrozgar_secret_key_2025")
 EMERGENT_LLM_KEY = os.getenv("EMERGENT_LLM_KEY")
 JWT_ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_HOURS = 24
-
-# Translation cache to avoid repeated API calls
-translation_cache = {}
+MATCH_WRITE_BATCH_SIZE = int(os.getenv("MATCH_WRITE_BATCH_SIZE", "500"))
+MATCHING_SWEEP_MINUTES = int(os.getenv("MATCHING_SWEEP_MINUTES", "30"))
+MATCHING_CHUNK_SIZE = int(os.getenv("MATCHING_CHUNK_SIZE", "500"))
+MATCHING_PROCESSES = int(os.getenv("MATCHING_PROCESSES", "1"))
+# A sweep checkpoint left by a crashed process is taken over after this long
+MATCHING_SWEEP_LEASE_SECONDS = int(os.getenv("MATCHING_SWEEP_LEASE_SECONDS", "600"))
+
+# Whisper rejects uploads over 25 MB; voice registrations are much shorter
+MAX_AUDIO_BYTES = int(os.getenv("MAX_AUDIO_BYTES", str(10 * 1024 * 1024)))
+MAX_AUDIO_SECONDS = int(os.getenv("MAX_AUDIO_SECONDS", "120"))
+# Multipart boundaries and form fields around the audio file
+AUDIO_REQUEST_OVERHEAD_BYTES = 64 * 1024
+
+# Upper bound accepted for posted and expected daily wages
+MAX_DAILY_WAGE = int(os.getenv("MAX_DAILY_WAGE", str(CHATBOT_MAX_WAGE)))
+
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", "2"))
+PASSWORD_HASH_QUEUE = int(os.getenv("PASSWORD_HASH_QUEUE", "32"))
+
+# Chatbot sessions stay in memory between turns and are written to Mongo on
+# completion or after this many idle seconds (0 = write every turn)
+CHATBOT_SESSION_IDLE_SECONDS = int(os.getenv("CHATBOT_SESSION_IDLE_SECONDS", "60"))
+# Abandoned sessions expire this long after their last turn (0 = never)
+CHATBOT_SESSION_TTL_SECONDS = int(os.getenv("CHATBOT_SESSION_TTL_SECONDS", str(7 * 24 * 3600)))
+# Most recent messages kept per session
+CHATBOT_MAX_MESSAGES = int(os.getenv("CHATBOT_MAX_MESSAGES", "40"))
+
+USER_CACHE_TTL_SECONDS = float(os.getenv("USER_CACHE_TTL_SECONDS", "60"))
+USER_CACHE_MAX_ENTRIES = int(os.getenv("USER_CACHE_MAX_ENTRIES", "10000"))
+
+# Transcripts and parsed registrations are cached by content hash so client
+# retries of the same upload or transcript skip the model call
+AUDIO_RESULT_CACHE_MAX_ENTRIES = int(os.getenv("AUDIO_RESULT_CACHE_MAX_ENTRIES", "5000"))
+AUDIO_RESULT_CACHE_MAX_BYTES = int(os.getenv("AUDIO_RESULT_CACHE_MAX_BYTES", str(8 * 1024 * 1024)))
+# Also keep them in Mongo (shared across processes) for this long; 0 = memory only.
+# Off by default: parsed results hold names and phone numbers
+AUDIO_RESULT_CACHE_TTL_SECONDS = int(os.getenv("AUDIO_RESULT_CACHE_TTL_SECONDS", "0"))
+
+TRANSLATION_CACHE_MAX_ENTRIES = int(os.getenv("TRANSLATION_CACHE_MAX_ENTRIES", "20000"))
+TRANSLATION_CACHE_MAX_BYTES = int(os.getenv("TRANSLATION_CACHE_MAX_BYTES", str(32 * 1024 * 1024)))
+TRANSLATION_CONCURRENCY = int(os.getenv("TRANSLATION_CONCURRENCY", "8"))
+TRANSLATION_BATCH_SIZE = int(os.getenv("TRANSLATION_BATCH_SIZE", "16"))
+TRANSLATION_BATCH_WINDOW_MS = int(os.getenv("TRANSLATION_BATCH_WINDOW_MS", "20"))
+# Comma-separated languages every new job is translated into; when empty, jobs
+# are translated into the languages of the workers they are likely to match
+PRETRANSLATE_LANGUAGES = [lang.strip() for lang in os.getenv("PRETRANSLATE_LANGUAGES", "").split(",") if lang.strip()]
+
+# Bounds concurrent LLM translation calls across all requests
+translation_semaphore = asyncio.Semaphore(TRANSLATION_CONCURRENCY)
+
+# Coalesces concurrent translations of the same string into one LLM call
+translation_flights = SingleFlight()
 
 async def translate_text(text: str, target_language: str) -> str:
     """Translate text to target language using OpenAI"""
     if not text or target_language == "en":
         return text
     
-    # Check cache
-    cache_key = f"{text}_{target_language}"
-    if cache_key in translation_cache:
-        return translation_cache[cache_key]
+    # Check cache (in-process LRU, then the shared Mongo tier)
+    cache_key = content_key("translate", target_language, text)
+    cached = await translation_cache.get(cache_key)
+    if cached is not None:
+        return cached
     
+    return await translation_flights.do(
+        cache_key, lambda: _translate_uncached(text, target_language, cache_key)
+    )
+
+
+async def translate_many(texts, target_language: str) -> dict:
+    """Translate distinct texts concurrently; returns {text: translation}"""
+    distinct = list(dict.fromkeys(text for text in texts if text))
+    translated = await asyncio.gather(*(translate_text(text, target_language) for text in distinct))
+    return dict(zip(distinct, translated))
+
+
+# Language names for prompt
+TRANSLATION_LANGUAGE_NAMES = {
+    "hi": "Hindi",
+    "bn": "Bengali", 
+    "te": "Telugu",
+    "mr": "Marathi",
+    "ta": "Tamil",
+    "gu": "Gujarati",
+    "kn": "Kannada",
+    "ml": "Malayalam",
+    "pa": "Punjabi",
+    "or": "Odia",
+    "as": "Assamese",
+    "ur": "Urdu"
+}
+
+
+async def _translate_uncached(text: str, target_language: str, cache_key: str) -> str:
+    """Call the LLM for a translation that is not cached yet"""
     try:
-        # Language names for prompt
-        lang_names = {
-            "hi": "Hindi",
-            "bn": "Bengali", 
-            "te": "Telugu",
-            "mr": "Marathi",
-            "ta": "Tamil",
-            "gu": "Gujarati",
-            "kn": "Kannada",
-            "ml": "Malayalam",
-            "pa": "Punjabi",
-            "or": "Odia",
-            "as": "Assamese",
-            "ur": "Urdu"
-        }
-        
-        target_lang_name = lang_names.get(target_language, "Hindi")
-        
-        chat = LlmChat(
-            api_key=EMERGENT_LLM_KEY,
-            session_id=f"translate_{cache_key}",
-            system_message=f"You are a professional translator. Translate the given text to {target_lang_name}. Return ONLY the translated text, nothing else. Keep the meaning accurate and natural."
-        ).with_model("openai", "gpt-5.2")
-        
-        translated = await chat.send_message(UserMessage(text=text))
+        # Strings requested within the same short window share one LLM call
+        translated = await translation_batcher.submit(target_language, text)
         
         # Cache the result
-        translation_cache[cache_key] = translated
+        await translation_cache.set(cache_key, translated, language=target_language)
         return translated
         
     except Exception as e:
         print(f"Translation error: {e}")
         return text  # Return original on error
 
+
+async def _llm_translate_one(target_language: str, text: str) -> str:
+    """Translate a single string with one LLM call"""
+    target_lang_name = TRANSLATION_LANGUAGE_NAMES.get(target_language, "Hindi")
+    
+    chat = LlmChat(
+        api_key=EMERGENT_LLM_KEY,
+        session_id=f"translate_{uuid.uuid4()}",
+        system_message=f"You are a professional translator. Translate the given text to {target_lang_name}. Return ONLY the translated text, nothing else. Keep the meaning accurate and natural."
+    ).with_model("openai", "gpt-5.2")
+    
+    async with translation_semaphore:
+        return await chat.send_message(UserMessage(text=text))
+
+
+async def _llm_translate_batch(target_language: str, texts: list) -> list:
+    """
+    Translate several strings with one LLM call. Returns one translation per
+    text, or None where the reply was missing or malformed so the batcher can
+    retry that string on its own.
+    """
+    target_lang_name = TRANSLATION_LANGUAGE_NAMES.get(target_language, "Hindi")
+    
+    chat = LlmChat(
+        api_key=EMERGENT_LLM_KEY,
+        session_id=f"translate_batch_{uuid.uuid4()}",
+        system_message=f"You are a professional translator. You will receive a JSON array of strings. Translate each string to {target_lang_name}. Return ONLY a JSON array of the translated strings, in the same order and with the same number of items, nothing else. Keep the meaning accurate and natural."
+    ).with_model("openai", "gpt-5.2")
+    
+    async with translation_semaphore:
+        response = await chat.send_message(UserMessage(text=json.dumps(texts, ensure_ascii=False)))
+    
+    return parse_batch_translation(response, len(texts))
+
+
+def parse_batch_translation(response: str, count: int) -> list:
+    """Split a JSON-array reply into count translations (None for unusable items)"""
+    match = re.search(r'\[.*\]', response, re.DOTALL)
+    try:
+        items = json.loads(match.group()) if match else None
+    except ValueError:
+        items = None
+    if not isinstance(items, list):
+        return [None] * count
+    # A reply with a different item count cannot be aligned reliably
+    if len(items) != count:
+        return [None] * count
+    return [item if isinstance(item, str) and item.strip() else None for item in items]
+
+
+# Collects translation requests per language into multi-string LLM calls
+translation_batcher = MicroBatcher(
+    _llm_translate_batch,
+    _llm_translate_one,
+    max_items=TRANSLATION_BATCH_SIZE,
+    window_seconds=TRANSLATION_BATCH_WINDOW_MS / 1000
+)
+
 # Initialize FastAPI
 app = FastAPI(title="GraminRozgar API")
 
+
+def _count_rejected_upload():
+    transcribe_stats["rejected_size"] += 1
+
+
+# Oversized uploads are refused while streaming in, before Starlette spools them.
+# Added first so CORS (the last added, outermost) also wraps its 413
+app.add_middleware(
+    UploadLimitMiddleware,
+    paths=["/api/audio/transcribe"],
+    max_bytes=MAX_AUDIO_BYTES + AUDIO_REQUEST_OVERHEAD_BYTES,
+    detail=f"Audio larger than {MAX_AUDIO_BYTES} bytes",
+    on_reject=_count_rejected_upload,
+)
+
 # CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -82,11 +239,16 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "ETag"],
 )
 
 # Password hashing
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+# bcrypt runs on a small dedicated pool so a login burst cannot block the event
+# loop; calls beyond the pool plus PASSWORD_HASH_QUEUE waiting are rejected
+password_executor = BoundedExecutor(PASSWORD_HASH_WORKERS, PASSWORD_HASH_QUEUE, name="bcrypt")
+
 # Security
 security = HTTPBearer()
 
@@ -101,10 +263,105 @@ jobs_collection = db.jobs
 matches_collection = db.matches
 notifications_collection = db.notifications
 chatbot_sessions_collection = db.chatbot_sessions
+chatbot_session_archive_collection = db.chatbot_session_archive
+matching_checkpoints_collection = db.matching_checkpoints
+
+# One sweep at a time across processes; the checkpoint is leased to its owner
+sweep_lease = SweepLease(
+    matching_checkpoints_collection,
+    owner=f"{socket.gethostname()}:{os.getpid()}",
+    lease_seconds=MATCHING_SWEEP_LEASE_SECONDS
+)
+translation_cache_collection = db.translation_cache
+transcription_cache_collection = db.transcription_cache
+registration_parse_cache_collection = db.registration_parse_cache
+
+# Write-behind cache of chatbot sessions
+chatbot_sessions = SessionStore(
+    chatbot_sessions_collection,
+    idle_seconds=CHATBOT_SESSION_IDLE_SECONDS,
+    max_messages=CHATBOT_MAX_MESSAGES,
+    archive_collection=chatbot_session_archive_collection
+)
+
+# Translation cache: bounded in-process LRU backed by a shared Mongo collection,
+# so restarts and other uvicorn workers reuse translations instead of calling the LLM
+translation_cache = TwoTierCache(
+    LRUCache(max_entries=TRANSLATION_CACHE_MAX_ENTRIES, max_bytes=TRANSLATION_CACHE_MAX_BYTES),
+    translation_cache_collection
+)
+
+# Authenticated users by user_id. Users are never updated in place, so the
+# entries need no invalidation; they expire after USER_CACHE_TTL_SECONDS
+user_cache = LRUCache(max_entries=USER_CACHE_MAX_ENTRIES, ttl_seconds=USER_CACHE_TTL_SECONDS)
+
+# The password hash is never needed after login and is kept out of the cache
+USER_PROJECTION = {"_id": 0, "password": 0}
+
+# Only the fields the matching engine scores on
+JOB_MATCH_PROJECTION = {"_id": 1, "job_id": 1, "district": 1, "state": 1,
+                        "job_type": 1, "daily_wage_offered": 1}
+WORKER_MATCH_PROJECTION = {"_id": 0, "worker_id": 1, "district": 1, "state": 1,
+                           "job_type": 1, "expected_daily_wage": 1, "language": 1, "created_at": 1}
+
+# Job fields returned to workers alongside their matches
+JOB_VIEW_FIELDS = ("job_id", "employer_id", "title", "job_type", "description", "village",
+                   "district", "state", "daily_wage_offered", "contact_number",
+                   "required_skills", "status", "created_at")
+
+# Worker fields shown to employers on the job matches dashboard
+WORKER_VIEW_PROJECTION = {"_id": 0, "worker_id": 1, "name": 1, "phone_number": 1, "area": 1,
+                          "district": 1, "state": 1, "job_type": 1, "expected_daily_wage": 1,
+                          "skills": 1, "language": 1}
+
+# Largest page the match listing endpoints serve
+MATCH_PAGE_MAX = 200
+
+# Largest page the job feed serves
+FEED_PAGE_MAX = 100
 
 # Scheduler for matching engine
 scheduler = AsyncIOScheduler()
 
+# In-memory blocking indexes used by the matching engine for candidate generation
+worker_index = BlockingIndex("worker_id", "expected_daily_wage", extra_fields=("language",))
+job_index = BlockingIndex("job_id", "daily_wage_offered")
+worker_index_watermark = None
+
+# Active jobs per (state, district, job_type) for the worker "jobs near me" feed
+job_feed = JobFeed(JOB_VIEW_FIELDS)
+job_feed_watermark = None
+
+# Queue of newly inserted jobs/workers for the incremental matching consumer
+matching_queue = asyncio.Queue()
+matching_consumer_task = None
+
+# Process pool for the state-sharded sweep (MATCHING_PROCESSES > 1)
+matching_process_pool = None
+
+# Stats from the last full sweep and the incremental consumer
+matching_stats = {
+    "sweep": {},
+    "incremental": {"events": 0, "batches": 0, "new_matches": 0, "last_latency_seconds": None}
+}
+
+
+
+def new_match_pipeline() -> MatchPipeline:
+    """Match scoring and writing with its own buffered bulk writer"""
+    writer = BulkMatchWriter(
+        matches_collection, notifications_collection,
+        batch_size=MATCH_WRITE_BATCH_SIZE, jobs_collection=jobs_collection
+    )
+    # build_notification_doc is defined further down
+    return MatchPipeline(jobs_collection, workers_collection, matches_collection, writer,
+                         lambda worker, job, score: build_notification_doc(worker, job, score))
+
+
+# The sweep and the incremental consumer interleave, so each flushes only its own matches
+sweep_matches = new_match_pipeline()
+incremental_matches = new_match_pipeline()
+
 
 # ============ MODELS ============
 
@@ -138,7 +395,7 @@ class WorkerProfile(BaseModel):
     district: str
     state: str
     job_type: str
-    expected_daily_wage: int
+    expected_daily_wage: int = Field(ge=0, le=MAX_DAILY_WAGE)
     skills: List[str] = []
     language: str = "hi"
 
@@ -149,7 +406,7 @@ class JobCreate(BaseModel):
     village: str
     district: str
     state: str
-    daily_wage_offered: int
+    daily_wage_offered: int = Field(ge=0, le=MAX_DAILY_WAGE)
     contact_number: str
     required_skills: List[str] = []
 
@@ -165,11 +422,22 @@ class AudioTranscribe(BaseModel):
 
 # ============ HELPER FUNCTIONS ============
 
-def hash_password(password: str) -> str:
-    return pwd_context.hash(password)
+async def hash_password(password: str) -> str:
+    return await run_password_hashing(pwd_context.hash, password)
 
-def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
+async def verify_password(plain_password: str, hashed_password: str) -> bool:
+    return await run_password_hashing(pwd_context.verify, plain_password, hashed_password)
+
+async def run_password_hashing(fn, *args):
+    """Run bcrypt off the event loop; shed load with 503 when the pool is saturated"""
+    try:
+        return await password_executor.run(fn, *args)
+    except ExecutorOverloaded:
+        raise HTTPException(
+            status_code=503,
+            detail="Too many login requests, please retry shortly",
+            headers={"Retry-After": "1"}
+        )
 
 def create_access_token(data: dict) -> str:
     to_encode = data.copy()
@@ -185,30 +453,19 @@ async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(s
         if user_id is None:
             raise HTTPException(status_code=401, detail="Invalid authentication credentials")
         
-        user = await users_collection.find_one({"user_id": user_id})
+        # Short-TTL cache so hot endpoints skip the users lookup on every request
+        user = user_cache.get(user_id)
         if user is None:
-            raise HTTPException(status_code=401, detail="User not found")
+            user = await users_collection.find_one({"user_id": user_id}, USER_PROJECTION)
+            if user is None:
+                raise HTTPException(status_code=401, detail="User not found")
+            user_cache.set(user_id, user)
         
-        return user
+        return dict(user)
     except JWTError:
         raise HTTPException(status_code=401, detail="Invalid authentication credentials")
 
 
-# ============ DISTANCE CALCULATION ============
-
-def calculate_distance_score(location1: dict, location2: dict) -> float:
-    """
-    Simple location matching based on district and state.
-    Returns a score from 0-100 (100 = same district, 50 = same state, 0 = different state)
-    """
-    if location1["district"].lower() == location2["district"].lower():
-        return 100.0
-    elif location1["state"].lower() == location2["state"].lower():
-        return 50.0
-    else:
-        return 0.0
-
-
 # ============ AUTHENTICATION ROUTES ============
 
 @app.post("/api/auth/register")
@@ -220,7 +477,7 @@ async def register_user(user: UserRegister):
     
     # Create user
     user_id = str(uuid.uuid4())
-    hashed_password = hash_password(user.password)
+    hashed_password = await hash_password(user.password)
     
     user_doc = {
         "user_id": user_id,
@@ -248,7 +505,7 @@ async def login_user(user: UserLogin):
         raise HTTPException(status_code=401, detail="Invalid credentials")
     
     # Verify password
-    if not verify_password(user.password, user_doc["password"]):
+    if not await verify_password(user.password, user_doc["password"]):
         raise HTTPException(status_code=401, detail="Invalid credentials")
     
     # Create access token
@@ -262,6 +519,12 @@ async def login_user(user: UserLogin):
     }
 
 
+@app.get("/api/auth/hashing/stats")
+async def get_password_hashing_stats():
+    """Queue depth, wait/run latency and rejections of the bcrypt pool"""
+    return password_executor.stats()
+
+
 @app.get("/api/auth/me")
 async def get_me(current_user = Depends(get_current_user)):
     return {
@@ -301,6 +564,8 @@ async def create_worker_profile(profile: WorkerProfile, current_user = Depends(g
     }
     
     await workers_collection.insert_one(profile_doc)
+    index_document(worker_index, profile_doc)
+    enqueue_for_matching("worker", profile_doc)
     
     return {"message": "Profile created successfully", "worker_id": profile_doc["worker_id"]}
 
@@ -319,41 +584,88 @@ async def get_worker_profile(current_user = Depends(get_current_user)):
 
 
 @app.get("/api/workers/matches")
-async def get_worker_matches(current_user = Depends(get_current_user)):
-    """Get job matches for the logged-in worker with translated content"""
+async def get_worker_matches(
+    response: Response,
+    limit: int = Query(50, ge=1, le=MATCH_PAGE_MAX),
+    cursor: Optional[str] = None,
+    current_user = Depends(get_current_user)
+):
+    """
+    Get job matches for the logged-in worker with translated content.
+    Ordered by score; pass the X-Next-Cursor response header back as
+    cursor to fetch the following page.
+    """
     if current_user["role"] != UserRole.WORKER:
         raise HTTPException(status_code=403, detail="Only workers can access this")
     
     # Get worker profile
-    worker = await workers_collection.find_one({"user_id": current_user["user_id"]})
+    worker = await workers_collection.find_one(
+        {"user_id": current_user["user_id"]}, {"_id": 0, "worker_id": 1, "language": 1}
+    )
     if not worker:
         raise HTTPException(status_code=404, detail="Worker profile not found")
     
     # Get worker's language preference
     worker_lang = worker.get("language", "hi")
     
-    # Get matches
-    matches = await matches_collection.find(
-        {"worker_id": worker["worker_id"], "status": "pending"}
-    ).sort("match_score", -1).to_list(50)
+    # Get one page of matches
+    query = dict(keyset_filter(cursor), worker_id=worker["worker_id"], status="pending")
+    matches = await matches_collection.find(query, {"_id": 0}).sort(keyset_sort()).to_list(limit)
+    
+    # Populate job details with one $in query instead of a find_one per match
+    jobs = await load_docs_by_id(
+        jobs_collection, "job_id", [match["job_id"] for match in matches], job_view_projection(worker_lang)
+    )
+    pairs = [(match, jobs[match["job_id"]]) for match in matches if match["job_id"] in jobs]
+    
+    # Use translations stored at write time; translate the rest concurrently
+    translations = {}
+    if worker_lang != "en":
+        translations = await translate_many(
+            [job[field] for _, job in pairs if worker_lang not in job.get("translations", {})
+             for field in ("title", "description")],
+            worker_lang
+        )
     
-    # Populate job details with translation
     result = []
-    for match in matches:
-        job = await jobs_collection.find_one({"job_id": match["job_id"]})
-        if job:
-            # Translate job title and description if not in worker's language
-            if worker_lang != "en":
-                job["title"] = await translate_text(job["title"], worker_lang)
-                job["description"] = await translate_text(job["description"], worker_lang)
-            
-            job.pop("_id", None)
-            match.pop("_id", None)
-            result.append({"match": match, "job": job})
+    for match, job in pairs:
+        stored = job.pop("translations", {}).get(worker_lang)
+        if worker_lang != "en":
+            if stored:
+                job["title"] = stored["title"]
+                job["description"] = stored["description"]
+            else:
+                job["title"] = translations.get(job["title"], job["title"])
+                job["description"] = translations.get(job["description"], job["description"])
+        
+        result.append({"match": match, "job": job})
     
+    set_next_cursor(response, next_cursor(matches, limit))
     return result
 
 
+def job_view_projection(language: str) -> dict:
+    """Job fields shown to workers plus the stored translation for language only"""
+    projection = {field: 1 for field in JOB_VIEW_FIELDS}
+    projection["_id"] = 0
+    projection[f"translations.{language}"] = 1
+    return projection
+
+
+async def load_docs_by_id(collection, id_field: str, ids: list, projection: dict) -> dict:
+    """Documents for ids fetched with a single $in query, keyed by id"""
+    if not ids:
+        return {}
+    docs = collection.find({id_field: {"$in": list(set(ids))}}, projection)
+    return {doc[id_field]: doc async for doc in docs}
+
+
+def set_next_cursor(response: Response, cursor: Optional[str]):
+    """Expose the next-page cursor without changing the list response body"""
+    if cursor:
+        response.headers["X-Next-Cursor"] = cursor
+
+
 # ============ CHATBOT ROUTES ============
 
 @app.post("/api/chatbot/conversation")
@@ -361,146 +673,25 @@ async def chatbot_conversation(msg: ChatbotMessage):
     """Handle chatbot conversation for worker signup - Language Adaptive"""
     
     # Get or create session
-    session = await chatbot_sessions_collection.find_one({"session_id": msg.session_id})
+    session = await chatbot_sessions.get(msg.session_id)
     
     if not session:
         # New session - initialize with language-specific greeting
-        greetings = {
-            "hi": "नमस्ते! मैं आपका साथी हूं। आइए शुरू करते हैं। आपका नाम क्या है?",
-            "en": "Hello! I'm here to help you register. What is your name?",
-            "bn": "নমস্কার! আমি আপনার সাহায্যকারী। আপনার নাম কি?",
-            "te": "నమస్కారం! నేను మీకు సహాయం చేస్తాను। మీ పేరు ఏమిటి?",
-            "mr": "नमस्कार! मी तुम्हाला मदत करेन। तुमचे नाव काय आहे?",
-            "ta": "வணக்கம்! நான் உங்களுக்கு உதவுவேன். உங்கள் பெயர் என்ன?",
-            "gu": "નમસ્તે! હું તમારી મદદ કરીશ। તમારું નામ શું છે?",
-        }
-        
-        session = {
-            "session_id": msg.session_id,
-            "messages": [],
-            "data": {},
-            "current_step": "name",
-            "language": msg.language,
-            "created_at": datetime.utcnow()
-        }
-        await chatbot_sessions_collection.insert_one(session)
-        
-        greeting = greetings.get(msg.language, greetings["hi"])
-        session["messages"].append({"role": "assistant", "content": greeting})
-        await chatbot_sessions_collection.update_one(
-            {"session_id": msg.session_id},
-            {"$set": {"messages": session["messages"]}}
-        )
-        
-        return {"response": greeting, "session_id": msg.session_id}
-    
-    # Append user message
-    session["messages"].append({"role": "user", "content": msg.message})
-    
-    # Determine current step and next question
-    current_step = session.get("current_step", "name")
-    
-    # Language-specific questions
-    questions = {
-        "hi": {
-            "area": "बहुत अच्छा! आप कहाँ रहते हैं? (गाँव/शहर का नाम)",
-            "district": "धन्यवाद! आपका जिला कौन सा है?",
-            "state": "अच्छा! आपका राज्य कौन सा है?",
-            "job_type": "समझ गया! आप किस तरह का काम करते हैं?\n1. राजमिस्त्री (Mason)\n2. मजदूर (Labour)\n3. प्लंबर (Plumber)\n4. बिजली मिस्त्री (Electrician)\n5. पेंटर (Painter)",
-            "wage": "बढ़िया! आप रोज़ कितने पैसे की उम्मीद करते हैं? (₹)",
-            "phone": "लगभग हो गया! आपका मोबाइल नंबर क्या है?",
-            "complete": "बहुत बढ़िया! मैंने सारी जानकारी इकट्ठा कर ली है। अब 'Complete Registration' बटन पर क्लिक करें।"
-        },
-        "en": {
-            "area": "Great! Where do you live? (Village/Town name)",
-            "district": "Thank you! Which district are you in?",
-            "state": "Good! Which state?",
-            "job_type": "Understood! What type of work do you do?\n1. Mason\n2. Labour\n3. Plumber\n4. Electrician\n5. Painter",
-            "wage": "Excellent! What daily wage do you expect? (₹)",
-            "phone": "Almost done! What is your mobile number?",
-            "complete": "Perfect! I have collected all information. Now click the 'Complete Registration' button."
-        },
-        "bn": {
-            "area": "দুর্দান্ত! আপনি কোথায় থাকেন? (গ্রাম/শহর)",
-            "district": "ধন্যবাদ! আপনার জেলা কোনটি?",
-            "state": "ভাল! কোন রাজ্য?",
-            "job_type": "বুঝলাম! আপনি কী ধরনের কাজ করেন?\n1. রাজমিস্ত্রি\n2. শ্রমিক\n3. প্লাম্বার\n4. ইলেকট্রিশিয়ান\n5. পেইন্টার",
-            "wage": "চমৎকার! আপনি কত দৈনিক মজুরি আশা করেন? (₹)",
-            "phone": "প্রায় শেষ! আপনার মোবাইল নম্বর কত?",
-            "complete": "নিখুঁত! আমি সব তথ্য সংগ্রহ করেছি। এখন 'Complete Registration' বোতামে ক্লিক করুন।"
-        }
-    }
-    
-    lang_questions = questions.get(msg.language, questions["hi"])
+        session = new_session(msg.session_id, msg.language)
+        await chatbot_sessions.create(session)
+        return {"response": session["messages"][-1]["content"], "session_id": msg.session_id}
     
     # Store the user's response and determine next step
-    response_text = ""
-    next_step = current_step
-    
-    if current_step == "name":
-        session["data"]["name"] = msg.message
-        response_text = lang_questions["area"]
-        next_step = "area"
-    
-    elif current_step == "area":
-        session["data"]["area"] = msg.message
-        response_text = lang_questions["district"]
-        next_step = "district"
-    
-    elif current_step == "district":
-        session["data"]["district"] = msg.message
-        response_text = lang_questions["state"]
-        next_step = "state"
-    
-    elif current_step == "state":
-        session["data"]["state"] = msg.message
-        response_text = lang_questions["job_type"]
-        next_step = "job_type"
-    
-    elif current_step == "job_type":
-        # Map responses to job types
-        job_mapping = {
-            "1": "Mason", "mason": "Mason", "राजमिस्त्री": "Mason", "রাজমিস্ত্রি": "Mason",
-            "2": "Labour", "labour": "Labour", "मजदूर": "Labour", "শ্রমিক": "Labour",
-            "3": "Plumber", "plumber": "Plumber", "प्लंबर": "Plumber", "প্লাম্বার": "Plumber",
-            "4": "Electrician", "electrician": "Electrician", "बिजली": "Electrician", "ইলেকট্রিশিয়ান": "Electrician",
-            "5": "Painter", "painter": "Painter", "पेंटर": "Painter", "পেইন্টার": "Painter"
-        }
-        user_input = msg.message.lower().strip()
-        session["data"]["job_type"] = job_mapping.get(user_input, "Labour")
-        response_text = lang_questions["wage"]
-        next_step = "wage"
-    
-    elif current_step == "wage":
-        # Extract number from response
-        import re
-        numbers = re.findall(r'\d+', msg.message)
-        wage = int(numbers[0]) if numbers else 500
-        session["data"]["expected_daily_wage"] = wage
-        response_text = lang_questions["phone"]
-        next_step = "phone"
-    
-    elif current_step == "phone":
-        # Extract phone number
-        import re
-        numbers = re.findall(r'\d+', msg.message)
-        phone = ''.join(numbers) if numbers else msg.message
-        session["data"]["phone_number"] = phone
-        response_text = lang_questions["complete"]
-        next_step = "complete"
-    
-    # Append bot response
-    session["messages"].append({"role": "assistant", "content": response_text})
-    
-    # Update session in database
-    await chatbot_sessions_collection.update_one(
-        {"session_id": msg.session_id},
-        {"$set": {
-            "messages": session["messages"],
-            "data": session["data"],
-            "current_step": next_step,
-            "updated_at": datetime.utcnow()
-        }}
+    field, value, response_text, next_step = advance(
+        session.get("current_step", FIRST_STEP), msg.message, msg.language
+    )
+    if field is not None:
+        session["data"][field] = value
+    
+    await chatbot_sessions.record_turn(
+        session,
+        [{"role": "user", "content": msg.message}, {"role": "assistant", "content": response_text}],
+        current_step=next_step
     )
     
     return {"response": response_text, "session_id": msg.session_id, "step": next_step}
@@ -509,7 +700,7 @@ async def chatbot_conversation(msg: ChatbotMessage):
 @app.post("/api/chatbot/complete-registration")
 async def complete_chatbot_registration(session_id: str):
     """Complete worker registration from chatbot session"""
-    session = await chatbot_sessions_collection.find_one({"session_id": session_id})
+    session = await chatbot_sessions.get(session_id)
     if not session:
         raise HTTPException(status_code=404, detail="Session not found")
     
@@ -520,11 +711,15 @@ async def complete_chatbot_registration(session_id: str):
     for field in required_fields:
         if field not in data:
             raise HTTPException(status_code=400, detail=f"Missing field: {field}")
+    # Sessions saved before wages were bounded can hold any number
+    wage = data["expected_daily_wage"]
+    if not isinstance(wage, int) or not 0 <= wage <= MAX_DAILY_WAGE:
+        raise HTTPException(status_code=400, detail="Invalid field: expected_daily_wage")
     
     # Create user account
     user_id = str(uuid.uuid4())
     password = str(uuid.uuid4())[:8]  # Generate temporary password
-    hashed_password = hash_password(password)
+    hashed_password = await hash_password(password)
     
     user_doc = {
         "user_id": user_id,
@@ -554,6 +749,11 @@ async def complete_chatbot_registration(session_id: str):
         "created_at": datetime.utcnow()
     }
     await workers_collection.insert_one(profile_doc)
+    index_document(worker_index, profile_doc)
+    enqueue_for_matching("worker", profile_doc)
+    
+    # The conversation is done; keep only a compact summary of it
+    await chatbot_sessions.archive(session_id, user_id=user_id, worker_id=worker_id)
     
     # Create token
     token = create_access_token({"user_id": user_id, "role": UserRole.WORKER})
@@ -569,7 +769,7 @@ async def complete_chatbot_registration(session_id: str):
 # ============ JOB ROUTES ============
 
 @app.post("/api/jobs")
-async def create_job(job: JobCreate, current_user = Depends(get_current_user)):
+async def create_job(job: JobCreate, background_tasks: BackgroundTasks, current_user = Depends(get_current_user)):
     if current_user["role"] != UserRole.EMPLOYER:
         raise HTTPException(status_code=403, detail="Only employers can post jobs")
     
@@ -587,63 +787,156 @@ async def create_job(job: JobCreate, current_user = Depends(get_current_user)):
         "contact_number": job.contact_number,
         "required_skills": job.required_skills,
         "status": "active",
+        "match_count": 0,
         "created_at": datetime.utcnow()
     }
     
     await jobs_collection.insert_one(job_doc)
+    index_document(job_index, job_doc)
+    job_feed.add(job_doc)
+    enqueue_for_matching("job", job_doc)
+    background_tasks.add_task(pretranslate_job, job_doc)
     
     return {"message": "Job posted successfully", "job_id": job_id}
 
 
+async def pretranslate_job(job_doc: dict):
+    """
+    Translate a new job's title and description once, at write time, and store
+    them under job.translations.<lang> so the read path needs no LLM call.
+    """
+    languages = PRETRANSLATE_LANGUAGES
+    if not languages:
+        candidate_ids = worker_index.candidates(
+            job_doc["district"], job_doc["state"], job_doc["job_type"], job_doc["daily_wage_offered"]
+        )
+        languages = {worker_index.get(worker_id).get("language") or "hi" for worker_id in candidate_ids}
+    # Only languages the translator knows (English is the original); worker
+    # language strings are free-form and an unknown or dotted code would
+    # otherwise be translated into Hindi or break the translations.<lang> path
+    languages = sorted(set(languages) & TRANSLATION_LANGUAGE_NAMES.keys())
+    if not languages:
+        return
+    
+    title, description = job_doc["title"], job_doc["description"]
+    results = await asyncio.gather(*(translate_many([title, description], lang) for lang in languages))
+    
+    update = {}
+    for lang, translated in zip(languages, results):
+        entry = {"title": translated.get(title, title), "description": translated.get(description, description)}
+        # translate_text falls back to the original on errors; leave those for the read path
+        if entry != {"title": title, "description": description}:
+            update[f"translations.{lang}"] = entry
+    
+    if update:
+        await jobs_collection.update_one({"job_id": job_doc["job_id"]}, {"$set": update})
+        job_feed.set_translations(
+            job_doc["job_id"], {key.split(".", 1)[1]: entry for key, entry in update.items()}
+        )
+
+
 @app.get("/api/jobs")
 async def get_all_jobs():
-    jobs = await jobs_collection.find({"status": "active"}).sort("created_at", -1).to_list(100)
+    jobs = await jobs_collection.find({"status": "active"}, {"translations": 0}).sort("created_at", -1).to_list(100)
     for job in jobs:
         job.pop("_id", None)
     return jobs
 
 
+@app.get("/api/workers/feed")
+async def get_worker_feed(
+    request: Request,
+    response: Response,
+    limit: int = Query(20, ge=1, le=FEED_PAGE_MAX),
+    current_user = Depends(get_current_user)
+):
+    """
+    Newest active jobs in the worker's own state, district and trade, served
+    from memory. Send the returned ETag as If-None-Match to get a bodyless
+    304 when nothing changed.
+    """
+    if current_user["role"] != UserRole.WORKER:
+        raise HTTPException(status_code=403, detail="Only workers can access this")
+    
+    worker = await workers_collection.find_one(
+        {"user_id": current_user["user_id"]},
+        {"_id": 0, "state": 1, "district": 1, "job_type": 1, "language": 1}
+    )
+    if not worker:
+        raise HTTPException(status_code=404, detail="Worker profile not found")
+    
+    worker_lang = worker.get("language", "hi")
+    location = (worker["state"], worker["district"], worker["job_type"])
+    etag = f'W/"{job_feed.version(*location)}-{worker_lang}-{limit}"'
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if etag in (tag.strip() for tag in request.headers.get("if-none-match", "").split(",")):
+        return Response(status_code=304, headers=headers)
+    
+    result = []
+    for entry in job_feed.page(*location, limit):
+        job = dict(entry)
+        # Only translations stored at write time; the feed never waits on the LLM
+        stored = job.pop("translations").get(worker_lang)
+        if stored:
+            job["title"] = stored["title"]
+            job["description"] = stored["description"]
+        result.append(job)
+    
+    response.headers.update(headers)
+    return result
+
+
 @app.get("/api/jobs/my-jobs")
 async def get_my_jobs(current_user = Depends(get_current_user)):
     if current_user["role"] != UserRole.EMPLOYER:
         raise HTTPException(status_code=403, detail="Only employers can access this")
     
-    jobs = await jobs_collection.find({"employer_id": current_user["user_id"]}).sort("created_at", -1).to_list(100)
-    
-    # Get match count for each job
-    result = []
+    # match_count is kept current by the match writer, so this is the only query
+    jobs = await jobs_collection.find(
+        {"employer_id": current_user["user_id"]}, {"_id": 0, "translations": 0}
+    ).sort("created_at", -1).to_list(100)
     for job in jobs:
-        job.pop("_id", None)
-        match_count = await matches_collection.count_documents({"job_id": job["job_id"]})
-        job["match_count"] = match_count
-        result.append(job)
+        job.setdefault("match_count", 0)
     
-    return result
+    return jobs
 
 
 @app.get("/api/jobs/{job_id}/matches")
-async def get_job_matches(job_id: str, current_user = Depends(get_current_user)):
-    """Get worker matches for a specific job"""
+async def get_job_matches(
+    job_id: str,
+    response: Response,
+    limit: int = Query(100, ge=1, le=MATCH_PAGE_MAX),
+    cursor: Optional[str] = None,
+    min_score: Optional[float] = Query(None, ge=0, le=100),
+    current_user = Depends(get_current_user)
+):
+    """
+    Get worker matches for a specific job, best first. Optionally only
+    matches scoring at least min_score; pass the X-Next-Cursor response
+    header back as cursor to fetch the following page.
+    """
     if current_user["role"] != UserRole.EMPLOYER:
         raise HTTPException(status_code=403, detail="Only employers can access this")
     
     # Verify job belongs to employer
-    job = await jobs_collection.find_one({"job_id": job_id, "employer_id": current_user["user_id"]})
+    job = await jobs_collection.find_one({"job_id": job_id, "employer_id": current_user["user_id"]}, {"_id": 1})
     if not job:
         raise HTTPException(status_code=404, detail="Job not found")
     
-    # Get matches
-    matches = await matches_collection.find({"job_id": job_id}).sort("match_score", -1).to_list(100)
+    # Get one page of matches
+    query = dict(keyset_filter(cursor), job_id=job_id)
+    if min_score is not None:
+        query["match_score"] = {"$gte": min_score}
+    matches = await matches_collection.find(query, {"_id": 0}).sort(keyset_sort()).to_list(limit)
     
-    # Populate worker details
-    result = []
-    for match in matches:
-        worker = await workers_collection.find_one({"worker_id": match["worker_id"]})
-        if worker:
-            worker.pop("_id", None)
-            match.pop("_id", None)
-            result.append({"match": match, "worker": worker})
+    # Populate worker details with one $in query instead of a find_one per match
+    workers = await load_docs_by_id(
+        workers_collection, "worker_id", [match["worker_id"] for match in matches], WORKER_VIEW_PROJECTION
+    )
+    result = [{"match": match, "worker": workers[match["worker_id"]]}
+              for match in matches if match["worker_id"] in workers]
     
+    set_next_cursor(response, next_cursor(matches, limit))
     return result
 
 
@@ -651,75 +944,242 @@ async def get_job_matches(job_id: str, current_user = Depends(get_current_user))
 
 async def run_matching_engine():
     """
-    Cron job that runs every 5 minutes to match workers with jobs
+    Periodic full sweep that reconciles all active jobs with all workers.
+    New jobs and workers are matched straight away by the incremental
+    consumer; this catches anything it missed (e.g. other uvicorn workers).
+    
+    Active jobs are streamed in _id order in chunks of MATCHING_CHUNK_SIZE with
+    only the fields the scorer needs, and a checkpoint is saved after every
+    chunk so a sweep interrupted by a restart resumes where it stopped. The
+    checkpoint is leased to one process, so other processes skip their sweep
+    while it runs (see sweep.py).
     """
     print(f"[{datetime.utcnow()}] Running matching engine...")
     
-    # Get all active jobs
-    jobs = await jobs_collection.find({"status": "active"}).to_list(1000)
+    # Pick up workers and jobs created by other processes since the last run
+    await refresh_worker_index()
+    await refresh_job_feed()
+    
+    if matching_process_pool is not None:
+        await run_sharded_sweep()
+        return
+    
+    # Snapshot before streaming: jobs created while the cursor runs must not be pruned
+    indexed_ids = {record["job_id"] for record in job_index.records()}
+    result = await run_chunked_sweep(
+        jobs_collection,
+        sweep_lease,
+        JOB_MATCH_PROJECTION,
+        MATCHING_CHUNK_SIZE,
+        match_sweep_chunk,
+        # Closed jobs can only be detected by a sweep that saw every active job
+        prune=lambda seen_ids: prune_job_index(indexed_ids - seen_ids)
+    )
+    if result is None:
+        print(f"[{datetime.utcnow()}] Another process holds the sweep lease; skipping this sweep")
+        return
+    if result["resumed"]:
+        print(f"[{datetime.utcnow()}] Resumed an interrupted sweep")
+    
+    totals = dict({"candidate_pairs": 0, "matches_checked": 0, "existing_matches": 0, "new_matches": 0}, **result)
+    job_count, chunk_count = result["jobs"], result["chunks"]
+    
+    # The old engine awaited one find_one per job x worker pair
+    queries_saved = job_count * len(worker_index) - chunk_count
+    matching_stats["sweep"] = dict(
+        totals,
+        last_run_at=datetime.utcnow(),
+        mode="chunked",
+        workers=len(worker_index),
+        queries_saved=max(queries_saved, 0)
+    )
     
-    # Get all workers
-    workers = await workers_collection.find({}).to_list(1000)
+    print(f"[{datetime.utcnow()}] Matching complete. Scored {totals['candidate_pairs']} candidate pairs "
+          f"for {job_count} jobs in {chunk_count} chunks, created {totals['new_matches']} new matches.")
+
+
+async def run_sharded_sweep():
+    """
+    Full sweep partitioned by state and fanned out over the process pool.
+    Each state is scored in its own process, plus small cross-state shards for
+    same-type/similar-wage pairs; results are merged and written in one pass.
+    """
+    # Snapshot before streaming: jobs created while the cursor runs must not be pruned
+    indexed_ids = {record["job_id"] for record in job_index.records()}
+    jobs = [job async for job in jobs_collection.find({"status": "active"}, JOB_MATCH_PROJECTION)]
+    jobs = [job for job in jobs if index_document(job_index, job)]
+    prune_job_index(indexed_ids - {job["job_id"] for job in jobs})
+    workers = worker_index.records()
+    
+    start = time.perf_counter()
+    loop = asyncio.get_running_loop()
+    tasks = shard_tasks(jobs, workers)
+    results = await asyncio.gather(*(
+        loop.run_in_executor(matching_process_pool, fn, *args) for fn, args in tasks
+    ))
+    pairs, scores = merge_shard_results(results)
+    score_seconds = time.perf_counter() - start
+    
+    # Write in slices so the existing-match $in query stays bounded
+    result = {"matches_checked": 0, "existing_matches": 0, "new_matches": 0}
+    step = MATCHING_CHUNK_SIZE * 20
+    for start in range(0, len(pairs), step):
+        part = await sweep_matches.write_matches(pairs[start:start + step], scores[start:start + step], jobs, workers)
+        for key in result:
+            result[key] += part[key]
+    
+    matching_stats["sweep"] = dict(
+        result,
+        last_run_at=datetime.utcnow(),
+        mode="sharded",
+        processes=MATCHING_PROCESSES,
+        shards=len(tasks),
+        score_seconds=round(score_seconds, 6),
+        jobs=len(jobs),
+        workers=len(workers)
+    )
     
-    match_count = 0
+    print(f"[{datetime.utcnow()}] Sharded matching complete. {len(tasks)} shards scored in {score_seconds:.2f}s, "
+          f"created {result['new_matches']} new matches.")
+
+
+async def match_sweep_chunk(chunk: list) -> dict:
+    """Index a chunk of streamed active jobs and match them against the worker index"""
+    jobs = [job for job in chunk if index_document(job_index, job)]
+    if not jobs:
+        return {}
+    # Only score pairs that can reach the threshold
+    worker_records, job_idx, worker_idx = candidate_pairs(jobs, worker_index)
+    return await sweep_matches.create_matches(jobs, worker_records, job_idx, worker_idx)
+
+
+@app.get("/api/matching/stats")
+async def get_matching_stats():
+    """Matching engine stats: last sweep, incremental consumer and the bulk writer of each"""
+    return dict(
+        matching_stats,
+        queue_depth=matching_queue.qsize(),
+        writer={"sweep": sweep_matches.writer.stats(), "incremental": incremental_matches.writer.stats()}
+    )
+
+
+# ============ INCREMENTAL MATCHING ============
+
+def enqueue_for_matching(kind: str, doc: dict):
+    """Queue a newly inserted job or worker for immediate matching"""
+    matching_queue.put_nowait((kind, doc, time.perf_counter()))
+
+
+async def matching_consumer():
+    """Background task that matches new jobs and workers as they arrive"""
+    while True:
+        batch = [await matching_queue.get()]
+        # Drain whatever else is already waiting so bursts are scored together
+        while not matching_queue.empty():
+            batch.append(matching_queue.get_nowait())
+        
+        try:
+            await match_new_entities(batch)
+        except Exception as e:
+            print(f"Incremental matching error: {e}")
+
+
+async def match_new_entities(batch: list):
+    """Score only the new entities in batch against the opposite side's index"""
+    jobs = [doc for kind, doc, _ in batch if kind == "job"]
+    workers = [doc for kind, doc, _ in batch if kind == "worker"]
     
-    for job in jobs:
-        for worker in workers:
-            # Check if match already exists
-            existing_match = await matches_collection.find_one({
-                "job_id": job["job_id"],
-                "worker_id": worker["worker_id"]
-            })
-            
-            if existing_match:
-                continue
-            
-            # Calculate match score
-            score = 0.0
-            
-            # 1. Location score (40% weight)
-            location_score = calculate_distance_score(
-                {"district": job["district"], "state": job["state"]},
-                {"district": worker["district"], "state": worker["state"]}
-            )
-            score += location_score * 0.4
-            
-            # 2. Job type match (30% weight)
-            if job["job_type"] == worker["job_type"]:
-                score += 30.0
-            
-            # 3. Wage compatibility (30% weight)
-            wage_diff = abs(job["daily_wage_offered"] - worker["expected_daily_wage"])
-            if wage_diff == 0:
-                score += 30.0
-            elif wage_diff <= 50:
-                score += 25.0
-            elif wage_diff <= 100:
-                score += 20.0
-            elif wage_diff <= 200:
-                score += 10.0
-            
-            # Only create match if score is above threshold
-            if score >= 40:
-                match_doc = {
-                    "match_id": str(uuid.uuid4()),
-                    "job_id": job["job_id"],
-                    "worker_id": worker["worker_id"],
-                    "match_score": score,
-                    "status": "pending",
-                    "created_at": datetime.utcnow()
-                }
-                await matches_collection.insert_one(match_doc)
-                match_count += 1
-                
-                # Send mock notification
-                await send_mock_notification(worker, job, score)
-    
-    print(f"[{datetime.utcnow()}] Matching complete. Created {match_count} new matches.")
-
-
-async def send_mock_notification(worker: dict, job: dict, score: float):
-    """Mock SMS/Voice notification system with multilingual support"""
+    # Workers registered through other processes may not be indexed yet
+    await refresh_worker_index()
+    
+    result = await incremental_matches.match_new_entities(jobs, workers, worker_index, job_index)
+    
+    stats = matching_stats["incremental"]
+    stats["events"] += len(batch)
+    stats["batches"] += 1
+    stats["new_matches"] += result["new_matches"]
+    stats["last_latency_seconds"] = round(time.perf_counter() - min(enqueued for _, _, enqueued in batch), 6)
+
+
+async def backfill_match_counts():
+    """
+    Set match_count on jobs created before it was maintained, from one $group
+    over matches. Runs before the match writer can $inc those jobs.
+    """
+    legacy_ids = await jobs_collection.distinct("job_id", {"match_count": {"$exists": False}})
+    if not legacy_ids:
+        return
+    counts = {job_id: 0 for job_id in legacy_ids}
+    async for row in matches_collection.aggregate([
+        {"$match": {"job_id": {"$in": legacy_ids}}},
+        {"$group": {"_id": "$job_id", "count": {"$sum": 1}}}
+    ]):
+        counts[row["_id"]] = row["count"]
+    await jobs_collection.bulk_write(
+        [UpdateOne({"job_id": job_id, "match_count": {"$exists": False}}, {"$set": {"match_count": count}})
+         for job_id, count in counts.items()],
+        ordered=False
+    )
+    print(f"Backfilled match_count on {len(counts)} jobs")
+
+
+def index_document(index: BlockingIndex, doc: dict) -> bool:
+    """Add doc to a blocking index; a malformed document is logged and skipped instead of failing the caller"""
+    try:
+        index.add(doc)
+        return True
+    except (KeyError, TypeError, ValueError) as e:
+        print(f"Skipping {doc.get(index.id_field)} in the {index.id_field} index: {e!r}")
+        return False
+
+
+async def refresh_worker_index():
+    """Add workers created since the last refresh to the in-memory blocking index"""
+    global worker_index_watermark
+    
+    query = {}
+    if worker_index_watermark is not None:
+        query["created_at"] = {"$gte": worker_index_watermark}
+    
+    async for worker in workers_collection.find(query, WORKER_MATCH_PROJECTION).batch_size(MATCHING_CHUNK_SIZE):
+        index_document(worker_index, worker)
+        created_at = worker.get("created_at")
+        if created_at and (worker_index_watermark is None or created_at > worker_index_watermark):
+            worker_index_watermark = created_at
+
+
+async def load_job_index():
+    """Stream all active jobs into the job blocking index"""
+    async for job in jobs_collection.find({"status": "active"}, JOB_MATCH_PROJECTION):
+        index_document(job_index, job)
+
+
+def prune_job_index(closed_ids: set):
+    """Drop jobs that are no longer active from the job blocking index and the feed"""
+    for job_id in closed_ids:
+        job_index.remove(job_id)
+        job_feed.remove(job_id)
+
+
+async def refresh_job_feed():
+    """Add active jobs created since the last refresh (e.g. by other processes) to the feed"""
+    global job_feed_watermark
+    
+    query = {"status": "active"}
+    if job_feed_watermark is not None:
+        query["created_at"] = {"$gte": job_feed_watermark}
+    
+    projection = {field: 1 for field in JOB_VIEW_FIELDS}
+    projection.update({"_id": 0, "translations": 1})
+    async for job in jobs_collection.find(query, projection).sort("created_at", 1):
+        job_feed.add(job)
+        created_at = job.get("created_at")
+        if created_at and (job_feed_watermark is None or created_at > job_feed_watermark):
+            job_feed_watermark = created_at
+
+
+def build_notification_doc(worker: dict, job: dict, score: float) -> dict:
+    """Build the mock SMS notification document in the worker's language"""
     
     # Get worker's language preference
     worker_lang = worker.get("language", "hi")
@@ -752,7 +1212,7 @@ async def send_mock_notification(worker: dict, job: dict, score: float):
         "language": worker_lang,
         "sent_at": datetime.utcnow()
     }
-    await notifications_collection.insert_one(notification_doc)
+    return notification_doc
 
 
 @app.get("/api/notifications")
@@ -777,8 +1237,37 @@ async def get_notifications(current_user = Depends(get_current_user)):
 # ============ AUDIO TRANSCRIPTION (Real with OpenAI Whisper) ============
 
 from emergentintegrations.llm.openai import OpenAISpeechToText
-import tempfile
-import re
+
+# Transcription metrics
+transcribe_stats = {"requests": 0, "rejected_size": 0, "rejected_duration": 0, "errors": 0}
+transcribe_bytes = Histogram([16 * 1024, 64 * 1024, 256 * 1024, 1024 ** 2, 4 * 1024 ** 2, 16 * 1024 ** 2])
+transcribe_seconds = Histogram([0.5, 1, 2, 5, 10, 30])
+
+# Transcripts keyed by SHA-256 of the audio bytes plus language; concurrent
+# retries of the same upload share one Whisper call
+transcription_cache = TwoTierCache(
+    LRUCache(max_entries=AUDIO_RESULT_CACHE_MAX_ENTRIES, max_bytes=AUDIO_RESULT_CACHE_MAX_BYTES),
+    transcription_cache_collection if AUDIO_RESULT_CACHE_TTL_SECONDS > 0 else None
+)
+transcription_flights = SingleFlight()
+
+
+async def _transcribe_uncached(file: UploadFile, whisper_lang: str, cache_key: str) -> str:
+    """Send the upload to Whisper and cache the transcript"""
+    stt = OpenAISpeechToText(api_key=EMERGENT_LLM_KEY)
+    
+    # Transcribe straight from the upload's buffer; the extension tells Whisper the format
+    audio_stream = NamedUploadStream(file.file, f"audio.{upload_extension(file.filename)}")
+    response = await stt.transcribe(
+        file=audio_stream,
+        model="whisper-1",
+        response_format="json",
+        language=whisper_lang
+    )
+    
+    await transcription_cache.set(cache_key, response.text, language=whisper_lang)
+    return response.text
+
 
 @app.post("/api/audio/transcribe")
 async def transcribe_audio(file: UploadFile = File(...), language: str = "hi"):
@@ -786,6 +1275,8 @@ async def transcribe_audio(file: UploadFile = File(...), language: str = "hi"):
     Real audio transcription endpoint using OpenAI Whisper API
     Supports multiple Indian languages
     """
+    start = time.perf_counter()
+    transcribe_stats["requests"] += 1
     try:
         # Map language codes to ISO-639-1 for Whisper
         lang_map = {
@@ -806,32 +1297,29 @@ async def transcribe_audio(file: UploadFile = File(...), language: str = "hi"):
         
         whisper_lang = lang_map.get(language, "hi")
         
-        # Save uploaded file to temp location
-        contents = await file.read()
-        
-        # Create temp file with appropriate extension
-        file_ext = file.filename.split('.')[-1] if '.' in file.filename else 'webm'
-        with tempfile.NamedTemporaryFile(delete=False, suffix=f'.{file_ext}') as temp_file:
-            temp_file.write(contents)
-            temp_path = temp_file.name
+        # The middleware bounds the whole request; the file itself is checked
+        # exactly here, before anything is sent upstream
+        size = stream_size(file.file)
+        if size > MAX_AUDIO_BYTES:
+            transcribe_stats["rejected_size"] += 1
+            raise HTTPException(status_code=413, detail=f"Audio larger than {MAX_AUDIO_BYTES} bytes")
+        # WAV and WebM (the browser recorder's format) can be timed from their headers
+        duration = audio_duration_seconds(file.file, size)
+        if duration is not None and duration > MAX_AUDIO_SECONDS:
+            transcribe_stats["rejected_duration"] += 1
+            raise HTTPException(status_code=413, detail=f"Audio longer than {MAX_AUDIO_SECONDS} seconds")
         
-        # Initialize Whisper STT
-        stt = OpenAISpeechToText(api_key=EMERGENT_LLM_KEY)
-        
-        # Transcribe the audio
-        with open(temp_path, "rb") as audio_file:
-            response = await stt.transcribe(
-                file=audio_file,
-                model="whisper-1",
-                response_format="json",
-                language=whisper_lang
+        # A retried upload of the same audio is answered from the cache; hashing
+        # up to MAX_AUDIO_BYTES runs off the event loop
+        digest = await asyncio.to_thread(stream_sha256, file.file)
+        cache_key = content_key("transcribe", whisper_lang, digest)
+        transcribed_text = await transcription_cache.get(cache_key)
+        if transcribed_text is None:
+            transcribed_text = await transcription_flights.do(
+                cache_key, lambda: _transcribe_uncached(file, whisper_lang, cache_key)
             )
-        
-        # Clean up temp file
-        import os as os_module
-        os_module.unlink(temp_path)
-        
-        transcribed_text = response.text
+        transcribe_bytes.observe(size)
+        transcribe_seconds.observe(time.perf_counter() - start)
         
         return {
             "transcribed_text": transcribed_text,
@@ -839,104 +1327,187 @@ async def transcribe_audio(file: UploadFile = File(...), language: str = "hi"):
             "message": "Audio transcription successful"
         }
         
+    except HTTPException:
+        raise
     except Exception as e:
+        transcribe_stats["errors"] += 1
         print(f"Transcription error: {e}")
         raise HTTPException(status_code=500, detail=f"Transcription failed: {str(e)}")
+    finally:
+        # Releases the spooled upload (memory or its own temp file) on every path
+        await file.close()
+
+
+@app.get("/api/audio/stats")
+async def get_audio_stats():
+    """Transcription request counts, rejections, upload sizes and latency"""
+    return dict(
+        transcribe_stats,
+        max_bytes=MAX_AUDIO_BYTES,
+        max_seconds=MAX_AUDIO_SECONDS,
+        bytes=transcribe_bytes.stats(),
+        seconds=transcribe_seconds.stats()
+    )
+
+
+# Registration parsing: local rules first, LLM only for the fields they miss
+SPEECH_LANGUAGE_NAMES = dict(TRANSLATION_LANGUAGE_NAMES, en="English")
+extraction_stats = ExtractionStats()
+
+# Parsed registrations keyed by SHA-256 of the whitespace-normalized transcript plus language
+registration_parse_cache = TwoTierCache(
+    LRUCache(max_entries=AUDIO_RESULT_CACHE_MAX_ENTRIES, max_bytes=AUDIO_RESULT_CACHE_MAX_BYTES),
+    registration_parse_cache_collection if AUDIO_RESULT_CACHE_TTL_SECONDS > 0 else None
+)
+registration_parse_flights = SingleFlight()
+
+
+async def _llm_extract_registration(text: str, language: str, fields: list) -> dict:
+    """Ask the LLM for just the given fields; returns the non-null ones"""
+    chat = LlmChat(
+        api_key=EMERGENT_LLM_KEY,
+        session_id=f"parse_audio_{uuid.uuid4()}",
+        system_message=registration_prompt(SPEECH_LANGUAGE_NAMES.get(language, "Hindi"), fields)
+    ).with_model("openai", "gpt-5.2")
+    
+    result = await chat.send_message(UserMessage(text=f"Extract registration details from this speech: {text}"))
+    parsed = parse_json_object(result)
+    return {field: parsed[field] for field in fields if parsed.get(field) is not None}
+
+
+async def _parse_registration_uncached(text: str, language: str, cache_key: str) -> dict:
+    """Local extraction, then the LLM for missing fields; caches complete results"""
+    start = time.perf_counter()
+    found = extract_registration(text)
+    local_seconds = time.perf_counter() - start
+    sources = dict.fromkeys(found, "local")
+    
+    missing = [field for field in REGISTRATION_FIELDS if field not in found]
+    llm_seconds = None
+    complete = True
+    if missing and text.strip():
+        start = time.perf_counter()
+        try:
+            llm_found = await _llm_extract_registration(text, language, missing)
+        except Exception as e:
+            # Without any local result there is nothing useful to return
+            extraction_stats.llm_errors += 1
+            if not found:
+                raise
+            print(f"Parsing LLM error, returning local fields only: {e}")
+            llm_found = {}
+            complete = False
+        llm_seconds = time.perf_counter() - start
+        found.update(llm_found)
+        sources.update(dict.fromkeys(llm_found, "llm"))
+    
+    extraction_stats.record(sources, local_seconds, llm_seconds)
+    result = {
+        "parsed_data": {field: found.get(field) for field in REGISTRATION_FIELDS},
+        "sources": sources
+    }
+    # A partial result (LLM failed) is not cached so a retry can complete it
+    if complete:
+        await registration_parse_cache.set(cache_key, result, language=language)
+    return result
 
 
 @app.post("/api/audio/parse-registration")
 async def parse_registration_from_audio(data: dict):
     """
-    Parse transcribed audio text to extract registration details using AI
+    Parse transcribed audio text to extract registration details. Regexes,
+    the place gazetteer and trade synonyms fill what they can; the LLM is
+    called only when fields are still missing, and only for those. Results
+    are cached by normalized text and language.
     """
     try:
         text = data.get("text", "")
         language = data.get("language", "hi")
         
-        # Language names for prompt
-        lang_names = {
-            "hi": "Hindi",
-            "bn": "Bengali", 
-            "te": "Telugu",
-            "mr": "Marathi",
-            "ta": "Tamil",
-            "gu": "Gujarati",
-            "kn": "Kannada",
-            "ml": "Malayalam",
-            "pa": "Punjabi",
-            "or": "Odia",
-            "as": "Assamese",
-            "ur": "Urdu",
-            "en": "English"
-        }
-        
-        target_lang = lang_names.get(language, "Hindi")
-        
-        # Use LLM to extract structured data from the transcribed text
-        chat = LlmChat(
-            api_key=EMERGENT_LLM_KEY,
-            session_id=f"parse_audio_{uuid.uuid4()}",
-            system_message=f"""You are an AI assistant that extracts structured registration information from transcribed speech.
-The speech is in {target_lang}. Extract the following fields if present:
-- name: The person's name
-- area: Village or area name
-- district: District name
-- state: State name
-- job_type: Type of work (Mason, Labour, Plumber, Electrician, Painter)
-- expected_daily_wage: Expected daily wage in rupees (just the number)
-- phone_number: Phone number (10 digits)
-
-Return the data as a valid JSON object with these exact field names. If a field is not found, use null.
-Example output: {{"name": "Raj Kumar", "area": "Agra", "district": "Agra", "state": "Uttar Pradesh", "job_type": "Mason", "expected_daily_wage": 500, "phone_number": "9876543210"}}
-Only output the JSON, nothing else."""
-        ).with_model("openai", "gpt-5.2")
-        
-        result = await chat.send_message(UserMessage(text=f"Extract registration details from this speech: {text}"))
-        
-        # Parse the JSON response
-        import json
-        try:
-            # Clean up the response in case there's markdown formatting
-            clean_result = result.strip()
-            if clean_result.startswith("```"):
-                clean_result = clean_result.split("```")[1]
-                if clean_result.startswith("json"):
-                    clean_result = clean_result[4:]
-            clean_result = clean_result.strip()
-            
-            parsed_data = json.loads(clean_result)
-        except json.JSONDecodeError:
-            parsed_data = {}
+        cache_key = content_key("parse-registration", language, normalize_whitespace(text))
+        result = await registration_parse_cache.get(cache_key)
+        if result is None:
+            result = await registration_parse_flights.do(
+                cache_key, lambda: _parse_registration_uncached(text, language, cache_key)
+            )
         
-        return {
-            "parsed_data": parsed_data,
-            "original_text": text,
-            "language": language
-        }
+        return dict(result, original_text=text, language=language)
         
     except Exception as e:
         print(f"Parsing error: {e}")
         raise HTTPException(status_code=500, detail=f"Failed to parse registration data: {str(e)}")
 
 
+@app.get("/api/audio/parse-registration/stats")
+async def parse_registration_stats():
+    """Per-field local hit rates, LLM calls skipped, and local vs LLM latency"""
+    return extraction_stats.stats()
+
+
 # ============ STARTUP & SHUTDOWN ============
 
 @app.on_event("startup")
 async def startup_event():
-    """Start the matching engine scheduler"""
-    # Run matching engine every 5 minutes
-    scheduler.add_job(run_matching_engine, 'interval', minutes=5)
+    """Ensure Mongo indexes, build the matching indexes and start the incremental consumer and sweep scheduler"""
+    global matching_consumer_task, matching_process_pool
+    
+    # Indexes for every hot query, including the unique (job, worker) match index
+    result = await apply_indexes(db, declared_indexes(CHATBOT_SESSION_TTL_SECONDS, AUDIO_RESULT_CACHE_TTL_SECONDS))
+    print(f"✅ Indexes ensured: {len(result['created'])} ok, {len(result['failed'])} failed")
+    
+    await backfill_match_counts()
+    await refresh_worker_index()
+    await load_job_index()
+    await refresh_job_feed()
+    
+    if MATCHING_PROCESSES > 1:
+        matching_process_pool = ProcessPoolExecutor(
+            max_workers=MATCHING_PROCESSES,
+            mp_context=multiprocessing.get_context("spawn")
+        )
+    
+    # New jobs/workers are matched as they arrive; the full sweep reconciles periodically
+    matching_consumer_task = asyncio.create_task(matching_consumer())
+    scheduler.add_job(run_matching_engine, 'interval', minutes=MATCHING_SWEEP_MINUTES)
+    if CHATBOT_SESSION_IDLE_SECONDS > 0:
+        scheduler.add_job(chatbot_sessions.flush_idle, 'interval', seconds=CHATBOT_SESSION_IDLE_SECONDS)
     scheduler.start()
-    print("✅ Matching engine scheduler started (runs every 5 minutes)")
+    print(f"✅ Matching engine started (incremental, full sweep every {MATCHING_SWEEP_MINUTES} minutes)")
 
 
 @app.on_event("shutdown")
 async def shutdown_event():
     """Cleanup on shutdown"""
+    if matching_consumer_task:
+        matching_consumer_task.cancel()
+    if matching_process_pool:
+        matching_process_pool.shutdown(cancel_futures=True)
+    password_executor.shutdown()
+    await chatbot_sessions.flush_all()
     scheduler.shutdown()
     client.close()
 
 
+# ============ CACHE STATS ============
+
+@app.get("/api/cache/stats")
+async def get_cache_stats():
+    """Hit/miss/eviction counters for the in-process caches"""
+    return {
+        "users": user_cache.stats(),
+        "job_feed": job_feed.stats(),
+        "chatbot_sessions": chatbot_sessions.stats(),
+        "translation": dict(
+            translation_cache.stats(),
+            single_flight=translation_flights.stats(),
+            batching=translation_batcher.stats()
+        ),
+        "transcription": dict(transcription_cache.stats(), single_flight=transcription_flights.stats()),
+        "registration_parse": dict(registration_parse_cache.stats(),
+                                   single_flight=registration_parse_flights.stats())
+    }
+
+
 # ============ HEALTH CHECK ============
 
 @app.get("/api/health")
@@ -0,0 +1,117 @@
+"""
+Resumable chunked matching sweep.
+
+Active jobs are streamed in _id order in chunks; after every chunk the last
+_id is saved in a checkpoint document, so a sweep interrupted by a restart
+resumes where it stopped. The checkpoint doubles as a lease: only the
+process holding it may run or advance the sweep, so a second process that
+starts a sweep meanwhile skips it instead of resuming from the other
+process's position. A lease left behind by a crashed process expires after
+lease_seconds; the next sweep takes it over and resumes from its checkpoint.
+"""
+from datetime import datetime, timedelta
+from typing import Optional
+
+from pymongo.errors import DuplicateKeyError
+
+SWEEP_ID = "sweep"
+
+
+async def iter_chunks(cursor, size: int):
+    """Yield lists of up to size documents from an async cursor"""
+    chunk = []
+    async for doc in cursor:
+        chunk.append(doc)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+class SweepLease:
+    """Sweep checkpoint document owned by one process at a time"""
+
+    def __init__(self, collection, owner: str, lease_seconds: float, sweep_id: str = SWEEP_ID,
+                 clock=datetime.utcnow):
+        self.collection = collection
+        self.owner = owner
+        self.lease_seconds = lease_seconds
+        self.sweep_id = sweep_id
+        self.clock = clock
+
+    def _lease(self) -> dict:
+        return {"owner": self.owner, "lease_until": self.clock() + timedelta(seconds=self.lease_seconds)}
+
+    async def acquire(self) -> Optional[dict]:
+        """
+        Take the lease. Returns the checkpoint ({"last_job_id": ...} when an
+        interrupted sweep is taken over, {} for a fresh sweep), or None while
+        another process holds it.
+        """
+        doc = await self.collection.find_one({"_id": self.sweep_id})
+        if doc is None:
+            try:
+                await self.collection.insert_one(dict(self._lease(), _id=self.sweep_id))
+            except DuplicateKeyError:
+                return None
+            return {}
+        if doc.get("owner") not in (None, self.owner) and doc["lease_until"] > self.clock():
+            return None
+
+        # Compare-and-set on the lease that was read, so only one process takes it over
+        result = await self.collection.update_one(
+            {"_id": self.sweep_id, "owner": doc.get("owner"), "lease_until": doc.get("lease_until")},
+            {"$set": self._lease()}
+        )
+        if not result.modified_count:
+            return None
+        return {"last_job_id": doc["last_job_id"]} if "last_job_id" in doc else {}
+
+    async def advance(self, last_job_id) -> bool:
+        """Save progress and renew the lease; False once another process has taken it over"""
+        result = await self.collection.update_one(
+            {"_id": self.sweep_id, "owner": self.owner},
+            {"$set": dict(self._lease(), last_job_id=last_job_id, updated_at=self.clock())}
+        )
+        return bool(result.modified_count)
+
+    async def release(self):
+        """Finish the sweep: drop the checkpoint if this process still owns it"""
+        await self.collection.delete_one({"_id": self.sweep_id, "owner": self.owner})
+
+
+async def run_chunked_sweep(jobs_collection, lease: SweepLease, projection: dict, chunk_size: int,
+                            process_chunk, prune) -> Optional[dict]:
+    """
+    Stream active jobs through process_chunk(jobs), which returns a dict of
+    counters summed over the sweep. prune(seen_job_ids) is called only after
+    a pass that started from the first job and saw every active job.
+
+    Returns the summed counters plus resumed, complete, jobs and chunks, or
+    None when another process holds the lease.
+    """
+    checkpoint = await lease.acquire()
+    if checkpoint is None:
+        return None
+
+    query = {"status": "active"}
+    resumed = "last_job_id" in checkpoint
+    if resumed:
+        query["_id"] = {"$gt": checkpoint["last_job_id"]}
+
+    totals, seen, chunk_count = {}, set(), 0
+    cursor = jobs_collection.find(query, projection).sort("_id", 1).batch_size(chunk_size)
+    async for chunk in iter_chunks(cursor, chunk_size):
+        for key, value in (await process_chunk(chunk)).items():
+            totals[key] = totals.get(key, 0) + value
+        seen.update(job["job_id"] for job in chunk)
+        chunk_count += 1
+        if not await lease.advance(chunk[-1]["_id"]):
+            # The lease expired and was taken over; the new owner continues from the checkpoint
+            return dict(totals, resumed=resumed, complete=False, jobs=len(seen), chunks=chunk_count)
+
+    await lease.release()
+    if not resumed:
+        prune(seen)
+    return dict(totals, resumed=resumed, complete=True, jobs=len(seen), chunks=chunk_count)
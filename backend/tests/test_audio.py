@@ -0,0 +1,201 @@
+"""
+Unit tests for the audio upload helpers
+"""
+import asyncio
+import hashlib
+import io
+import struct
+import tempfile
+
+from fastapi import FastAPI, Request
+from fastapi.middleware.cors import CORSMiddleware
+from fastapi.testclient import TestClient
+
+from audio import (
+    WEBM_TAIL_BYTES, NamedUploadStream, UploadLimitMiddleware, audio_duration_seconds, stream_sha256, stream_size,
+    upload_extension, wav_duration_seconds, webm_duration_seconds
+)
+
+
+def wav_header(byte_rate: int, data_bytes: int) -> bytes:
+    return (b"RIFF" + struct.pack("<I", 36 + data_bytes) + b"WAVE"
+            + b"fmt " + struct.pack("<IHHIIHH", 16, 1, 1, byte_rate // 2, byte_rate, 2, 16)
+            + b"data" + struct.pack("<I", data_bytes))
+
+
+def ebml(element_id: bytes, body: bytes) -> bytes:
+    size = bytes([0x80 | len(body)]) if len(body) < 127 else struct.pack(">H", 0x4000 | len(body))
+    return element_id + size + body
+
+
+UNKNOWN_SIZE = b"\x01\xff\xff\xff\xff\xff\xff\xff"
+
+
+def webm(duration_ms=None, cluster_starts_ms=(), cluster_bytes=100) -> bytes:
+    """Browser-style WebM: unknown-size Segment, optional Duration, unknown-size Clusters"""
+    info = ebml(b"\x2a\xd7\xb1", (1_000_000).to_bytes(3, "big"))
+    if duration_ms is not None:
+        info += ebml(b"\x44\x89", struct.pack(">d", duration_ms))
+    data = ebml(b"\x1a\x45\xdf\xa3", ebml(b"\x42\x82", b"webm")) + b"\x18\x53\x80\x67" + UNKNOWN_SIZE
+    data += ebml(b"\x15\x49\xa9\x66", info) + ebml(b"\x16\x54\xae\x6b", ebml(b"\x86", b"A_OPUS"))
+    for start in cluster_starts_ms:
+        data += b"\x1f\x43\xb6\x75" + UNKNOWN_SIZE + ebml(b"\xe7", start.to_bytes(4, "big"))
+        data += b"\xa3" + bytes([0x40 | (cluster_bytes >> 8), cluster_bytes & 0xFF]) + bytes(cluster_bytes)
+    return data
+
+
+def run_upload(middleware, chunks, headers=()):
+    """Drive an ASGI middleware with a body in chunks; returns (status, body, chunks the app received)"""
+    consumed, sent = [], []
+    messages = [{"type": "http.request", "body": chunk, "more_body": i < len(chunks) - 1}
+                for i, chunk in enumerate(chunks)]
+
+    async def receive():
+        return messages.pop(0)
+
+    async def send(message):
+        sent.append(message)
+
+    async def app(scope, receive, send):
+        # Like a form parser: a failed read becomes a 400
+        try:
+            while True:
+                message = await receive()
+                consumed.append(message["body"])
+                if not message["more_body"]:
+                    break
+            status = 200
+        except Exception:
+            status = 400
+        await send({"type": "http.response.start", "status": status, "headers": []})
+        await send({"type": "http.response.body", "body": b""})
+
+    scope = {"type": "http", "path": "/api/audio/transcribe", "headers": list(headers)}
+    asyncio.run(middleware(app)(scope, receive, send))
+    return sent[0]["status"], sent[1]["body"], consumed
+
+
+class TestNamedUploadStream:
+
+    def test_reads_spooled_upload_without_copying_to_disk(self):
+        spooled = tempfile.SpooledTemporaryFile(max_size=1024)
+        spooled.write(b"x" * 3000)
+        spooled.seek(0)
+        stream = NamedUploadStream(spooled, "audio.webm")
+        assert isinstance(stream, io.IOBase)
+        assert stream.name == "audio.webm"
+        assert stream.read() == b"x" * 3000
+        assert stream.bytes_read == 3000
+        stream.seek(0)
+        assert stream.read(10) == b"x" * 10
+
+    def test_stream_size_rewinds(self):
+        buffer = io.BytesIO(b"abcdef")
+        buffer.read(2)
+        assert stream_size(buffer) == 6
+        assert buffer.read() == b"abcdef"
+
+
+class TestLimits:
+
+    def test_wav_duration(self):
+        header = wav_header(byte_rate=32000, data_bytes=32000 * 5)
+        assert wav_duration_seconds(header, len(header) + 32000 * 5) == 5.0
+
+    def test_non_wav_has_no_duration(self):
+        assert wav_duration_seconds(b"\x1aE\xdf\xa3" + bytes(60), 64) is None
+        assert wav_duration_seconds(b"RIFF", 4) is None
+
+    def test_webm_duration_element(self):
+        data = webm(duration_ms=95_500.0, cluster_starts_ms=[0, 5000])
+        assert webm_duration_seconds(data[:4096], data[-WEBM_TAIL_BYTES:]) == 95.5
+
+    def test_live_webm_uses_last_cluster(self):
+        data = webm(cluster_starts_ms=range(0, 300_000, 5000), cluster_bytes=1000)
+        assert len(data) > 4096
+        assert webm_duration_seconds(data[:4096], data[-WEBM_TAIL_BYTES:]) == 295.0
+        assert audio_duration_seconds(io.BytesIO(data), len(data)) == 295.0
+
+    def test_untimed_formats(self):
+        assert webm_duration_seconds(webm(), b"") is None
+        assert webm_duration_seconds(b"ID3" + bytes(100), b"") is None
+        stream = io.BytesIO(b"ID3" + bytes(100))
+        assert audio_duration_seconds(stream, 103) is None
+        assert stream.tell() == 0
+
+    def test_upload_extension(self):
+        assert upload_extension("voice.M4A") == "m4a"
+        assert upload_extension("recording") == "webm"
+        assert upload_extension(None) == "webm"
+
+
+class TestHashing:
+
+    def test_digest_matches_and_rewinds(self):
+        data = bytes(range(256)) * 1000
+        stream = io.BytesIO(data)
+        stream.seek(100)
+        assert stream_sha256(stream, chunk_size=4096) == hashlib.sha256(data).hexdigest()
+        assert stream.tell() == 0
+
+    def test_chunk_size_does_not_change_digest(self):
+        data = b"voice" * 10001
+        assert stream_sha256(io.BytesIO(data), chunk_size=7) == stream_sha256(io.BytesIO(data))
+
+
+class TestUploadLimitMiddleware:
+
+    def limited(self, rejected):
+        return lambda app: UploadLimitMiddleware(app, ["/api/audio/transcribe"], max_bytes=100,
+                                                 detail="too big", on_reject=lambda: rejected.append(1))
+
+    def test_content_length_rejected_before_reading(self):
+        rejected = []
+        status, body, consumed = run_upload(self.limited(rejected), [b"x" * 50] * 3,
+                                            headers=[(b"content-length", b"150")])
+        assert (status, body, consumed, rejected) == (413, b'{"detail": "too big"}', [], [1])
+
+    def test_streamed_body_cut_off_at_limit(self):
+        rejected = []
+        status, _, consumed = run_upload(self.limited(rejected), [b"x" * 60] * 5)
+        assert status == 413
+        assert consumed == [b"x" * 60]
+        assert rejected == [1]
+
+    def test_within_limit_and_other_paths_pass(self):
+        rejected = []
+        assert run_upload(self.limited(rejected), [b"x" * 50, b"x" * 50])[0] == 200
+
+        async def other_path():
+            sent = []
+
+            async def app(scope, receive, send):
+                await send({"type": "http.response.start", "status": 200, "headers": []})
+
+            async def send(message):
+                sent.append(message)
+
+            scope = {"type": "http", "path": "/api/jobs", "headers": [(b"content-length", b"1000")]}
+            await self.limited(rejected)(app)(scope, None, send)
+            return sent[0]["status"]
+
+        assert asyncio.run(other_path()) == 200
+        assert rejected == []
+
+    def test_rejection_carries_cors_headers(self):
+        # Same order as server.py: the limit is added first, so CORS wraps it
+        app = FastAPI()
+        app.add_middleware(UploadLimitMiddleware, paths=["/api/audio/transcribe"], max_bytes=100,
+                           detail="too big")
+        app.add_middleware(CORSMiddleware, allow_origins=["*"], allow_methods=["*"], allow_headers=["*"])
+
+        @app.post("/api/audio/transcribe")
+        async def transcribe(request: Request):
+            return {"bytes": len(await request.body())}
+
+        client = TestClient(app)
+        response = client.post("/api/audio/transcribe", content=b"x" * 200, headers={"Origin": "https://app.example"})
+        assert response.status_code == 413
+        assert response.json() == {"detail": "too big"}
+        assert response.headers["access-control-allow-origin"] == "*"
+        assert client.post("/api/audio/transcribe", content=b"x" * 10).json() == {"bytes": 10}
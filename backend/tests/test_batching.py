@@ -0,0 +1,93 @@
+"""
+Unit tests for the micro-batcher (fake upstream, no LLM)
+"""
+import asyncio
+
+from batching import Histogram, MicroBatcher
+
+
+class FakeUpstream:
+    """Records batch and single calls; upper-cases items"""
+
+    def __init__(self, drop=(), fail_batch=False):
+        self.drop = set(drop)
+        self.fail_batch = fail_batch
+        self.batches = []
+        self.singles = []
+
+    async def send_batch(self, key, items):
+        self.batches.append((key, list(items)))
+        if self.fail_batch:
+            raise RuntimeError("upstream down")
+        # Simulate a reply that silently drops some items
+        return [None if item in self.drop else f"{key}:{item.upper()}" for item in items]
+
+    async def send_one(self, key, item):
+        self.singles.append((key, item))
+        return f"{key}:{item.upper()}"
+
+
+def submit_all(batcher, requests):
+    async def run():
+        return await asyncio.gather(*(batcher.submit(key, item) for key, item in requests))
+    return asyncio.run(run())
+
+
+class TestHistogram:
+
+    def test_buckets_and_mean(self):
+        histogram = Histogram([1, 4])
+        for value in (1, 2, 4, 9):
+            histogram.observe(value)
+        stats = histogram.stats()
+        assert stats["buckets"] == {"<=1": 1, "<=4": 2, "+inf": 1}
+        assert stats["count"] == 4
+        assert stats["mean"] == 4.0
+
+
+class TestMicroBatcher:
+
+    def test_window_groups_requests_per_key(self):
+        upstream = FakeUpstream()
+        batcher = MicroBatcher(upstream.send_batch, upstream.send_one, max_items=16, window_seconds=0.01)
+        results = submit_all(batcher, [("hi", "a"), ("hi", "b"), ("ta", "c"), ("hi", "d")])
+        assert results == ["hi:A", "hi:B", "ta:C", "hi:D"]
+        assert ("hi", ["a", "b", "d"]) in upstream.batches
+        # A lone item goes straight to the single-item call
+        assert upstream.singles == [("ta", "c")]
+        assert batcher.stats()["batch_size"]["count"] == 2
+
+    def test_max_items_flushes_early(self):
+        upstream = FakeUpstream()
+        batcher = MicroBatcher(upstream.send_batch, upstream.send_one, max_items=2, window_seconds=10)
+        results = submit_all(batcher, [("hi", "a"), ("hi", "b"), ("hi", "c"), ("hi", "d")])
+        assert results == ["hi:A", "hi:B", "hi:C", "hi:D"]
+        assert [items for _, items in upstream.batches] == [["a", "b"], ["c", "d"]]
+
+    def test_dropped_items_fall_back_individually(self):
+        upstream = FakeUpstream(drop={"b"})
+        batcher = MicroBatcher(upstream.send_batch, upstream.send_one, window_seconds=0.01)
+        results = submit_all(batcher, [("hi", "a"), ("hi", "b"), ("hi", "c")])
+        assert results == ["hi:A", "hi:B", "hi:C"]
+        assert upstream.singles == [("hi", "b")]
+        assert batcher.stats()["fallbacks"] == 1
+
+    def test_failed_batch_retries_every_item(self):
+        upstream = FakeUpstream(fail_batch=True)
+        batcher = MicroBatcher(upstream.send_batch, upstream.send_one, window_seconds=0.01)
+        results = submit_all(batcher, [("hi", "a"), ("hi", "b")])
+        assert results == ["hi:A", "hi:B"]
+        assert sorted(upstream.singles) == [("hi", "a"), ("hi", "b")]
+
+    def test_single_call_errors_reach_the_caller(self):
+        async def send_one(key, item):
+            raise RuntimeError("boom")
+
+        upstream = FakeUpstream()
+        batcher = MicroBatcher(upstream.send_batch, send_one, window_seconds=0.01)
+
+        async def run():
+            return await asyncio.gather(batcher.submit("hi", "a"), return_exceptions=True)
+
+        [result] = asyncio.run(run())
+        assert isinstance(result, RuntimeError)
@@ -0,0 +1,109 @@
+"""
+Unit tests for the buffered bulk match writer (in-memory collections, no database)
+"""
+import asyncio
+
+from pymongo.errors import BulkWriteError
+
+from bulk_writer import DUPLICATE_KEY_ERROR, BulkMatchWriter
+
+
+class UniqueCollection:
+    """Minimal async collection enforcing a unique key, like the matches index"""
+
+    def __init__(self, key_fields=None):
+        self.key_fields = key_fields
+        self.docs = []
+        self.calls = 0
+
+    async def insert_many(self, docs, ordered=True):
+        self.calls += 1
+        seen = {tuple(doc[f] for f in self.key_fields) for doc in self.docs} if self.key_fields else set()
+        errors = []
+        for i, doc in enumerate(docs):
+            key = tuple(doc[f] for f in self.key_fields) if self.key_fields else None
+            if key is not None and key in seen:
+                errors.append({"index": i, "code": DUPLICATE_KEY_ERROR, "errmsg": "duplicate key"})
+                continue
+            seen.add(key)
+            self.docs.append(doc)
+        if errors:
+            raise BulkWriteError({"writeErrors": errors})
+
+
+class CounterCollection:
+    """Minimal async jobs collection applying $inc bulk updates"""
+
+    def __init__(self):
+        self.counts = {}
+
+    async def bulk_write(self, requests, ordered=True):
+        for request in requests:
+            job_id = request._filter["job_id"]
+            for field, n in request._doc["$inc"].items():
+                self.counts[job_id] = self.counts.get(job_id, 0) + n
+
+
+def match(job_id, worker_id):
+    return {"job_id": job_id, "worker_id": worker_id}
+
+
+def notification(job_id, worker_id):
+    return {"job_id": job_id, "worker_id": worker_id, "message": "hi"}
+
+
+class TestBulkMatchWriter:
+
+    def test_flushes_in_batches(self):
+        matches, notifications = UniqueCollection(("job_id", "worker_id")), UniqueCollection()
+        writer = BulkMatchWriter(matches, notifications, batch_size=3)
+
+        async def run():
+            inserted = 0
+            for w in range(7):
+                inserted += len(await writer.add(match("j1", f"w{w}"), notification("j1", f"w{w}")))
+            inserted += len(await writer.flush())
+            return inserted
+
+        assert asyncio.run(run()) == 7
+        assert matches.calls == 3
+        assert len(notifications.docs) == 7
+        stats = writer.stats()
+        assert stats["totals"]["flushes"] == 3
+        assert stats["totals"]["inserted"] == 7
+        assert len(stats["recent_flushes"]) == 3
+
+    def test_rerun_is_idempotent(self):
+        matches, notifications = UniqueCollection(("job_id", "worker_id")), UniqueCollection()
+        writer = BulkMatchWriter(matches, notifications, batch_size=10)
+
+        async def run(worker_ids):
+            for worker_id in worker_ids:
+                await writer.add(match("j1", worker_id), notification("j1", worker_id))
+            return await writer.flush()
+
+        assert len(asyncio.run(run(["w1", "w2"]))) == 2
+        inserted = asyncio.run(run(["w1", "w2", "w3"]))
+        assert [doc["worker_id"] for doc in inserted] == ["w3"]
+        assert len(matches.docs) == 3
+        assert [doc["worker_id"] for doc in notifications.docs] == ["w1", "w2", "w3"]
+        assert writer.stats()["totals"]["duplicates"] == 2
+
+    def test_empty_flush(self):
+        writer = BulkMatchWriter(UniqueCollection(), UniqueCollection())
+        assert asyncio.run(writer.flush()) == []
+        assert writer.stats()["totals"]["flushes"] == 0
+
+    def test_match_counts_follow_inserted_matches(self):
+        jobs = CounterCollection()
+        writer = BulkMatchWriter(UniqueCollection(("job_id", "worker_id")), UniqueCollection(), jobs_collection=jobs)
+
+        async def run(pairs):
+            for job_id, worker_id in pairs:
+                await writer.add(match(job_id, worker_id), notification(job_id, worker_id))
+            return await writer.flush()
+
+        asyncio.run(run([("j1", "w1"), ("j1", "w2"), ("j2", "w1")]))
+        asyncio.run(run([("j1", "w1"), ("j1", "w3")]))
+        assert jobs.counts == {"j1": 3, "j2": 1}
+        assert writer.stats()["totals"]["counter_updates"] == 3
@@ -0,0 +1,154 @@
+"""
+Unit tests for the cache helpers (in-memory collection, no database)
+"""
+import asyncio
+
+from caching import LRUCache, SingleFlight, TwoTierCache, content_key
+
+
+class MemoryCollection:
+    """Minimal async stand-in for a Motor collection keyed by _id"""
+
+    def __init__(self):
+        self.docs = {}
+        self.reads = 0
+
+    async def find_one(self, query, projection=None):
+        self.reads += 1
+        return self.docs.get(query["_id"])
+
+    async def update_one(self, query, update, upsert=False):
+        self.docs.setdefault(query["_id"], {"_id": query["_id"]}).update(update["$set"])
+
+
+class TestContentKey:
+
+    def test_stable_and_unambiguous(self):
+        assert content_key("hi", "नमस्ते") == content_key("hi", "नमस्ते")
+        assert content_key("ab", "c") != content_key("a", "bc")
+        assert len(content_key("x")) == 64
+
+
+class TestLRUCache:
+
+    def test_entry_limit_evicts_least_recent(self):
+        cache = LRUCache(max_entries=2)
+        cache.set("a", "1")
+        cache.set("b", "2")
+        assert cache.get("a") == "1"
+        cache.set("c", "3")
+        assert "b" not in cache
+        assert cache.get("a") == "1" and cache.get("c") == "3"
+        assert cache.evictions == 1
+
+    def test_byte_budget(self):
+        cache = LRUCache(max_entries=100, max_bytes=30)
+        for i in range(5):
+            cache.set(f"k{i}", "x" * 8)
+        assert cache.stats()["bytes"] <= 30
+        assert len(cache) == 3
+
+    def test_counters(self):
+        cache = LRUCache()
+        cache.set("a", "1")
+        cache.get("a")
+        cache.get("missing")
+        stats = cache.stats()
+        assert (stats["hits"], stats["misses"], stats["hit_ratio"]) == (1, 1, 0.5)
+
+    def test_ttl_expires_entries(self):
+        now = [0.0]
+        cache = LRUCache(max_entries=10, ttl_seconds=30, clock=lambda: now[0])
+        cache.set("u1", {"role": "worker"})
+        now[0] = 29.0
+        assert cache.get("u1") == {"role": "worker"}
+        now[0] = 30.0
+        assert cache.get("u1") is None
+        assert len(cache) == 0
+        stats = cache.stats()
+        assert (stats["hits"], stats["misses"], stats["expirations"]) == (1, 1, 1)
+        assert stats["hit_ratio"] == 0.5
+
+
+class TestTwoTierCache:
+
+    def test_warm_restart_reads_persistent_tier(self):
+        collection = MemoryCollection()
+        first = TwoTierCache(LRUCache(), collection)
+        asyncio.run(first.set("key", "अनुवाद", language="hi"))
+
+        # A fresh process starts with an empty LRU but shares the collection
+        second = TwoTierCache(LRUCache(), collection)
+        assert asyncio.run(second.get("key")) == "अनुवाद"
+        assert asyncio.run(second.get("key")) == "अनुवाद"
+        assert collection.reads == 1
+        assert second.stats()["persistent_hits"] == 1
+
+    def test_miss(self):
+        cache = TwoTierCache(LRUCache(), MemoryCollection())
+        assert asyncio.run(cache.get("nope")) is None
+        assert cache.stats()["persistent_misses"] == 1
+
+
+class TestSingleFlight:
+
+    def test_concurrent_calls_coalesce(self):
+        flights = SingleFlight()
+        calls = []
+
+        async def translate(text):
+            calls.append(text)
+            await asyncio.sleep(0.01)
+            return text.upper()
+
+        async def run():
+            return await asyncio.gather(
+                *(flights.do(text, lambda text=text: translate(text)) for text in ["a", "b", "a", "a"])
+            )
+
+        assert asyncio.run(run()) == ["A", "B", "A", "A"]
+        assert sorted(calls) == ["a", "b"]
+        assert flights.stats() == {"calls": 2, "coalesced": 2, "in_flight": 0}
+
+    def test_errors_reach_every_caller(self):
+        flights = SingleFlight()
+
+        async def fail():
+            await asyncio.sleep(0)
+            raise ValueError("boom")
+
+        async def run():
+            return await asyncio.gather(flights.do("k", fail), flights.do("k", fail),
+                                        return_exceptions=True)
+
+        results = asyncio.run(run())
+        assert all(isinstance(result, ValueError) for result in results)
+        assert len(flights) == 0
+
+    def test_cache_aside_retries_hit_the_cache(self):
+        cache = TwoTierCache(LRUCache(max_entries=10), MemoryCollection())
+        flights = SingleFlight()
+        calls = []
+
+        async def parse(key):
+            calls.append(key)
+            await asyncio.sleep(0.01)
+            result = {"parsed_data": {"name": "Raj"}}
+            await cache.set(key, result)
+            return result
+
+        async def request(text):
+            key = content_key("parse-registration", "hi", text)
+            result = await cache.get(key)
+            if result is None:
+                result = await flights.do(key, lambda: parse(key))
+            return result
+
+        async def run():
+            first = await asyncio.gather(request("naam Raj"), request("naam Raj"))
+            return first + [await request("naam Raj")]
+
+        assert all(result == {"parsed_data": {"name": "Raj"}} for result in asyncio.run(run()))
+        assert len(calls) == 1
+        assert flights.stats()["coalesced"] == 1
+        assert cache.stats()["hits"] == 1
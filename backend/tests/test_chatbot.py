@@ -0,0 +1,140 @@
+"""
+Unit tests for the chatbot step table and write-behind session store
+"""
+import asyncio
+
+from chatbot import QUESTIONS, STEPS, SessionStore, advance, new_session
+
+
+class SessionCollection:
+    """Minimal async chatbot_sessions collection recording writes"""
+
+    def __init__(self):
+        self.docs = {}
+        self.writes = []
+        self.archived = []
+
+    async def find_one(self, query, projection=None):
+        doc = self.docs.get(query["session_id"])
+        return None if doc is None else dict(doc, messages=list(doc["messages"]), data=dict(doc["data"]))
+
+    async def insert_one(self, doc):
+        self.writes.append(("insert", len(doc.get("messages", []))))
+        self.docs[doc["session_id"]] = dict(doc)
+
+    async def update_one(self, query, update):
+        doc = self.docs[query["session_id"]]
+        doc.update(update["$set"])
+        pushed = update["$push"]["messages"]["$each"]
+        doc["messages"] = doc["messages"] + pushed
+        if "$slice" in update["$push"]["messages"]:
+            doc["messages"] = doc["messages"][update["$push"]["messages"]["$slice"]:]
+        self.writes.append(("update", len(pushed)))
+
+    async def delete_one(self, query):
+        self.docs.pop(query["session_id"], None)
+
+
+def run_turns(store, session_id, answers):
+    async def run():
+        session = await store.get(session_id)
+        if session is None:
+            session = new_session(session_id, "en")
+            await store.create(session)
+        for answer in answers:
+            session = await store.get(session_id)
+            field, value, reply, next_step = advance(session["current_step"], answer, "en")
+            if field is not None:
+                session["data"][field] = value
+            await store.record_turn(session, [{"role": "user", "content": answer},
+                                              {"role": "assistant", "content": reply}],
+                                    current_step=next_step)
+        return session
+    return asyncio.run(run())
+
+
+class TestSteps:
+
+    def test_every_next_step_has_a_question(self):
+        for language, questions in QUESTIONS.items():
+            for step in STEPS.values():
+                assert step.next_step in questions, (language, step.next_step)
+
+    def test_parsers(self):
+        assert advance("job_type", " 3 ", "hi")[:2] == ("job_type", "Plumber")
+        assert advance("job_type", "anything", "hi")[1] == "Labour"
+        assert advance("wage", "₹ 650 per day", "en")[:2] == ("expected_daily_wage", 650)
+        assert advance("wage", "not sure", "en")[1] == 500
+        assert advance("wage", "मेरा नंबर 9876543210 है", "hi")[:2] == ("expected_daily_wage", 500)
+        assert advance("wage", "100000", "en")[1] == 100000
+        assert advance("phone", "98765 43210", "en")[:2] == ("phone_number", "9876543210")
+        assert advance("complete", "hello?", "en") == (None, None, "", "complete")
+
+    def test_unknown_language_falls_back_to_hindi(self):
+        assert advance("name", "Ram", "ta")[2] == QUESTIONS["hi"]["area"]
+
+
+class TestSessionStore:
+
+    def test_write_behind_until_complete(self):
+        collection = SessionCollection()
+        store = SessionStore(collection, idle_seconds=60)
+        run_turns(store, "s1", ["Ram", "Rampur", "Agra"])
+        assert collection.writes == []
+
+        session = run_turns(store, "s1", ["UP", "1", "600", "9876543210"])
+        assert session["current_step"] == "complete"
+        # One insert with the whole conversation once it completes
+        assert collection.writes == [("insert", 15)]
+        assert collection.docs["s1"]["data"]["expected_daily_wage"] == 600
+
+        run_turns(store, "s1", ["thanks"])
+        assert collection.writes[-1] == ("update", 2)
+
+    def test_write_through_pushes_only_new_messages(self):
+        collection = SessionCollection()
+        store = SessionStore(collection, idle_seconds=0)
+        run_turns(store, "s1", ["Ram", "Rampur"])
+        assert collection.writes == [("insert", 1), ("update", 2), ("update", 2)]
+        assert len(collection.docs["s1"]["messages"]) == 5
+
+    def test_idle_sessions_are_flushed_and_evicted(self):
+        now = [0.0]
+        collection = SessionCollection()
+        store = SessionStore(collection, idle_seconds=60, clock=lambda: now[0])
+        run_turns(store, "s1", ["Ram"])
+        now[0] = 61.0
+        asyncio.run(store.flush_idle())
+        assert len(store) == 0
+        assert collection.docs["s1"]["current_step"] == "area"
+
+        # Reloaded from Mongo and continued
+        session = run_turns(store, "s1", ["Rampur"])
+        assert session["data"] == {"name": "Ram", "area": "Rampur"}
+        assert store.stats()["loads"] >= 1
+
+    def test_history_is_capped(self):
+        collection = SessionCollection()
+        store = SessionStore(collection, idle_seconds=0, max_messages=4)
+        session = run_turns(store, "s1", ["Ram", "Rampur", "Agra", "UP"])
+        assert len(session["messages"]) == 4
+        assert len(collection.docs["s1"]["messages"]) == 4
+        assert collection.docs["s1"]["messages"][-1]["content"] == QUESTIONS["en"]["job_type"]
+        assert collection.docs["s1"]["turns"] == 4
+        # Each write carries one turn regardless of history length
+        assert collection.writes[-1] == ("update", 2)
+
+    def test_archive_replaces_session_with_summary(self):
+        collection, archive = SessionCollection(), SessionCollection()
+        store = SessionStore(collection, idle_seconds=60, archive_collection=archive)
+        run_turns(store, "s1", ["Ram", "Rampur", "Agra", "UP", "1", "600", "9876543210"])
+        asyncio.run(store.archive("s1", worker_id="w1"))
+
+        assert "s1" not in collection.docs
+        assert len(store) == 0
+        summary = archive.docs["s1"]
+        assert summary["worker_id"] == "w1"
+        assert summary["turns"] == 7
+        assert summary["data"]["job_type"] == "Mason"
+        assert "messages" not in summary
+        assert asyncio.run(store.get("s1")) is None
@@ -0,0 +1,59 @@
+"""
+Unit tests for the bounded executor used for password hashing
+"""
+import asyncio
+import threading
+
+import pytest
+
+from executors import BoundedExecutor, ExecutorOverloaded
+
+
+class TestBoundedExecutor:
+
+    def test_runs_off_the_event_loop(self):
+        executor = BoundedExecutor(max_workers=2, max_queue=2)
+
+        async def run():
+            return await executor.run(lambda x: (x * 2, threading.current_thread().name), 21)
+
+        value, thread_name = asyncio.run(run())
+        assert value == 42
+        assert thread_name.startswith("bounded")
+        stats = executor.stats()
+        assert (stats["completed"], stats["in_flight"], stats["rejected"]) == (1, 0, 0)
+        executor.shutdown()
+
+    def test_rejects_beyond_pool_plus_queue(self):
+        executor = BoundedExecutor(max_workers=1, max_queue=1)
+        release = threading.Event()
+
+        async def run():
+            held = []
+            for _ in range(2):
+                held.append(asyncio.ensure_future(executor.run(release.wait)))
+                await asyncio.sleep(0.05)
+            assert executor.stats()["queue_depth"] == 1
+            with pytest.raises(ExecutorOverloaded):
+                await executor.run(release.wait)
+            release.set()
+            return await asyncio.gather(*held)
+
+        assert asyncio.run(run()) == [True, True]
+        stats = executor.stats()
+        assert (stats["completed"], stats["rejected"], stats["max_queue_depth"]) == (2, 1, 1)
+        executor.shutdown()
+
+    def test_errors_propagate_and_release_slot(self):
+        executor = BoundedExecutor(max_workers=1, max_queue=0)
+
+        def boom():
+            raise ValueError("bad hash")
+
+        async def run():
+            with pytest.raises(ValueError):
+                await executor.run(boom)
+            return await executor.run(lambda: "ok")
+
+        assert asyncio.run(run()) == "ok"
+        executor.shutdown()
@@ -0,0 +1,102 @@
+"""
+Unit tests for local registration extraction, the place gazetteer and the
+per-field extraction stats
+"""
+import json
+import os
+
+import pytest
+
+from extraction import (REGISTRATION_FIELDS, ExtractionStats, extract_registration, find_phone, find_wage,
+                        parse_json_object, registration_prompt)
+from gazetteer import Gazetteer, gazetteer
+
+CORPUS_PATH = os.path.join(os.path.dirname(__file__), "data", "registration_transcripts.jsonl")
+
+
+def load_transcripts(path: str = CORPUS_PATH) -> list:
+    """[{"language", "text", "expected"}] where expected holds the fields the rules should find"""
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+class TestCorpus:
+
+    @pytest.mark.parametrize("row", load_transcripts(), ids=lambda row: row["text"][:24])
+    def test_transcript(self, row):
+        assert extract_registration(row["text"]) == row["expected"]
+
+    def test_covers_every_field(self):
+        covered = {field for row in load_transcripts() for field in row["expected"]}
+        assert covered == set(REGISTRATION_FIELDS)
+
+
+class TestRules:
+
+    @pytest.mark.parametrize("text, expected", [
+        ("call 9876543210", "9876543210"), ("+91-98765-43210", "9876543210"), ("0 98765 43210", "9876543210"),
+        ("9 8 7 6 5 4 3 2 1 0", "9876543210"), ("1234567890", None), ("pin 110001", None),
+    ])
+    def test_phone(self, text, expected):
+        assert find_phone(text)[0] == expected
+
+    @pytest.mark.parametrize("text, expected", [
+        ("₹1,200", 1200), ("rs. 650", 650), ("600/- रुपये", 600), ("roz ke 550 chahiye", 550),
+        ("35 saal, 8 ghante, 500", 500), ("35 saal, 8 ghante", None), ("600 ya 700", None),
+    ])
+    def test_wage(self, text, expected):
+        assert find_wage(text) == expected
+
+    def test_phone_digits_are_not_a_wage(self):
+        assert "expected_daily_wage" not in extract_registration("mobile 9876543210")
+
+    def test_fuzzy_job_types_are_left_to_the_llm(self):
+        # "point" is one edit from "paint"; only whole trade names count in free speech
+        assert "job_type" not in extract_registration("ek point bataiye")
+
+
+class TestGazetteer:
+
+    def test_longest_name_wins(self):
+        assert gazetteer.find_state("jammu and kashmir") == "Jammu and Kashmir"
+        assert gazetteer.find_district("मैं औरंगाबाद से") == ("Aurangabad", None)
+        assert gazetteer.find_district("howrah") == ("Howrah", "West Bengal")
+        assert gazetteer.find_district("kuch nahi") == (None, None)
+
+    def test_custom_entries(self):
+        places = Gazetteer(states=[("Goa", "goa")], districts={"Goa": [("North Goa", "panaji", "पणजी")]})
+        assert places.find_district("पणजी") == ("North Goa", "Goa")
+        assert places.find_state("Bihar") is None
+
+
+class TestLlmPrompt:
+
+    def test_prompt_lists_only_requested_fields(self):
+        prompt = registration_prompt("Hindi", ["name", "area"])
+        assert "- name:" in prompt and "- area:" in prompt
+        assert "phone_number" not in prompt and "district" not in prompt
+        assert '{"name": "Raj Kumar", "area": "Agra"}' in prompt
+
+    @pytest.mark.parametrize("reply, expected", [
+        ('{"name": "Raj"}', {"name": "Raj"}), ('```json\n{"name": "Raj"}\n```', {"name": "Raj"}),
+        ("not json", {}), ("[1, 2]", {}),
+    ])
+    def test_parse_json_object(self, reply, expected):
+        assert parse_json_object(reply) == expected
+
+
+class TestExtractionStats:
+
+    def test_hit_rates_and_skipped_llm_calls(self):
+        stats = ExtractionStats(fields=("name", "phone_number"))
+        stats.record({"name": "local", "phone_number": "local"}, 0.0002)
+        stats.record({"phone_number": "local", "name": "llm"}, 0.0003, llm_seconds=1.5)
+        stats.record({}, 0.0001, llm_seconds=2.0)
+        result = stats.stats()
+        assert result["requests"] == 3
+        assert result["llm_calls"] == 2
+        assert result["llm_skipped"] == 1
+        assert result["fields"]["name"] == {"local": 1, "llm": 1, "missing": 1, "local_hit_rate": 0.3333}
+        assert result["fields"]["phone_number"]["local_hit_rate"] == 0.6667
+        assert result["llm_seconds"]["count"] == 2
+        assert result["local_seconds"]["count"] == 3
@@ -0,0 +1,69 @@
+"""
+Unit tests for the in-memory job feed
+"""
+from feed import JobFeed, feed_key
+
+FIELDS = ("job_id", "title", "state", "district", "job_type")
+
+
+def job(job_id, district="Agra", job_type="Mason", state="UP"):
+    return {"job_id": job_id, "title": f"Job {job_id}", "state": state, "district": district,
+            "job_type": job_type, "contact_number": "9000000000", "_id": object()}
+
+
+class TestJobFeed:
+
+    def test_page_is_newest_first_per_bucket(self):
+        feed = JobFeed(FIELDS)
+        for job_id in ("j1", "j2", "j3"):
+            feed.add(job(job_id))
+        feed.add(job("j4", district="Mathura"))
+        assert [entry["job_id"] for entry in feed.page("up", " agra ", "mason", 2)] == ["j3", "j2"]
+        assert [entry["job_id"] for entry in feed.page("UP", "Mathura", "Mason", 10)] == ["j4"]
+        assert feed.page("UP", "Agra", "Plumber", 10) == []
+
+    def test_entries_keep_only_declared_fields(self):
+        feed = JobFeed(FIELDS)
+        feed.add(job("j1"))
+        [entry] = feed.page("UP", "Agra", "Mason", 1)
+        assert set(entry) == set(FIELDS) | {"translations"}
+
+    def test_version_changes_only_for_touched_bucket(self):
+        feed = JobFeed(FIELDS)
+        feed.add(job("j1"))
+        feed.add(job("j2", district="Mathura"))
+        agra, mathura = feed.version("UP", "Agra", "Mason"), feed.version("UP", "Mathura", "Mason")
+
+        feed.set_translations("j1", {"hi": {"title": "राजमिस्त्री", "description": ""}})
+        assert feed.version("UP", "Agra", "Mason") != agra
+        assert feed.version("UP", "Mathura", "Mason") == mathura
+        assert feed.page("UP", "Agra", "Mason", 1)[0]["translations"]["hi"]["title"] == "राजमिस्त्री"
+
+        agra = feed.version("UP", "Agra", "Mason")
+        assert feed.remove("j1")
+        assert not feed.remove("j1")
+        assert feed.version("UP", "Agra", "Mason") != agra
+        assert feed.stats() == {"jobs": 1, "buckets": 1, "largest_bucket": 1}
+
+    def test_readd_moves_job_between_buckets(self):
+        feed = JobFeed(FIELDS)
+        feed.add(job("j1"))
+        feed.add(job("j1", job_type="Plumber"))
+        assert feed.page("UP", "Agra", "Mason", 10) == []
+        assert len(feed.page("UP", "Agra", "Plumber", 10)) == 1
+        assert len(feed) == 1
+
+    def test_readd_unchanged_keeps_version(self):
+        feed = JobFeed(FIELDS)
+        feed.add(job("j1"))
+        version = feed.version("UP", "Agra", "Mason")
+        feed.add(job("j1"))
+        assert feed.version("UP", "Agra", "Mason") == version
+
+        changed = dict(job("j1"), title="Senior mason")
+        feed.add(changed)
+        assert feed.version("UP", "Agra", "Mason") != version
+        assert feed.page("UP", "Agra", "Mason", 1)[0]["title"] == "Senior mason"
+
+    def test_feed_key_normalizes(self):
+        assert feed_key(" UP", "Agra ", "MASON") == ("up", "agra", "mason")
@@ -0,0 +1,148 @@
+"""
+Explain-plan regression check: every hot query in server.py must be served
+by an index from indexes.INDEXES, never a collection scan.
+
+Needs a MongoDB server (TEST_MONGO_URL, default mongodb://localhost:27017);
+skipped when none is reachable. Uses a throwaway database that is dropped
+afterwards.
+"""
+import asyncio
+import os
+import uuid
+from datetime import datetime
+
+import pytest
+from bson import ObjectId
+from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import MongoClient
+from pymongo.errors import PyMongoError
+
+from indexes import INDEXES, RESULT_CACHE_COLLECTIONS, apply_indexes, declared_indexes
+from pagination import encode_cursor, keyset_filter, keyset_sort
+
+TEST_MONGO_URL = os.getenv("TEST_MONGO_URL", "mongodb://localhost:27017")
+INDEX_STAGES = {"IXSCAN", "IDHACK", "EXPRESS_IXSCAN", "EXPRESS_IDHACK", "DISTINCT_SCAN", "COUNT_SCAN"}
+
+NOW = datetime.utcnow()
+SESSION_TTL_SECONDS = 3600
+
+# (collection, filter, sort, sort must come from the index)
+HOT_QUERIES = [
+    ("users", {"user_id": "u-1"}, None, False),
+    ("users", {"phone_number": "9000000001"}, None, False),
+    ("workers", {"user_id": "u-1"}, None, False),
+    ("workers", {"worker_id": {"$in": ["w-1", "w-2"]}}, None, False),
+    ("workers", {"created_at": {"$gte": NOW}}, None, False),
+    ("jobs", {"job_id": {"$in": ["j-1", "j-2"]}}, None, False),
+    ("jobs", {"job_id": "j-1", "employer_id": "u-2"}, None, False),
+    ("jobs", {"status": "active"}, [("created_at", -1)], True),
+    ("jobs", {"employer_id": "u-2"}, [("created_at", -1)], True),
+    ("jobs", {"status": "active"}, [("_id", 1)], True),
+    ("jobs", {"status": "active", "_id": {"$gt": ObjectId("0" * 24)}}, [("_id", 1)], True),
+    ("jobs", {"status": "active", "created_at": {"$gte": NOW}}, [("created_at", 1)], True),
+    ("matches", {"worker_id": "w-1", "status": "pending"}, keyset_sort(), True),
+    ("matches", dict(keyset_filter(encode_cursor(60, "m-5")), worker_id="w-1", status="pending"),
+     keyset_sort(), False),
+    ("matches", {"job_id": "j-1"}, keyset_sort(), True),
+    ("matches", {"job_id": "j-1", "match_score": {"$gte": 50}}, keyset_sort(), True),
+    ("matches", {"job_id": {"$in": ["j-1", "j-2"]}, "worker_id": {"$in": ["w-1", "w-2"]}}, None, False),
+    ("notifications", {"worker_id": "w-1"}, [("sent_at", -1)], True),
+    ("chatbot_sessions", {"session_id": "s-1"}, None, False),
+]
+
+
+def seed_docs():
+    """A few documents per collection so the planner has real indexes to choose"""
+    docs = {name: [] for name in {collection for collection, _, _ in INDEXES}}
+    for i in range(20):
+        user_id, worker_id, job_id = f"u-{i}", f"w-{i}", f"j-{i}"
+        docs["users"].append({"user_id": user_id, "phone_number": f"90000000{i:02d}"})
+        docs["workers"].append({"user_id": user_id, "worker_id": worker_id, "created_at": NOW})
+        docs["jobs"].append({"job_id": job_id, "employer_id": f"u-{i % 3}", "status": "active",
+                             "created_at": NOW})
+        docs["matches"].append({"match_id": f"m-{i}", "job_id": f"j-{i % 4}", "worker_id": worker_id,
+                                "status": "pending", "match_score": float(40 + i)})
+        docs["notifications"].append({"worker_id": f"w-{i % 4}", "sent_at": NOW})
+        docs["chatbot_sessions"].append({"session_id": f"s-{i}"})
+    return docs
+
+
+def test_declared_ttl_indexes():
+    assert declared_indexes() == INDEXES
+    ttl = {collection: options["expireAfterSeconds"]
+           for collection, _, options in declared_indexes(SESSION_TTL_SECONDS, 600)[len(INDEXES):]}
+    assert ttl == dict({"chatbot_sessions": SESSION_TTL_SECONDS}, **dict.fromkeys(RESULT_CACHE_COLLECTIONS, 600))
+
+
+def plan_stages(plan: dict) -> set:
+    """All stage names in a (possibly nested) query plan"""
+    stages = {plan.get("stage")}
+    for key in ("inputStage", "queryPlan"):
+        if isinstance(plan.get(key), dict):
+            stages |= plan_stages(plan[key])
+    for child in plan.get("inputStages", []):
+        stages |= plan_stages(child)
+    return stages - {None}
+
+
+@pytest.fixture(scope="module")
+def database():
+    try:
+        MongoClient(TEST_MONGO_URL, serverSelectionTimeoutMS=500).admin.command("ping")
+    except PyMongoError:
+        pytest.skip(f"No MongoDB server at {TEST_MONGO_URL}")
+
+    name = f"graminrozgar_index_test_{uuid.uuid4().hex[:8]}"
+
+    async def setup():
+        client = AsyncIOMotorClient(TEST_MONGO_URL)
+        result = await apply_indexes(client[name], declared_indexes(SESSION_TTL_SECONDS))
+        for collection, docs in seed_docs().items():
+            await client[name][collection].insert_many(docs)
+        client.close()
+        return result
+
+    result = asyncio.run(setup())
+    sync_client = MongoClient(TEST_MONGO_URL)
+    yield sync_client[name], result
+    sync_client.drop_database(name)
+    sync_client.close()
+
+
+def test_all_declared_indexes_apply(database):
+    _, result = database
+    assert result["failed"] == []
+    assert len(result["created"]) == len(INDEXES) + 1
+
+
+def test_session_ttl_index(database):
+    db, _ = database
+    ttl = [index for index in db.chatbot_sessions.list_indexes() if "expireAfterSeconds" in index]
+    assert [(list(index["key"]), index["expireAfterSeconds"]) for index in ttl] == [
+        (["updated_at"], SESSION_TTL_SECONDS)
+    ]
+
+
+def test_apply_is_idempotent(database):
+    db, _ = database
+
+    async def reapply():
+        client = AsyncIOMotorClient(TEST_MONGO_URL)
+        result = await apply_indexes(client[db.name], declared_indexes(SESSION_TTL_SECONDS))
+        client.close()
+        return result
+
+    assert asyncio.run(reapply())["failed"] == []
+
+
+@pytest.mark.parametrize("collection, query, sort, sort_from_index", HOT_QUERIES)
+def test_hot_query_uses_index(database, collection, query, sort, sort_from_index):
+    db, _ = database
+    cursor = db[collection].find(query)
+    if sort:
+        cursor = cursor.sort(sort)
+    stages = plan_stages(cursor.explain()["queryPlanner"]["winningPlan"])
+    assert "COLLSCAN" not in stages
+    assert stages & INDEX_STAGES
+    if sort_from_index:
+        assert "SORT" not in stages
@@ -0,0 +1,121 @@
+"""
+Unit tests for match scoring and writing (in-memory collections, no database)
+"""
+import asyncio
+
+from bulk_writer import BulkMatchWriter
+from match_pipeline import MatchPipeline
+from matching import BlockingIndex
+
+
+class MemoryCollection:
+    """Minimal async collection: $in/equality find, insert_many with an optional unique key"""
+
+    def __init__(self, docs=(), key_fields=None):
+        self.docs = [dict(doc) for doc in docs]
+        self.key_fields = key_fields
+
+    def _matches(self, doc, query):
+        for field, condition in query.items():
+            if isinstance(condition, dict):
+                if doc.get(field) not in condition["$in"]:
+                    return False
+            elif doc.get(field) != condition:
+                return False
+        return True
+
+    async def _find(self, query):
+        for doc in [doc for doc in self.docs if self._matches(doc, query)]:
+            # Yield to the loop like a real cursor so concurrent callers interleave
+            await asyncio.sleep(0)
+            yield doc
+
+    def find(self, query, projection=None):
+        return self._find(query)
+
+    async def insert_many(self, docs, ordered=True):
+        await asyncio.sleep(0)
+        if self.key_fields:
+            keys = {tuple(doc[f] for f in self.key_fields) for doc in self.docs}
+            assert not any(tuple(doc[f] for f in self.key_fields) in keys for doc in docs)
+        self.docs.extend(docs)
+
+
+def worker(worker_id, district="Agra", state="UP", job_type="Mason", wage=500):
+    return {"worker_id": worker_id, "name": f"Worker {worker_id}", "district": district, "state": state,
+            "job_type": job_type, "expected_daily_wage": wage, "language": "hi"}
+
+
+def job(job_id, district="Agra", state="UP", job_type="Mason", wage=500):
+    return {"job_id": job_id, "title": f"Job {job_id}", "district": district, "state": state,
+            "job_type": job_type, "daily_wage_offered": wage}
+
+
+class Store:
+    """Jobs, workers, matches and notifications shared by the pipelines under test"""
+
+    def __init__(self, jobs, workers):
+        self.jobs = MemoryCollection(jobs)
+        self.workers = MemoryCollection(workers)
+        self.matches = MemoryCollection(key_fields=("job_id", "worker_id"))
+        self.notifications = MemoryCollection()
+        self.job_index = BlockingIndex("job_id", "daily_wage_offered")
+        self.worker_index = BlockingIndex("worker_id", "expected_daily_wage", extra_fields=("language",))
+        for doc in jobs:
+            self.job_index.add(doc)
+        for doc in workers:
+            self.worker_index.add(doc)
+
+    def pipeline(self, batch_size=500):
+        writer = BulkMatchWriter(self.matches, self.notifications, batch_size=batch_size)
+        return MatchPipeline(self.jobs, self.workers, self.matches, writer,
+                             lambda w, j, score: {"worker_id": w["worker_id"], "job_id": j["job_id"],
+                                                  "message": f"{j['title']} {score:.0f}%"})
+
+
+class TestMatchNewEntities:
+
+    def test_new_job_matches_indexed_workers_once(self):
+        store = Store([], [worker("w1"), worker("w2", district="Patna", state="Bihar", job_type="Painter",
+                                                   wage=900)])
+        pipeline = store.pipeline()
+        new_job = job("j1")
+        store.jobs.docs.append(new_job)
+
+        result = asyncio.run(pipeline.match_new_entities([new_job], [], store.worker_index, store.job_index))
+        assert result["new_matches"] == 1
+        assert [(m["job_id"], m["worker_id"], m["match_score"]) for m in store.matches.docs] == [("j1", "w1", 100.0)]
+        assert store.notifications.docs == [{"worker_id": "w1", "job_id": "j1", "message": "Job j1 100%"}]
+
+        again = asyncio.run(pipeline.match_new_entities([new_job], [], store.worker_index, store.job_index))
+        assert (again["existing_matches"], again["new_matches"]) == (1, 0)
+        assert len(store.matches.docs) == 1
+
+    def test_new_worker_matches_indexed_jobs(self):
+        store = Store([job("j1"), job("j2", job_type="Plumber", state="Bihar", district="Gaya")], [])
+        new_worker = worker("w1")
+        store.workers.docs.append(new_worker)
+
+        result = asyncio.run(store.pipeline().match_new_entities([], [new_worker], store.worker_index,
+                                                                 store.job_index))
+        assert result["new_matches"] == 1
+        assert [(m["job_id"], m["worker_id"]) for m in store.matches.docs] == [("j1", "w1")]
+
+    def test_interleaved_pipelines_count_only_their_own_matches(self):
+        workers = [worker(f"w{i}") for i in range(4)]
+        store = Store([job("j-sweep")], workers)
+        incremental, sweep = store.pipeline(), store.pipeline()
+        new_job = job("j-new", wage=550)
+        store.jobs.docs.append(new_job)
+
+        async def run():
+            return await asyncio.gather(
+                incremental.match_new_entities([new_job], [], store.worker_index, store.job_index),
+                sweep.match_new_entities([job("j-sweep")], [], store.worker_index, store.job_index),
+            )
+
+        incremental_result, sweep_result = asyncio.run(run())
+        assert incremental_result["new_matches"] == 4
+        assert sweep_result["new_matches"] == 4
+        assert incremental.writer.totals["inserted"] == sweep.writer.totals["inserted"] == 4
+        assert len(store.matches.docs) == 8
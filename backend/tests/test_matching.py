@@ -0,0 +1,224 @@
+"""
+Unit tests for the matching engine scorer (no database required)
+"""
+import random
+import uuid
+
+import pytest
+
+from matching import (
+    MATCH_THRESHOLD, BlockingIndex, MatchCategories, MatchKeySet, calculate_distance_score, candidate_pairs,
+    merge_shard_results, score_block, score_loop, score_pair, score_pairs, shard_tasks
+)
+
+DISTRICTS = [("Agra", "Uttar Pradesh"), ("agra", "Uttar Pradesh"), ("Lucknow", "Uttar Pradesh"),
+             ("Patna", "Bihar"), ("Gaya", "bihar"), ("Jaipur", "Rajasthan")]
+JOB_TYPES = ["Mason", "Labour", "Plumber", "Electrician", "Painter", "mason"]
+
+
+def random_entities(count, id_field, wage_field, seed):
+    rng = random.Random(seed)
+    entities = []
+    for i in range(count):
+        district, state = rng.choice(DISTRICTS)
+        entities.append({
+            id_field: f"{id_field}-{i}",
+            "district": district,
+            "state": state,
+            "job_type": rng.choice(JOB_TYPES),
+            wage_field: rng.randrange(200, 900, 10),
+        })
+    return entities
+
+
+class TestScorePair:
+    """Reference scorer keeps the 40/30/30 weighting"""
+
+    def test_distance_score(self):
+        assert calculate_distance_score({"district": "Agra", "state": "UP"}, {"district": "agra", "state": "MP"}) == 100.0
+        assert calculate_distance_score({"district": "Agra", "state": "UP"}, {"district": "Kanpur", "state": "up"}) == 50.0
+        assert calculate_distance_score({"district": "Agra", "state": "UP"}, {"district": "Patna", "state": "Bihar"}) == 0.0
+
+    def test_perfect_match(self):
+        job = {"district": "Agra", "state": "UP", "job_type": "Mason", "daily_wage_offered": 500}
+        worker = {"district": "Agra", "state": "UP", "job_type": "Mason", "expected_daily_wage": 500}
+        assert score_pair(job, worker) == 100.0
+
+    def test_wage_buckets(self):
+        job = {"district": "Agra", "state": "UP", "job_type": "Mason", "daily_wage_offered": 500}
+        for wage, expected in [(550, 95.0), (600, 90.0), (700, 80.0), (701, 70.0)]:
+            worker = {"district": "Patna", "state": "UP", "job_type": "Mason", "expected_daily_wage": wage}
+            assert score_pair(job, worker) == expected - 20.0
+
+
+class TestScoreBlock:
+    """Vectorized scorer must agree exactly with the Python loop"""
+
+    def test_matches_loop(self):
+        jobs = random_entities(120, "job_id", "daily_wage_offered", seed=1)
+        workers = random_entities(150, "worker_id", "expected_daily_wage", seed=2)
+
+        categories = MatchCategories()
+        job_idx, worker_idx, scores = score_block(
+            categories.encode_jobs(jobs), categories.encode_workers(workers)
+        )
+        result = list(zip(job_idx.tolist(), worker_idx.tolist(), scores.tolist()))
+        assert result == score_loop(jobs, workers)
+        assert all(score >= MATCH_THRESHOLD for _, _, score in result)
+
+    def test_small_blocks(self):
+        jobs = random_entities(37, "job_id", "daily_wage_offered", seed=3)
+        workers = random_entities(41, "worker_id", "expected_daily_wage", seed=4)
+
+        categories = MatchCategories()
+        job_cols = categories.encode_jobs(jobs)
+        worker_cols = categories.encode_workers(workers)
+        full = score_block(job_cols, worker_cols)
+        blocked = score_block(job_cols, worker_cols, block_cells=50)
+        for a, b in zip(full, blocked):
+            assert a.tolist() == b.tolist()
+
+    def test_empty(self):
+        categories = MatchCategories()
+        job_idx, worker_idx, scores = score_block(
+            categories.encode_jobs([]),
+            categories.encode_workers(random_entities(3, "worker_id", "expected_daily_wage", seed=5))
+        )
+        assert len(job_idx) == len(worker_idx) == len(scores) == 0
+
+
+class TestBlockingIndex:
+    """Blocked candidates must cover every pair that reaches the threshold"""
+
+    def build_index(self, workers):
+        index = BlockingIndex("worker_id", "expected_daily_wage")
+        for worker in workers:
+            index.add(worker)
+        return index
+
+    def test_candidates_cover_all_matches(self):
+        jobs = random_entities(80, "job_id", "daily_wage_offered", seed=6)
+        workers = random_entities(200, "worker_id", "expected_daily_wage", seed=7)
+        index = self.build_index(workers)
+
+        records, job_idx, worker_idx = candidate_pairs(jobs, index)
+        categories = MatchCategories()
+        scores = score_pairs(categories.encode_jobs(jobs), categories.encode_workers(records),
+                             job_idx, worker_idx)
+
+        position = {worker["worker_id"]: w for w, worker in enumerate(workers)}
+        blocked = sorted(
+            (j, position[records[w]["worker_id"]], score)
+            for j, w, score in zip(job_idx.tolist(), worker_idx.tolist(), scores.tolist())
+            if score >= MATCH_THRESHOLD
+        )
+        assert blocked == score_loop(jobs, workers)
+        assert len(job_idx) < len(jobs) * len(workers)
+
+    def test_cross_state_needs_type_and_wage(self):
+        index = self.build_index([
+            {"worker_id": "w1", "district": "Patna", "state": "Bihar", "job_type": "Mason", "expected_daily_wage": 650},
+            {"worker_id": "w2", "district": "Patna", "state": "Bihar", "job_type": "Mason", "expected_daily_wage": 701},
+            {"worker_id": "w3", "district": "Patna", "state": "Bihar", "job_type": "Painter", "expected_daily_wage": 500},
+        ])
+        assert index.candidates("Agra", "Uttar Pradesh", "Mason", 500) == {"w1"}
+
+    def test_extra_fields(self):
+        index = BlockingIndex("worker_id", "expected_daily_wage", extra_fields=("language",))
+        index.add({"worker_id": "w1", "district": "Agra", "state": "UP", "job_type": "Mason",
+                   "expected_daily_wage": 500, "language": "hi", "name": "Ram"})
+        assert index.get("w1")["language"] == "hi"
+        assert "name" not in index.get("w1")
+
+    def test_remove(self):
+        workers = random_entities(30, "worker_id", "expected_daily_wage", seed=8)
+        index = self.build_index(workers)
+        index.remove("worker_id-3")
+        index.add(workers[0])
+        assert len(index) == 29
+        assert "worker_id-3" not in index
+        for worker in workers:
+            found = index.candidates(worker["district"], worker["state"], worker["job_type"],
+                                     worker["expected_daily_wage"])
+            assert "worker_id-3" not in found
+
+    def test_out_of_range_wage_is_rejected_without_side_effects(self):
+        index = self.build_index([
+            {"worker_id": "w1", "district": "Agra", "state": "UP", "job_type": "Mason", "expected_daily_wage": 500},
+        ])
+        with pytest.raises(ValueError):
+            index.add({"worker_id": "w2", "district": "Patna", "state": "Bihar", "job_type": "Painter",
+                       "expected_daily_wage": 2 ** 31})
+        assert "w2" not in index
+        assert len(index._wage) == 1
+        assert index.candidates("Patna", "Bihar", "Painter", 500) == set()
+
+    def test_missing_location_is_rejected_without_side_effects(self):
+        index = BlockingIndex("worker_id", "expected_daily_wage")
+        for field in ("district", "state", "job_type"):
+            worker = {"worker_id": "w1", "district": "Agra", "state": "UP", "job_type": "Mason",
+                      "expected_daily_wage": 500}
+            worker[field] = None
+            with pytest.raises(ValueError):
+                index.add(worker)
+        assert len(index) == 0
+        assert len(index.categories.districts) == 0
+
+    def test_uuid_ids_round_trip_and_slots_are_reused(self):
+        index = BlockingIndex("worker_id", "expected_daily_wage", extra_fields=("language",))
+        worker_ids = [str(uuid.uuid4()) for _ in range(3)]
+        for worker_id in worker_ids:
+            index.add({"worker_id": worker_id, "district": "Agra", "state": "UP", "job_type": "Mason",
+                       "expected_daily_wage": 500, "language": None})
+        index.remove(worker_ids[1])
+        index.add({"worker_id": "legacy-7", "district": "Gaya", "state": "Bihar", "job_type": "Painter",
+                   "expected_daily_wage": 450, "language": "hi"})
+
+        assert index.candidates("agra", "up", "Mason", 500) == {worker_ids[0], worker_ids[2]}
+        assert index.get("legacy-7") == {"worker_id": "legacy-7", "district": "gaya", "state": "bihar",
+                                         "job_type": "Painter", "expected_daily_wage": 450, "language": "hi"}
+        assert index.get(worker_ids[0])["language"] is None
+        assert worker_ids[1] not in index
+        assert len(index._wage) == 3
+        assert sorted(record["worker_id"] for record in index.records()) == sorted(
+            [worker_ids[0], worker_ids[2], "legacy-7"])
+
+
+class TestMatchKeySet:
+    """Hashed existing-match set used instead of per-pair find_one"""
+
+    def test_membership(self):
+        keys = MatchKeySet([("job-1", "worker-1"), ("job-1", "worker-2"), ("job-2", "worker-1")])
+        assert len(keys) == 3
+        assert ("job-1", "worker-2") in keys
+        assert ("job-2", "worker-2") not in keys
+        assert keys.contains_many([("job-2", "worker-1"), ("worker-1", "job-2")]).tolist() == [True, False]
+
+    def test_add_many(self):
+        keys = MatchKeySet()
+        assert keys.contains_many([("job-1", "worker-1")]).tolist() == [False]
+        keys.add_many([("job-1", "worker-1"), ("job-1", "worker-1")])
+        assert len(keys) == 1
+        assert ("job-1", "worker-1") in keys
+
+
+class TestStateSharding:
+    """Per-state and cross-state shards together must find exactly the loop's matches"""
+
+    def test_shards_match_loop(self):
+        jobs = random_entities(90, "job_id", "daily_wage_offered", seed=9)
+        workers = random_entities(110, "worker_id", "expected_daily_wage", seed=10)
+        # Same district name in two states scores as the same district
+        jobs.append({"job_id": "job-x", "district": "Aurangabad", "state": "Bihar",
+                     "job_type": "Painter", "daily_wage_offered": 300})
+        workers.append({"worker_id": "worker-x", "district": "Aurangabad", "state": "Maharashtra",
+                        "job_type": "Mason", "expected_daily_wage": 900})
+
+        results = [fn(*args) for fn, args in shard_tasks(jobs, workers)]
+        pairs, scores = merge_shard_results(results)
+        sharded = sorted(zip(pairs, scores.tolist()))
+
+        expected = sorted(((jobs[j]["job_id"], workers[w]["worker_id"]), score)
+                          for j, w, score in score_loop(jobs, workers))
+        assert sharded == expected
+        assert (("job-x", "worker-x"), 40.0) in sharded
@@ -291,6 +291,27 @@ class TestChatbotCompleteRegistration:
         assert "detail" in data
         assert "Session not found" in data["detail"]
 
+    def test_phone_number_as_wage_falls_back_to_default(self):
+        """A phone number given as the wage must not become the worker's wage"""
+        session_id = f"test_wage_{uuid.uuid4()}"
+        answers = ["", "Ram Kumar", "Rampur", "Agra", "Uttar Pradesh", "1", "मेरा नंबर 9876543210 है",
+                   f"9{uuid.uuid4().int % 10 ** 9:09d}"]
+        for answer in answers:
+            response = requests.post(f"{BASE_URL}/api/chatbot/conversation", json={
+                "session_id": session_id,
+                "message": answer,
+                "language": "hi"
+            })
+            assert response.status_code == 200
+        
+        response = requests.post(f"{BASE_URL}/api/chatbot/complete-registration?session_id={session_id}")
+        assert response.status_code == 200
+        token = response.json()["token"]
+        
+        response = requests.get(f"{BASE_URL}/api/workers/profile", headers={"Authorization": f"Bearer {token}"})
+        assert response.status_code == 200
+        assert response.json()["expected_daily_wage"] == 500
+
 
 if __name__ == "__main__":
     pytest.main([__file__, "-v", "--tb=short"])
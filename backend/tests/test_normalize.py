@@ -0,0 +1,109 @@
+"""
+Unit tests for the multilingual job type and number normalizers
+"""
+import os
+
+import pytest
+
+from chatbot import parse_job_type, parse_phone, parse_wage
+from normalize import (JobTypeNormalizer, PhraseTrie, normalize_digits, normalize_job_type,
+                       normalize_text, normalize_whitespace, parse_number)
+from normalize import parse_phone as find_phone
+
+CORPUS_PATH = os.path.join(os.path.dirname(__file__), "data", "job_type_corpus.tsv")
+
+
+def load_corpus(path: str = CORPUS_PATH) -> list:
+    """(answer, expected job type or None) pairs"""
+    with open(path, encoding="utf-8") as f:
+        rows = [line.rstrip("\n").split("\t") for line in f if not line.startswith("#")]
+    return [(answer, expected or None) for answer, expected in rows]
+
+
+class TestDigits:
+
+    @pytest.mark.parametrize("text, expected", [
+        ("५००", "500"), ("৭৫০", "750"), ("૧૨", "12"), ("౩౪", "34"), ("௯", "9"),
+        ("੮", "8"), ("୬", "6"), ("೭", "7"), ("൫", "5"), ("٤٥", "45"), ("۱۲", "12"), ("abc 12", "abc 12"),
+    ])
+    def test_normalize_digits(self, text, expected):
+        assert normalize_digits(text) == expected
+
+    @pytest.mark.parametrize("text, expected", [
+        ("₹ ५००", 500), ("700 rupees", 700), ("1,200", 1200), ("roz ৬৫০ টাকা", 650),
+        ("450.50", 450), ("nothing", None),
+    ])
+    def test_parse_number(self, text, expected):
+        assert parse_number(text) == expected
+
+    @pytest.mark.parametrize("text, expected", [
+        ("9876543210", "9876543210"), ("+91 98765 43210", "9876543210"), ("098765-43210", "9876543210"),
+        ("मेरा नंबर ९८७६५४३२१० है", "9876543210"), ("12345", None), ("98765432101", None),
+    ])
+    def test_find_phone(self, text, expected):
+        assert find_phone(text) == expected
+
+
+class TestJobTypes:
+
+    def test_corpus_accuracy(self):
+        corpus = load_corpus()
+        misses = [(answer, expected, normalize_job_type(answer)) for answer, expected in corpus
+                  if normalize_job_type(answer) != expected]
+        assert len(corpus) >= 80
+        assert misses == []
+
+    def test_longest_phrase_wins(self):
+        assert normalize_job_type("मिस्त्री") == "Mason"
+        assert normalize_job_type("बिजली मिस्त्री") == "Electrician"
+        assert normalize_job_type("नल मिस्त्री") == "Plumber"
+
+    def test_generic_words_lose_to_specific_trades(self):
+        assert normalize_job_type("पेंटर मिस्त्री") == "Painter"
+        assert normalize_job_type("bijli ka mistri") == "Electrician"
+        assert normalize_job_type.candidates("mistri hoon") == ["Mason"]
+        assert normalize_job_type.candidates("plumber aur painter mistri") == ["Plumber", "Painter"]
+
+    def test_wage_words_are_not_trades(self):
+        assert normalize_job_type("daily wage") is None
+        assert normalize_job_type("दिहाड़ी") is None
+
+    def test_short_words_are_not_fuzzy(self):
+        assert normalize_job_type("car") is None
+        assert normalize_job_type("kul") is None
+
+    def test_whitespace_normalization_keeps_case(self):
+        assert normalize_whitespace("  Raj\n Kumar\tRene\u0301 ") == "Raj Kumar Ren\u00e9"
+
+    def test_text_normalization(self):
+        assert normalize_text("  Raj-Mistri!! ") == "raj mistri"
+        assert normalize_text("राजमिस्त्री।") == "राजमिस्त्री"
+
+    def test_custom_synonyms(self):
+        normalizer = JobTypeNormalizer({"Carpenter": ["carpenter", "बढ़ई"]}, menu=("Carpenter",))
+        assert normalizer("1") == "Carpenter"
+        assert normalizer("बढ़ई") == "Carpenter"
+        assert normalizer("carpentr") == "Carpenter"
+        assert normalizer("mason") is None
+
+    def test_trie_fuzzy_reports_distance(self):
+        trie = PhraseTrie({"plumber": "Plumber", "painter": "Painter"})
+        assert trie.fuzzy("plumber", 1) == ("Plumber", 0)
+        assert trie.fuzzy("plumbr", 1) == ("Plumber", 1)
+        assert trie.fuzzy("xyzzy", 1) is None
+
+
+class TestChatbotParsers:
+
+    def test_job_type_defaults_to_labour(self):
+        assert parse_job_type("driver") == "Labour"
+        assert parse_job_type("बिजली मिस्त्री") == "Electrician"
+
+    def test_wage(self):
+        assert parse_wage("रोज़ ६०० रुपये") == 600
+        assert parse_wage("pata nahi") == 500
+
+    def test_phone(self):
+        assert parse_phone("+91 ९८७६५ ४३२१०") == "9876543210"
+        assert parse_phone("१२३४५") == "12345"
+        assert parse_phone("nahi hai") == "nahi hai"
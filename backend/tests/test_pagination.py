@@ -0,0 +1,51 @@
+"""
+Unit tests for keyset pagination helpers
+"""
+import pytest
+from fastapi import HTTPException
+
+from pagination import decode_cursor, encode_cursor, keyset_filter, keyset_sort, next_cursor
+
+
+def page_after(rows, cursor, limit):
+    """Apply keyset_filter/keyset_sort semantics to in-memory rows"""
+    ordered = sorted(rows, key=lambda row: (-row["match_score"], row["match_id"]))
+    if cursor:
+        score, match_id = decode_cursor(cursor)
+        ordered = [row for row in ordered
+                   if row["match_score"] < score
+                   or (row["match_score"] == score and row["match_id"] > match_id)]
+    return ordered[:limit]
+
+
+class TestCursor:
+
+    def test_round_trip_keeps_exact_score(self):
+        score = 71.33333333333333
+        assert decode_cursor(encode_cursor(score, "m-1")) == (score, "m-1")
+
+    @pytest.mark.parametrize("cursor", ["", "abc", "12.5:", "x:m-1"])
+    def test_malformed_cursor_is_400(self, cursor):
+        with pytest.raises(HTTPException) as exc:
+            decode_cursor(cursor)
+        assert exc.value.status_code == 400
+
+    def test_filter_and_sort(self):
+        assert keyset_filter(None) == {}
+        assert keyset_sort() == [("match_score", -1), ("match_id", 1)]
+        assert keyset_filter(encode_cursor(50, "m-2")) == {"$or": [
+            {"match_score": {"$lt": 50.0}},
+            {"match_score": 50.0, "match_id": {"$gt": "m-2"}},
+        ]}
+
+    def test_pages_cover_all_rows_once_with_ties(self):
+        rows = [{"match_id": f"m-{i:02d}", "match_score": float(40 + i % 3)} for i in range(11)]
+        seen, cursor = [], None
+        while True:
+            page = page_after(rows, cursor, 4)
+            seen.extend(row["match_id"] for row in page)
+            cursor = next_cursor(page, 4)
+            if cursor is None:
+                break
+        assert sorted(seen) == sorted(row["match_id"] for row in rows)
+        assert len(seen) == len(rows)
@@ -0,0 +1,170 @@
+"""
+Unit tests for the resumable chunked sweep and its checkpoint lease
+"""
+import asyncio
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+from pymongo.errors import DuplicateKeyError
+
+from sweep import SweepLease, run_chunked_sweep
+
+
+class CheckpointCollection:
+    """Minimal async matching_checkpoints collection with equality filters"""
+
+    def __init__(self):
+        self.docs = {}
+
+    def _match(self, query):
+        doc = self.docs.get(query["_id"])
+        if doc is None or any(doc.get(key) != value for key, value in query.items()):
+            return None
+        return doc
+
+    async def find_one(self, query):
+        doc = self._match(query)
+        return None if doc is None else dict(doc)
+
+    async def insert_one(self, doc):
+        if doc["_id"] in self.docs:
+            raise DuplicateKeyError("duplicate _id")
+        self.docs[doc["_id"]] = dict(doc)
+
+    async def update_one(self, query, update):
+        doc = self._match(query)
+        if doc is not None:
+            doc.update(update["$set"])
+        return SimpleNamespace(modified_count=int(doc is not None))
+
+    async def delete_one(self, query):
+        if self._match(query) is not None:
+            del self.docs[query["_id"]]
+
+
+class JobCursor:
+
+    def __init__(self, docs):
+        self.docs = docs
+
+    def sort(self, field, direction):
+        self.docs = sorted(self.docs, key=lambda doc: doc[field], reverse=direction < 0)
+        return self
+
+    def batch_size(self, size):
+        return self
+
+    def __aiter__(self):
+        return self._iter()
+
+    async def _iter(self):
+        for doc in self.docs:
+            yield doc
+
+
+class JobsCollection:
+    """Active jobs with integer _ids; supports the sweep's {"_id": {"$gt": ...}} filter"""
+
+    def __init__(self, count):
+        self.docs = [{"_id": i, "job_id": f"j-{i}", "status": "active"} for i in range(count)]
+
+    def find(self, query, projection=None):
+        after = query.get("_id", {}).get("$gt", -1)
+        return JobCursor([doc for doc in self.docs if doc["status"] == query["status"] and doc["_id"] > after])
+
+
+class Clock:
+
+    def __init__(self):
+        self.now = datetime(2025, 1, 1)
+
+    def __call__(self):
+        return self.now
+
+
+class Interrupted(Exception):
+    pass
+
+
+def sweep(jobs, lease, chunk_size=3, fail_after=None):
+    """Run one sweep; returns (result, job ids per processed chunk, pruned seen-sets)"""
+    processed, pruned = [], []
+
+    async def process_chunk(chunk):
+        if fail_after is not None and len(processed) == fail_after:
+            raise Interrupted()
+        processed.append([job["job_id"] for job in chunk])
+        return {"new_matches": len(chunk)}
+
+    result = asyncio.run(run_chunked_sweep(jobs, lease, {}, chunk_size, process_chunk, pruned.append))
+    return result, processed, pruned
+
+
+class TestChunkedSweep:
+
+    def test_full_pass_prunes_and_releases(self):
+        checkpoints, clock = CheckpointCollection(), Clock()
+        result, processed, pruned = sweep(JobsCollection(7), SweepLease(checkpoints, "a", 60, clock=clock))
+        assert processed == [["j-0", "j-1", "j-2"], ["j-3", "j-4", "j-5"], ["j-6"]]
+        assert result == {"new_matches": 7, "resumed": False, "complete": True, "jobs": 7, "chunks": 3}
+        assert pruned == [{f"j-{i}" for i in range(7)}]
+        assert checkpoints.docs == {}
+
+    def test_interrupted_sweep_resumes_with_remaining_jobs_only(self):
+        jobs, checkpoints, clock = JobsCollection(8), CheckpointCollection(), Clock()
+        crashed = SweepLease(checkpoints, "a", 60, clock=clock)
+        with pytest.raises(Interrupted):
+            sweep(jobs, crashed, fail_after=1)
+        assert checkpoints.docs["sweep"]["last_job_id"] == 2
+
+        # Another process must not resume from a checkpoint whose lease is live
+        other = SweepLease(checkpoints, "b", 60, clock=clock)
+        assert sweep(jobs, other) == (None, [], [])
+
+        clock.now += timedelta(seconds=61)
+        result, processed, pruned = sweep(jobs, other)
+        assert processed == [["j-3", "j-4", "j-5"], ["j-6", "j-7"]]
+        assert (result["resumed"], result["complete"], result["jobs"]) == (True, True, 5)
+        # Jobs before the checkpoint were not seen, so nothing may be pruned
+        assert pruned == []
+        assert checkpoints.docs == {}
+
+        result, processed, pruned = sweep(jobs, other)
+        assert result["resumed"] is False
+        assert pruned == [{f"j-{i}" for i in range(8)}]
+
+    def test_owner_resumes_its_own_interrupted_sweep(self):
+        jobs, checkpoints, clock = JobsCollection(5), CheckpointCollection(), Clock()
+        lease = SweepLease(checkpoints, "a", 60, clock=clock)
+        with pytest.raises(Interrupted):
+            sweep(jobs, lease, fail_after=1)
+        result, processed, _ = sweep(jobs, lease)
+        assert processed == [["j-3", "j-4"]]
+        assert result["resumed"] is True
+
+    def test_sweep_stops_when_its_lease_is_taken_over(self):
+        jobs, checkpoints, clock = JobsCollection(9), CheckpointCollection(), Clock()
+        slow = SweepLease(checkpoints, "a", 60, clock=clock)
+        other = SweepLease(checkpoints, "b", 60, clock=clock)
+        processed = []
+
+        async def process_chunk(chunk):
+            processed.append([job["job_id"] for job in chunk])
+            if len(processed) == 1:
+                # The first chunk outlives the lease and another process takes over
+                clock.now += timedelta(seconds=61)
+                assert await other.acquire() == {}
+            return {}
+
+        result = asyncio.run(run_chunked_sweep(jobs, slow, {}, 3, process_chunk, lambda seen: None))
+        assert result["complete"] is False
+        assert processed == [["j-0", "j-1", "j-2"]]
+        assert checkpoints.docs["sweep"]["owner"] == "b"
+
+    def test_legacy_checkpoint_without_owner_is_resumed(self):
+        jobs, checkpoints = JobsCollection(4), CheckpointCollection()
+        checkpoints.docs["sweep"] = {"_id": "sweep", "last_job_id": 1, "updated_at": datetime(2025, 1, 1)}
+        result, processed, pruned = sweep(jobs, SweepLease(checkpoints, "a", 60, clock=Clock()))
+        assert processed == [["j-2", "j-3"]]
+        assert pruned == []